@@ -23,12 +23,15 @@ run_command() {
 # Get the directory of the current script
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
+# Python modules are imported from the codex root (parent of bin/)
+PYTHON_MODULE="PYTHONPATH=\"$SCRIPT_DIR/..\" python3 -m"
+
 # List of commands to generate JSON structures
 commands=(
-    "$SCRIPT_DIR/tree_project.sh ./ .tmp/tree_project.json"
-    "$SCRIPT_DIR/tree_git_changes.sh"
-    "$SCRIPT_DIR/tree_git_release_changes.sh"
-    "$SCRIPT_DIR/tree_git_siblings.sh"
+    "$PYTHON_MODULE utils.scan_tree ./ .tmp/tree_project.json --incremental"
+    "$PYTHON_MODULE utils.get_git_changes"
+    "$PYTHON_MODULE utils.get_git_changes --release"
+    "$PYTHON_MODULE utils.get_siblings"
 )
 
 # Execute each command
@@ -7,9 +7,23 @@ For command-line usage:
 
     # Production mode (default)
     python -m pkg.akads --json-path .tmp/tree_project.json
+
+    # Run the aider jobs, 8 at a time
+    python -m pkg.akads --execute --jobs 8
+
+    # Only directories changed by the last commit / the current release
+    python -m pkg.akads --changes
+    python -m pkg.akads --changes .tmp/tree_release_all.json
+
+    # One JSON record per planned job, on stdout or in a file
+    python -m pkg.akads --format jsonl > plans.jsonl
+    python -m pkg.akads --format jsonl --output .tmp/akads_plans.jsonl
 """
 
 import argparse
+from utils.run_jobs import DEFAULT_JOBS, DEFAULT_RETRIES, DEFAULT_TIMEOUT
+from .batch import DEFAULT_BATCH_TOKENS
+from .output import FORMATS
 from .run import run
 
 def main():
@@ -21,9 +35,34 @@ def main():
                       help="Running mode: prod (production) or dev (development)")
     parser.add_argument("--json-path", default=".tmp/tree_project.json",
                       help="Path to JSON file containing project structure")
+    parser.add_argument("--execute", action="store_true",
+                      help="Run the aider command of every directory instead of only displaying it")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                      help=f"Maximum number of aider processes running at once (default: {DEFAULT_JOBS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                      help=f"Seconds allowed per aider attempt (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                      help=f"Extra attempts for failed or timed-out jobs (default: {DEFAULT_RETRIES})")
+    parser.add_argument("--changes", nargs="?", const=".tmp/tree_git_changed.json",
+                      help="Only document directories with changed files, from a change tree "
+                           "(default when given without a path: .tmp/tree_git_changed.json)")
+    parser.add_argument("--batch-tokens", type=int, default=DEFAULT_BATCH_TOKENS,
+                      help="Token budget for packing small directories into one aider call, "
+                           f"0 to disable (default: {DEFAULT_BATCH_TOKENS})")
+    parser.add_argument("--force", action="store_true",
+                      help="With --execute, also run directories whose inputs are unchanged")
+    parser.add_argument("--trace",
+                      help="Write a Chrome trace of the stages to this file and print a summary "
+                           "(default: $CODEX_TRACE)")
+    parser.add_argument("--format", choices=FORMATS, default="human",
+                      help="Plan output: human (text groups) or jsonl (one JSON record per planned job; "
+                           "status messages then go to stderr)")
+    parser.add_argument("--output",
+                      help="Write the plans to this file instead of stdout")
     args = parser.parse_args()
     
-    run(args.json_path, args.mode)
+    run(args.json_path, args.mode, args.execute, args.jobs, args.timeout, args.retries,
+        args.force, args.changes, args.batch_tokens, args.trace, args.format, args.output)
 
 if __name__ == "__main__":
     main()
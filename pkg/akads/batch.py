@@ -0,0 +1,282 @@
+"""
+Token-budgeted batching of the documentation jobs.
+
+Most directory plans are a single small helper file, so running one aider
+call per directory is dominated by process startup and prompt overhead.
+This module packs consecutive small plans of the same documentation root
+(docs/react, docs/sass) into shared aider calls under a token budget.
+
+Packing is next-fit in plan order, which follows the project tree, so the
+same plans always produce the same batches. Plans estimated above half the
+budget are large and always run alone.
+
+A batched call gets its own message file: the prompt of its plans followed
+by the list of its directories, each with its documentation target and its
+files, so every directory is documented in its own docs/<kind>/<path>.
+After the calls, each directory of a batch gets its own result: a directory
+whose documentation target was not written by a successful call failed.
+
+Example usage:
+    from pkg.akads.batch import pack_plans, snapshot_docs, unpack_results
+
+    batches = pack_plans(plans, context.tmp("akads_batches"), budget=8_000)
+    before = snapshot_docs(batches)
+    results = run_jobs(batches)
+    plans, results = unpack_results(batches, results, before)
+"""
+
+import hashlib
+import os
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.run_jobs import JobResult
+from .execute import build_command
+
+DEFAULT_BATCH_TOKENS = 8_000
+
+# Most plans packed into one aider call
+MAX_BATCH_PLANS = 8
+
+# State of a documentation target: (name, size, mtime_ns) of its own files
+DocsState = Tuple[Tuple[str, int, int], ...]
+
+def estimate_tokens(plan: Dict[str, Any]) -> int:
+    """
+    Estimate the input tokens of a plan from the size of its files.
+
+    Uses the same characters / 4 heuristic as utils.get_token_count, with
+    file sizes standing in for character counts.
+
+    Args:
+        plan (Dict[str, Any]): Directory plan
+
+    Returns:
+        int: Estimated token count
+    """
+    size = 0
+    for path in plan["files"]:
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass
+    return size // 4
+
+def format_batch_message(plans: List[Dict[str, Any]], prompt: str) -> str:
+    """
+    Build the message of a batched call.
+
+    Args:
+        plans (List[Dict[str, Any]]): Plans of the batch
+        prompt (str): Prompt of a single directory
+
+    Returns:
+        str: The prompt, followed by every directory of the batch with its
+            documentation directory and files
+    """
+    lines = [
+        prompt.rstrip(),
+        "",
+        "---",
+        "",
+        f"# Batch of {len(plans)} directories",
+        "",
+        "This call documents several directories. Apply the instructions above to each "
+        "directory on its own, and write the documentation of a directory only in its "
+        "documentation directory.",
+    ]
+    for index, plan in enumerate(plans, 1):
+        lines += [
+            "",
+            f"## {index}. {plan['path']}",
+            "",
+            f"Documentation directory: {plan['doc_path']}",
+            "Files:",
+            *(f"- {path}" for path in plan["files"]),
+        ]
+    return "\n".join(lines).lstrip() + "\n"
+
+def write_batch_message(plans: List[Dict[str, Any]], message_dir: str) -> str:
+    """
+    Write the message file of a batched call.
+
+    The file is named after the documentation targets of the batch, so the
+    same batch always gets the same file.
+
+    Args:
+        plans (List[Dict[str, Any]]): Plans of the batch, sharing one prompt
+        message_dir (str): Directory of the batch message files
+
+    Returns:
+        str: Path of the message file
+    """
+    try:
+        with open(plans[0]["prompt"], 'r', encoding='utf-8') as f:
+            prompt = f.read()
+    except OSError:
+        prompt = ""
+
+    key = hashlib.blake2b("\0".join(plan["doc_path"] for plan in plans).encode(), digest_size=8)
+    message_path = os.path.join(message_dir, f"batch-{key.hexdigest()}.md")
+    os.makedirs(message_dir, exist_ok=True)
+    with open(message_path, 'w', encoding='utf-8') as f:
+        f.write(format_batch_message(plans, prompt))
+    return message_path
+
+def merge_plans(plans: List[Dict[str, Any]], message_dir: str) -> Dict[str, Any]:
+    """
+    Merge plans of the same documentation root into one batch plan.
+
+    A single plan is returned unchanged. A batch plan has the fields of a
+    directory plan, with the files and groups of all members, an aider
+    command reading every member's documentation directory with the batch
+    message file (see write_batch_message), and the member plans under "plans".
+
+    Args:
+        plans (List[Dict[str, Any]]): Plans with the same kind and prompt
+        message_dir (str): Directory of the batch message files
+
+    Returns:
+        Dict[str, Any]: Plan or batch plan
+    """
+    if len(plans) == 1:
+        return plans[0]
+
+    first = plans[0]
+    files = [path for plan in plans for path in plan["files"]]
+    groups: Dict[str, List[Dict[str, str]]] = {}
+    for plan in plans:
+        for name, entries in plan["groups"].items():
+            groups.setdefault(name, []).extend(entries)
+    message_path = write_batch_message(plans, message_dir)
+
+    return {
+        "kind": first["kind"],
+        "path": f"{first['path']} +{len(plans) - 1}",
+        "doc_path": first["doc_path"],
+        "prompt": message_path,
+        "files": files,
+        "groups": groups,
+        "command": build_command([plan["doc_path"] for plan in plans], message_path, files),
+        "plans": plans
+    }
+
+def pack_plans(plans: List[Dict[str, Any]], message_dir: str, budget: int = DEFAULT_BATCH_TOKENS,
+               estimate: Callable[[Dict[str, Any]], int] = estimate_tokens) -> List[Dict[str, Any]]:
+    """
+    Pack consecutive small plans into batch plans under a token budget.
+
+    Args:
+        plans (List[Dict[str, Any]]): Directory plans in project tree order
+        message_dir (str): Directory of the batch message files
+        budget (int): Maximum estimated tokens of a batch (0 disables batching)
+        estimate (Callable[[Dict[str, Any]], int]): Token estimator of a plan
+
+    Returns:
+        List[Dict[str, Any]]: Plans and batch plans, in plan order
+    """
+    if budget <= 0:
+        return list(plans)
+
+    packed = []
+    current: List[Dict[str, Any]] = []
+    current_tokens = 0
+    for plan in plans:
+        tokens = estimate(plan)
+        fits = (
+            current
+            and tokens <= budget // 2
+            and current_tokens + tokens <= budget
+            and len(current) < MAX_BATCH_PLANS
+            and (plan["kind"], plan["prompt"]) == (current[0]["kind"], current[0]["prompt"])
+        )
+        if not fits:
+            if current:
+                packed.append(merge_plans(current, message_dir))
+            current, current_tokens = [], 0
+        current.append(plan)
+        current_tokens += tokens
+        if tokens > budget // 2:
+            packed.append(merge_plans(current, message_dir))
+            current, current_tokens = [], 0
+    if current:
+        packed.append(merge_plans(current, message_dir))
+    return packed
+
+def get_docs_state(doc_path: str) -> DocsState:
+    """
+    Get the files of a documentation target with their size and mtime.
+
+    Only the target's own files count: subdirectories hold the docs of
+    other directories (e.g. docs/react/src/a/b for docs/react/src/a), so a
+    call writing there did not document this target.
+
+    Args:
+        doc_path (str): Documentation directory
+
+    Returns:
+        DocsState: Sorted (file name, size, mtime_ns) of its regular files
+            (empty if the directory does not exist)
+    """
+    state = []
+    try:
+        entries = list(os.scandir(doc_path))
+    except OSError:
+        return ()
+    for entry in entries:
+        try:
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+        except OSError:
+            continue
+        state.append((entry.name, st.st_size, st.st_mtime_ns))
+    return tuple(sorted(state))
+
+def snapshot_docs(batches: List[Dict[str, Any]]) -> Dict[str, DocsState]:
+    """
+    Get the documentation state of every directory of the batched calls.
+
+    Args:
+        batches (List[Dict[str, Any]]): Plans and batch plans about to run
+
+    Returns:
+        Dict[str, DocsState]: Documentation target to its state
+    """
+    return {
+        plan["doc_path"]: get_docs_state(plan["doc_path"])
+        for batch in batches for plan in batch.get("plans", [])
+    }
+
+def unpack_results(batches: List[Dict[str, Any]], results: List[JobResult],
+                   before: Optional[Dict[str, DocsState]] = None) -> Tuple[List[Dict[str, Any]], List[JobResult]]:
+    """
+    Give every directory plan of the batches its own result.
+
+    A directory of a successful batched call whose documentation target is
+    unchanged since the snapshot failed: the call did not document it.
+
+    Args:
+        batches (List[Dict[str, Any]]): Plans and batch plans that were run
+        results (List[JobResult]): Results in the order of the batches
+        before (Optional[Dict[str, DocsState]]): snapshot_docs() taken before
+            the calls (default: trust the result of the call)
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[JobResult]]: Directory plans and
+            their results
+    """
+    plans = []
+    plan_results = []
+    for batch, result in zip(batches, results):
+        if "plans" not in batch:
+            plans.append(batch)
+            plan_results.append(result)
+            continue
+        for plan in batch["plans"]:
+            error = ""
+            doc_path = plan["doc_path"]
+            if result.ok and before is not None and get_docs_state(doc_path) == before.get(doc_path):
+                error = f"no documentation written to {doc_path}"
+            plans.append(plan)
+            plan_results.append(replace(result, path=plan["path"], error=error or result.error))
+    return plans, plan_results
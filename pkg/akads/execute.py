@@ -0,0 +1,45 @@
+"""
+aider commands of the documentation jobs.
+
+Each directory plan built by run_doc_react / run_doc_sass carries the aider
+command for that directory, built here. The plans are run as jobs by
+utils.run_jobs: a bounded worker pool where every job is its own aider
+process, with a per-job timeout and retries.
+
+Example usage:
+    from pkg.akads.execute import build_command
+    from utils.run_jobs import run_jobs
+
+    command = build_command("docs/react/button", "pkg/akads/prompts/react.md", files)
+    results = run_jobs([{"path": "button", "command": command}], jobs=8)
+"""
+
+from typing import List, Union
+
+AIDER_COMMAND = [
+    "aider",
+    "--subtree-only",
+    "--no-auto-commit",
+    "--yes",
+    "--sonnet",
+    "--cache-prompts",
+    "--no-stream",
+    "--no-check-update",
+]
+
+def build_command(doc_path: Union[str, List[str]], prompt_path: str, paths: List[str]) -> List[str]:
+    """
+    Build the aider command for one directory or a batch of directories.
+
+    Args:
+        doc_path (Union[str, List[str]]): Documentation directory (or
+            directories) passed with --read
+        prompt_path (str): Prompt file passed with --message-file
+        paths (List[str]): Files to add to the aider session
+
+    Returns:
+        List[str]: Command arguments
+    """
+    doc_paths = [doc_path] if isinstance(doc_path, str) else doc_path
+    reads = [arg for path in doc_paths for arg in ("--read", path)]
+    return [*AIDER_COMMAND, *reads, "--message-file", prompt_path, *paths]
@@ -0,0 +1,201 @@
+"""
+Registry of the documentation generators.
+
+A generator documents one section of the project structure JSON (e.g.
+"react", "sass") and exposes run(json_data, mode, context, on_plan=None),
+which returns the directory plans of that section and passes each plan to
+on_plan as soon as it is built (on_plan is optional for generators). Generators are found without
+importing them:
+
+- modules of this package named run_doc_<section> (run_doc_react.py
+  handles the "react" section);
+- "pkg.akads.generators" entry points of installed packages, named after
+  their section:
+
+      [project.entry-points."pkg.akads.generators"]
+      vue = "my_package.run_doc_vue"
+
+A generator is imported only when its section has "src" data in the tree,
+so adding generators keeps the startup of pkg.akads flat.
+
+Example usage:
+    from pkg.akads.generators import get_generators, select_generators
+
+    generators = get_generators()
+    for generator in select_generators(json_data, generators):
+        plans.extend(generator.load().run(json_data, mode, context))
+
+Command-line usage:
+    # List the generators
+    python -m pkg.akads.generators
+
+    # Measure the import time of pkg.akads
+    python -m pkg.akads.generators --import-time
+"""
+
+import argparse
+import os
+import pkgutil
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Dict, List, Tuple
+
+ENTRY_POINT_GROUP = "pkg.akads.generators"
+MODULE_PREFIX = "run_doc_"
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+@dataclass(frozen=True)
+class Generator:
+    """
+    Documentation generator of one JSON section.
+
+    Attributes:
+        section (str): Section of the project structure it documents
+        module (str): Module exposing run(json_data, mode, context[, on_plan])
+        source (str): Where it was found ("package" or "entry point")
+    """
+    section: str
+    module: str
+    source: str = "package"
+
+    @property
+    def label(self) -> str:
+        """Display name of the section (e.g. "React")."""
+        return self.section.capitalize()
+
+    def load(self) -> ModuleType:
+        """Import the generator module."""
+        return import_module(self.module)
+
+def discover_package() -> Dict[str, Generator]:
+    """
+    Find the run_doc_<section> modules of this package without importing them.
+
+    Returns:
+        Dict[str, Generator]: Generators by section
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    return {
+        info.name[len(MODULE_PREFIX):]: Generator(info.name[len(MODULE_PREFIX):], f"{__package__}.{info.name}")
+        for info in pkgutil.iter_modules([package_dir])
+        if info.name.startswith(MODULE_PREFIX)
+    }
+
+def discover_entry_points() -> Dict[str, Generator]:
+    """
+    Find the generators declared as entry points by installed packages.
+
+    Returns:
+        Dict[str, Generator]: Generators by section
+    """
+    # Reading package metadata is only needed here, not at import time
+    from importlib.metadata import entry_points
+
+    return {
+        entry_point.name: Generator(entry_point.name, entry_point.value.split(":")[0], "entry point")
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+    }
+
+def get_generators(use_entry_points: bool = True) -> Dict[str, Generator]:
+    """
+    Get all known generators. Modules of this package take precedence over
+    entry points for the same section.
+
+    Args:
+        use_entry_points (bool): Whether to look for entry points
+
+    Returns:
+        Dict[str, Generator]: Generators by section, sorted by section
+    """
+    generators = discover_entry_points() if use_entry_points else {}
+    generators.update(discover_package())
+    return dict(sorted(generators.items()))
+
+def get_key_paths(generators: Dict[str, Generator]) -> List[str]:
+    """
+    Get the JSON key paths read by the generators (e.g. "react.src").
+
+    Args:
+        generators (Dict[str, Generator]): Generators by section
+
+    Returns:
+        List[str]: Dot-separated key paths
+    """
+    return [f"{section}.src" for section in generators]
+
+def select_generators(json_data: Dict[str, Any], generators: Dict[str, Generator]) -> List[Generator]:
+    """
+    Get the generators whose section has "src" data.
+
+    Args:
+        json_data (Dict[str, Any]): Project structure
+        generators (Dict[str, Generator]): Generators by section
+
+    Returns:
+        List[Generator]: Generators to run, in section order
+    """
+    return [
+        generator for section, generator in generators.items()
+        if isinstance(json_data.get(section), dict) and "src" in json_data[section]
+    ]
+
+def measure_import_time(module: str = "pkg.akads") -> Tuple[int, List[str]]:
+    """
+    Measure the cumulative import time of a module in a fresh interpreter.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Tuple[int, List[str]]: Import time in microseconds and the generator
+            modules imported along with it
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    total = 0
+    imported = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        if name == module:
+            total = int(match.group(2))
+        if name.rpartition(".")[2].startswith(MODULE_PREFIX):
+            imported.append(name)
+    return total, imported
+
+def main():
+    """
+    Main function to list the generators or measure the import time.
+    Called when running as a module: python -m pkg.akads.generators
+    """
+    parser = argparse.ArgumentParser(description="List the documentation generators")
+    parser.add_argument("--import-time", action="store_true",
+                      help="Measure the import time of pkg.akads")
+    args = parser.parse_args()
+
+    if args.import_time:
+        total, imported = measure_import_time()
+        print(f"⏱️  import pkg.akads: {total / 1000:.1f} ms")
+        if imported:
+            print(f"⚠️  Generators imported eagerly: {', '.join(imported)}")
+        else:
+            print("✅ No generator imported at startup")
+        return
+
+    generators = get_generators()
+    print(f"\n📦 {len(generators)} documentation generators:")
+    for generator in generators.values():
+        print(f"  - {generator.section}: {generator.module} ({generator.source})")
+    print()
+
+if __name__ == "__main__":
+    main()
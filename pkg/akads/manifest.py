@@ -0,0 +1,241 @@
+"""
+Content-hash manifest of the generated documentation.
+
+The manifest (docs/.akads-manifest.json) maps every documentation target
+(docs/react/<path>, docs/sass/<path>) to a hash of the input files of its
+plan and of its prompt file. Targets whose inputs are unchanged since their
+last successful job are skipped.
+
+File digests are cached in the manifest by size and mtime, so checking a
+large tree only re-hashes files that changed; the remaining files are hashed
+in parallel.
+
+Example usage:
+    from pkg.akads.manifest import (
+        get_manifest_path, get_target_hashes, load_manifest, record_results,
+        save_manifest, select_pending
+    )
+
+    manifest_path = get_manifest_path(context)
+    manifest = load_manifest(manifest_path)
+    hashes = get_target_hashes(plans, manifest)
+    pending, skipped = select_pending(plans, manifest, hashes)
+    results = run_jobs(pending)
+    record_results(manifest, pending, results, hashes)
+    save_manifest(manifest_path, manifest)
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from utils.get_run_context import RunContext
+from utils.run_jobs import JobResult
+from utils.scan_tree import RACY_WINDOW_NS
+
+MANIFEST_NAME = ".akads-manifest.json"
+MANIFEST_VERSION = 1
+
+# Keys of the group entries (see run_doc_react / run_doc_sass) naming input files
+INPUT_KEYS = ("component", "config", "story", "file")
+
+def get_manifest_path(context: RunContext) -> str:
+    """
+    Get the manifest path under the documentation root.
+
+    Args:
+        context (RunContext): Run context
+
+    Returns:
+        str: Manifest path (e.g. docs/.akads-manifest.json)
+    """
+    return context.docs(MANIFEST_NAME)
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """
+    Load the manifest, or return an empty one if it is missing or invalid.
+
+    Args:
+        manifest_path (str): Manifest path
+
+    Returns:
+        Dict[str, Any]: Manifest with "files" and "targets"
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if (manifest.get("version") == MANIFEST_VERSION
+                and isinstance(manifest.get("files"), dict)
+                and isinstance(manifest.get("targets"), dict)):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"version": MANIFEST_VERSION, "hashed_ns": 0, "files": {}, "targets": {}}
+
+def save_manifest(manifest_path: str, manifest: Dict[str, Any]) -> None:
+    """
+    Atomically write the manifest.
+
+    Args:
+        manifest_path (str): Manifest path
+        manifest (Dict[str, Any]): Manifest to write
+    """
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(temp_path, manifest_path)
+
+def get_input_files(plan: Dict[str, Any]) -> List[str]:
+    """
+    Get the input files of a directory plan: its grouped files and prompt.
+
+    Args:
+        plan (Dict[str, Any]): Directory plan from run_doc_react / run_doc_sass
+
+    Returns:
+        List[str]: Sorted, de-duplicated input file paths
+    """
+    paths = {plan["prompt"]}
+    for entries in plan["groups"].values():
+        for info in entries:
+            for key in INPUT_KEYS:
+                if key in info:
+                    paths.add(f"{info['path']}/{info[key]}")
+    return sorted(paths)
+
+def _hash_file(path: str) -> Optional[List[Any]]:
+    """
+    Hash a file, returning [size, mtime_ns, digest] or None if it is missing.
+    """
+    try:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            digest = hashlib.blake2b(digest_size=20)
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+
+def hash_files(paths: List[str], manifest: Dict[str, Any], workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Get the digests of files, reusing cached digests of unchanged files.
+
+    A cached digest is reused when the file's size and mtime match and the
+    file was modified more than RACY_WINDOW_NS before it was hashed; every
+    other file is hashed in a thread pool. The manifest's file cache is
+    updated in place: entries of the given paths are added or refreshed,
+    entries of given paths that no longer exist are removed, and the
+    entries of other files (e.g. outside the directories of a --changes
+    run) are kept, except those that were racy when they were hashed.
+
+    Args:
+        paths (List[str]): File paths
+        manifest (Dict[str, Any]): Manifest holding the file cache
+        workers (Optional[int]): Number of hashing threads
+
+    Returns:
+        Dict[str, str]: Path to digest ("" for missing files)
+    """
+    cache = manifest["files"]
+    racy_ns = manifest.get("hashed_ns", 0) - RACY_WINDOW_NS
+    entries: Dict[str, Optional[List[Any]]] = {}
+    stale = []
+    for path in dict.fromkeys(paths):
+        cached = cache.get(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            entries[path] = None
+            continue
+        if cached and cached[:2] == [st.st_size, st.st_mtime_ns] and st.st_mtime_ns < racy_ns:
+            entries[path] = cached
+        else:
+            stale.append(path)
+
+    manifest["hashed_ns"] = time.time_ns()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, entry in zip(stale, executor.map(_hash_file, stale)):
+            entries[path] = entry
+
+    # hashed_ns moves forward, so untouched entries that were racy against the
+    # previous hash time could no longer be told apart: drop them
+    for path in [path for path, cached in cache.items() if path not in entries and cached[1] >= racy_ns]:
+        del cache[path]
+    for path, entry in entries.items():
+        if entry:
+            cache[path] = entry
+        else:
+            cache.pop(path, None)
+    return {path: entry[2] if entry else "" for path, entry in entries.items()}
+
+def get_target_hashes(plans: List[Dict[str, Any]], manifest: Dict[str, Any],
+                      workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Compute the input hash of every documentation target.
+
+    Args:
+        plans (List[Dict[str, Any]]): Directory plans
+        manifest (Dict[str, Any]): Manifest holding the file cache
+        workers (Optional[int]): Number of hashing threads
+
+    Returns:
+        Dict[str, str]: Documentation target (doc_path) to input hash
+    """
+    inputs = {plan["doc_path"]: get_input_files(plan) for plan in plans}
+    digests = hash_files([path for paths in inputs.values() for path in paths], manifest, workers)
+
+    hashes = {}
+    for doc_path, paths in inputs.items():
+        target = hashlib.blake2b(doc_path.encode(), digest_size=20)
+        for path in paths:
+            target.update(f"\0{path}\0{digests[path]}".encode())
+        hashes[doc_path] = target.hexdigest()
+    return hashes
+
+def select_pending(plans: List[Dict[str, Any]], manifest: Dict[str, Any],
+                   hashes: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split plans into the ones to run and the unchanged ones to skip.
+
+    A plan is skipped when its documentation target exists and its input
+    hash matches the hash recorded for its last successful job.
+
+    Args:
+        plans (List[Dict[str, Any]]): Directory plans
+        manifest (Dict[str, Any]): Manifest with the recorded target hashes
+        hashes (Dict[str, str]): Current target hashes from get_target_hashes
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: Pending and skipped plans
+    """
+    pending = []
+    skipped = []
+    for plan in plans:
+        doc_path = plan["doc_path"]
+        if manifest["targets"].get(doc_path) == hashes[doc_path] and os.path.exists(doc_path):
+            skipped.append(plan)
+        else:
+            pending.append(plan)
+    return pending, skipped
+
+def record_results(manifest: Dict[str, Any], plans: List[Dict[str, Any]],
+                   results: List[JobResult], hashes: Dict[str, str]) -> None:
+    """
+    Record the input hashes of the targets whose jobs succeeded.
+
+    Args:
+        manifest (Dict[str, Any]): Manifest to update
+        plans (List[Dict[str, Any]]): Plans that were run
+        results (List[JobResult]): Results in the order of the plans
+        hashes (Dict[str, str]): Target hashes computed before the run
+    """
+    for plan, result in zip(plans, results):
+        if result.ok:
+            manifest["targets"][plan["doc_path"]] = hashes[plan["doc_path"]]
@@ -0,0 +1,179 @@
+"""
+Output of the akads directory plans.
+
+Generators only build plans; this module writes them as they are built,
+one record per planned aider job, in one of two formats:
+
+- "human": the file groups of the directory and a separator line, as
+  displayed by pkg.akads so far;
+- "jsonl": one JSON object per line with the kind, name, paths, doc target,
+  prompt, file groups and full command, for executors and schedulers.
+
+Each record is rendered into one string and written with a single write,
+to stdout or to a file opened with a large buffer. With JSONL on stdout,
+the status messages of the run go to stderr, so stdout only has records.
+
+Example usage:
+    from pkg.akads.output import open_plan_output
+
+    with open_plan_output("jsonl", ".tmp/akads_plans.jsonl") as writer:
+        plans = process_structure(json_data, mode, context, output=writer)
+
+Command-line usage:
+    python -m pkg.akads --format jsonl > plans.jsonl
+    python -m pkg.akads --format jsonl --output .tmp/akads_plans.jsonl
+"""
+
+import json
+import os
+import sys
+from contextlib import contextmanager, redirect_stdout
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+FORMATS = ("human", "jsonl")
+
+# Write buffer of plan files
+BUFFER_SIZE = 1 << 16
+
+def plan_record(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the output record of a directory plan.
+
+    Args:
+        plan (Dict[str, Any]): Directory plan from a generator
+
+    Returns:
+        Dict[str, Any]: kind, name (directory name), path, doc_path, prompt,
+            files, groups and command
+    """
+    return {
+        "kind": plan["kind"],
+        "name": os.path.basename(plan["path"]) or plan["path"],
+        "path": plan["path"],
+        "doc_path": plan["doc_path"],
+        "prompt": plan.get("prompt"),
+        "files": plan["files"],
+        "groups": plan.get("groups", {}),
+        "command": plan["command"],
+    }
+
+def _render_react(groups: Dict[str, List[Dict[str, str]]]) -> List[str]:
+    """Lines of the story, component and TS groups of a React directory."""
+    lines = []
+    sections = (
+        ("story", "Run Storybook Doc:", ("component", "config", "story")),
+        ("component", "Run Component Doc:", ("component", "config")),
+        ("ts", "Run TS Doc:", ("file",)),
+    )
+    for group, title, keys in sections:
+        if groups.get(group):
+            lines += ["", title]
+            for info in groups[group]:
+                lines.append(info["name"])
+                lines.extend(f"{info['path']}/{info[key]}" for key in keys)
+    return lines
+
+def _render_sass(groups: Dict[str, List[Dict[str, str]]]) -> List[str]:
+    """Lines of the SCSS group of a Sass directory."""
+    lines = ["", "Run SCSS Doc:"]
+    for info in groups.get("scss", []):
+        lines += [info["name"], f"{info['path']}/{info['file']}"]
+    return lines
+
+# Human renderers by plan kind; other kinds list the files of the plan
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    "react": _render_react,
+    "sass": _render_sass,
+}
+
+def format_human(record: Dict[str, Any]) -> str:
+    """
+    Render a record in the human format.
+
+    Args:
+        record (Dict[str, Any]): Record from plan_record
+
+    Returns:
+        str: Text block of the directory, ending with a separator line
+    """
+    renderer = RENDERERS.get(record["kind"])
+    if renderer is not None:
+        lines = renderer(record["groups"])
+    else:
+        lines = ["", f"Run {record['kind']} Doc:", *record["files"]]
+    lines += ["", "-" * 80]
+    return "\n".join(lines) + "\n"
+
+class PlanWriter:
+    """
+    Writes plan records to a stream.
+
+    Attributes:
+        format (str): "human" or "jsonl"
+        stream (TextIO): Output stream
+        count (int): Records written
+    """
+
+    def __init__(self, output_format: str = "human", stream: Optional[TextIO] = None):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown plan format: {output_format} (expected one of {', '.join(FORMATS)})")
+        self.format = output_format
+        self.stream = stream if stream is not None else sys.stdout
+        self.count = 0
+
+    def write(self, plan: Dict[str, Any]) -> None:
+        """
+        Write the record of one plan.
+
+        Args:
+            plan (Dict[str, Any]): Directory plan
+        """
+        record = plan_record(plan)
+        if self.format == "jsonl":
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self.stream.write(format_human(record))
+        self.count += 1
+
+    def write_all(self, plans: Iterable[Dict[str, Any]]) -> None:
+        """
+        Write the records of several plans.
+
+        Args:
+            plans (Iterable[Dict[str, Any]]): Directory plans
+        """
+        for plan in plans:
+            self.write(plan)
+
+@contextmanager
+def open_plan_output(output_format: str = "human", path: Optional[str] = None) -> Iterator[PlanWriter]:
+    """
+    Open the plan output of a run.
+
+    Args:
+        output_format (str): "human" or "jsonl"
+        path (Optional[str]): File to write the records to (default: stdout)
+
+    Yields:
+        PlanWriter: Writer of the plan records; with JSONL on stdout,
+            print() goes to stderr until the context exits
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown plan format: {output_format} (expected one of {', '.join(FORMATS)})")
+
+    if path:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+            yield PlanWriter(output_format, f)
+    elif output_format == "jsonl":
+        stdout = sys.stdout
+        try:
+            with redirect_stdout(sys.stderr):
+                yield PlanWriter(output_format, stdout)
+        finally:
+            stdout.flush()
+    else:
+        yield PlanWriter(output_format)
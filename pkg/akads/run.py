@@ -3,49 +3,163 @@ Core implementation of the documentation generator.
 """
 
 import importlib.util
+import inspect
 import sys
 import os
-from typing import Dict, Any
-from utils.get_base_path import get_base_path
+from typing import Dict, Any, List, Optional, Union
+from utils.get_run_context import RunContext, get_run_context
+from utils.get_siblings import build_dir_index, get_siblings, iter_tree_files
+from utils.load_cached_json import load_cached_json
 from utils.load_json import load_json
-from . import run_doc_react
-from . import run_doc_sass
+from utils.run_jobs import DEFAULT_JOBS, DEFAULT_RETRIES, DEFAULT_TIMEOUT, run_jobs
+from utils.trace_span import finish_tracing, is_tracing, setup_tracing, trace_span, traced
+from .batch import DEFAULT_BATCH_TOKENS, pack_plans, snapshot_docs, unpack_results
+from .generators import Generator, get_generators, get_key_paths, select_generators
+from .manifest import (
+    get_manifest_path, get_target_hashes, load_manifest, record_results, save_manifest, select_pending
+)
+from .output import PlanWriter, open_plan_output
 
-def process_structure(json_data: Dict[str, Any], mode: str) -> None:
+@traced("akads.process_structure")
+def process_structure(json_data: Dict[str, Any], mode: str, context: Optional[RunContext] = None,
+                      generators: Optional[Dict[str, Generator]] = None,
+                      output: Optional[PlanWriter] = None) -> List[Dict[str, Any]]:
     """
     Process the JSON structure and run appropriate documentation generators.
 
+    Only the generators whose section has "src" data are imported and run
+    (see pkg.akads.generators). Each plan is written to the plan output as
+    soon as its generator builds it (see pkg.akads.output); generators whose
+    run() has no on_plan parameter have their plans written when it returns.
+
     Args:
         json_data (Dict[str, Any]): The loaded JSON structure to process.
         mode (str): Running mode, either "prod" or "dev"
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        generators (Optional[Dict[str, Generator]]): Generators by section
+            (discovered when omitted)
+        output (Optional[PlanWriter]): Plan output (default: human format
+            on stdout)
+
+    Returns:
+        List[Dict[str, Any]]: Plans of the directories with files to document
     """
-    found_structures = False
+    context = context or get_run_context(mode)
+    generators = generators if generators is not None else get_generators()
+    output = output or PlanWriter()
+    plans = []
 
-    # Check for React structure
-    if "react" in json_data and "src" in json_data["react"]:
-        found_structures = True
-        print("📝 Processing React documentation...")
-        try:
-            run_doc_react.run(json_data, mode)
-            print("✅ React documentation processed successfully")
-        except Exception as e:
-            print(f"❌ Error processing React documentation: {e}")
-    
-    # Check for Sass structure
-    if "sass" in json_data and "src" in json_data["sass"]:
-        found_structures = True
-        print("📝 Processing Sass documentation...")
+    selected = select_generators(json_data, generators)
+    for generator in selected:
+        print(f"📝 Processing {generator.label} documentation...")
         try:
-            run_doc_sass.run(json_data, mode)
-            print("✅ Sass documentation processed successfully")
+            with trace_span("akads.load_generator", section=generator.section):
+                module = generator.load()
+            if "on_plan" in inspect.signature(module.run).parameters:
+                generator_plans = module.run(json_data, mode, context, on_plan=output.write)
+            else:
+                generator_plans = module.run(json_data, mode, context)
+                output.write_all(generator_plans)
+            plans.extend(generator_plans)
+            print(f"✅ {generator.label} documentation processed successfully")
         except Exception as e:
-            print(f"❌ Error processing Sass documentation: {e}")
+            print(f"❌ Error processing {generator.label} documentation: {e}")
+
+    if not selected:
+        labels = [generator.label for generator in generators.values()]
+        sections = [f"'{section}'" for section in generators]
+        print(f"\n⚠️  No {' or '.join(labels)} structures found in the JSON data")
+        print(f"💡 Make sure your JSON file contains {' and/or '.join(sections)} sections with 'src' data")
+
+    return plans
+
+def select_changes(json_data: Dict[str, Any], changes: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Restrict the project structure to the directories affected by changes.
+
+    Every directory containing a file of the change tree is kept with all
+    its files, so component/config/story groups stay complete; files of
+    the change tree outside the project structure are ignored.
+
+    Args:
+        json_data (Dict[str, Any]): Project structure (tree_project.json)
+        changes (Union[str, Dict[str, Any]]): Change tree, or the path of its
+            JSON file (e.g. .tmp/tree_git_changed.json,
+            .tmp/tree_release_all.json or .tmp/tree_git_siblings.json)
+
+    Returns:
+        Dict[str, Any]: Project structure with only the affected directories
+    """
+    changes_tree = load_json(changes) if isinstance(changes, str) else changes
+    changed = list(iter_tree_files(changes_tree))
+    affected = get_siblings(build_dir_index(json_data), changed, sort_files=False)
+    directories = sum(
+        1 for node in build_dir_index(affected).values() if isinstance(node.get("files"), list)
+    )
+    print(f"🔍 {len(changed):,} changed files affect {directories:,} directories")
+    return affected
+
+@traced("akads.execute_plans")
+def execute_plans(plans: List[Dict[str, Any]], context: RunContext, jobs: int = DEFAULT_JOBS,
+                  timeout: Optional[float] = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                  force: bool = False, batch_tokens: int = DEFAULT_BATCH_TOKENS) -> bool:
+    """
+    Run the aider jobs of the plans whose inputs changed since their last run.
+
+    Consecutive small plans are packed into shared aider calls (see
+    pkg.akads.batch); a plan of a successful call only counts as documented
+    if the call wrote to its documentation directory.
+
+    Args:
+        plans (List[Dict[str, Any]]): Directory plans from process_structure
+        context (RunContext): Run context
+        jobs (int): Maximum number of aider processes running at once
+        timeout (Optional[float]): Seconds allowed per aider attempt
+        retries (int): Extra attempts for failed or timed-out jobs
+        force (bool): Run every plan, even if its inputs are unchanged
+        batch_tokens (int): Token budget of a batched call (0 disables batching)
+
+    Returns:
+        bool: True if every job that ran succeeded
+    """
+    manifest_path = get_manifest_path(context)
+    manifest = load_manifest(manifest_path)
+    hashes = get_target_hashes(plans, manifest)
+    pending, skipped = (plans, []) if force else select_pending(plans, manifest, hashes)
+    print(f"\n⏭️  Skipping {len(skipped)} unchanged directories, {len(pending)} to document")
+
+    batches = pack_plans(pending, context.tmp("akads_batches"), batch_tokens)
+    if len(batches) < len(pending):
+        print(f"📦 Packed {len(pending)} directories into {len(batches)} aider calls "
+              f"({len(pending) - len(batches)} calls saved)")
+
+    before = snapshot_docs(batches)
+    results = run_jobs(batches, jobs, timeout, retries, log_dir=context.tmp("akads_logs"))
+    pending, plan_results = unpack_results(batches, results, before)
+    record_results(manifest, pending, plan_results, hashes)
+    save_manifest(manifest_path, manifest)
 
-    if not found_structures:
-        print("\n⚠️  No React or Sass structures found in the JSON data")
-        print("💡 Make sure your JSON file contains 'react' and/or 'sass' sections with 'src' data")
+    failed = [result for result in plan_results if not result.ok]
+    print(f"\n📊 Documented: {len(pending) - len(failed)}, failed: {len(failed)}, "
+          f"skipped (unchanged): {len(skipped)}, aider calls: {len(results)}")
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(pending)} directories failed:")
+        for result in failed:
+            if result.timed_out:
+                reason = "timed out"
+            elif result.returncode != 0:
+                reason = f"exit code {result.returncode}"
+            else:
+                reason = result.error
+            print(f"   {result.path} ({reason})")
+        print(f"💡 See the job logs in {context.tmp('akads_logs')}")
+    return not failed
 
-def run(json_path: str = ".tmp/tree_project.json", mode: str = "prod") -> None:
+def run(json_path: str = ".tmp/tree_project.json", mode: str = "prod", execute: bool = False,
+        jobs: int = DEFAULT_JOBS, timeout: Optional[float] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES, force: bool = False, changes: Optional[str] = None,
+        batch_tokens: int = DEFAULT_BATCH_TOKENS, trace: Optional[str] = None,
+        output_format: str = "human", output_path: Optional[str] = None) -> None:
     """
     Runs the documentation generation process.
     
@@ -54,22 +168,69 @@ def run(json_path: str = ".tmp/tree_project.json", mode: str = "prod") -> None:
         mode (str): Running mode, either "prod" or "dev" (default: "prod")
             - "prod": Running from .codex in another repository
             - "dev": Running locally from codex repository
+        execute (bool): Run the aider command of every directory instead of
+            only displaying the groups (default: False)
+        jobs (int): Maximum number of aider processes running at once
+        timeout (Optional[float]): Seconds allowed per aider attempt
+        retries (int): Extra attempts for failed or timed-out jobs
+        force (bool): Run every job, even for directories whose inputs are
+            unchanged since their last successful job (default: False)
+        changes (Optional[str]): Change tree JSON; only directories with
+            changed files are documented (default: the whole structure)
+        batch_tokens (int): Token budget for packing small directories into
+            one aider call (0 runs one call per directory)
+        trace (Optional[str]): Write a Chrome trace of the stages to this
+            file (default: $CODEX_TRACE; no trace when unset)
+        output_format (str): Plan output format, "human" or "jsonl" (one
+            JSON record per planned job; on stdout, status messages go to stderr)
+        output_path (Optional[str]): File to write the plans to (default: stdout)
+    """
+    tracing = is_tracing()
+    setup_tracing(trace)
+    with open_plan_output(output_format, output_path) as output:
+        try:
+            _run(json_path, mode, execute, jobs, timeout, retries, force, changes, batch_tokens, output)
+        finally:
+            # Print the trace summary while status messages still go to
+            # stderr, so a JSONL stdout only has records
+            if not tracing:
+                finish_tracing()
+
+def _run(json_path: str, mode: str, execute: bool, jobs: int, timeout: Optional[float], retries: int,
+         force: bool, changes: Optional[str], batch_tokens: int, output: PlanWriter) -> None:
+    """
+    Body of run(), writing the plans to an open plan output.
     """
     print(f"\n🚀 Starting documentation generation in {mode} mode...\n")
     print(f"📂 Using JSON file: {json_path}")
 
     try:
-        # Get base path for the current environment
-        base = get_base_path()
-        print(f"📍 Base path: {base}")
+        # Resolve the environment once for the whole run
+        context = get_run_context(mode)
+        print(f"📍 Base path: {context.base}")
         
-        # Load and validate JSON structure
+        # Load only the sections processed below (served from the
+        # binary snapshot when the JSON is unchanged since the last run)
         print("📖 Loading JSON structure...")
-        json_data = load_json(json_path)
+        generators = get_generators()
+        json_data = load_cached_json(json_path, get_key_paths(generators))
         print("✅ JSON structure loaded successfully")
+
+        # Keep only the directories affected by the changes
+        if changes:
+            print(f"📂 Using changes file: {changes}")
+            if not os.path.exists(changes):
+                print(f"❌ Error: Changes file not found: {changes}")
+                print("💡 Run tree_generate_all.sh first to generate the change trees")
+                sys.exit(1)
+            with trace_span("akads.select_changes"):
+                json_data = select_changes(json_data, changes)
+            if not json_data:
+                print("\n✨ No documented directories affected by the changes\n")
+                return
         
         # Process the structure
-        process_structure(json_data, mode)
+        plans = process_structure(json_data, mode, context, generators, output)
         
     except FileNotFoundError:
         print(f"❌ Error: JSON file not found: {json_path}")
@@ -79,4 +240,7 @@ def run(json_path: str = ".tmp/tree_project.json", mode: str = "prod") -> None:
         print(f"❌ Error processing documentation: {e}")
         sys.exit(1)
 
+    if execute and not execute_plans(plans, context, jobs, timeout, retries, force, batch_tokens):
+        sys.exit(1)
+
     print("\n✨ Documentation generation complete!\n")
@@ -7,8 +7,10 @@ and generating documentation based on different command strategies.
 
 import os
 import subprocess
-from typing import Dict, Any, List
-from utils.get_base_path import get_base_path
+from typing import Callable, Dict, Any, List, Optional, Set
+from utils.get_run_context import RunContext, get_run_context
+from utils.trace_span import traced
+from .execute import build_command
 
 # File patterns to exclude
 EXCLUDED_EXTENSIONS = [
@@ -63,149 +65,196 @@ def format_component_info(base_name: str, files: List[str], dir_path: str) -> Di
 
     return info
 
-def display_command(files: List[str], dir_path: str, mode: str = "prod") -> None:
+def classify_files(files: List[str], dir_path: str) -> Dict[str, List[Dict[str, str]]]:
     """
-    Generates and displays the command for the given set of files.
+    Classify the files of one directory into story, component and TS groups.
 
-    Args:
-        files (List[str]): List of files to be documented.
-        dir_path (str): Current directory path.
-        mode (str): Running mode, either "prod" or "dev" (default: "prod")
-    """
-    # Get base path for the current environment
-    base = get_base_path()
+    The base name of a file is the part before its first dot, so every file
+    is indexed once by base name and remaining suffix; each group is then
+    resolved with set lookups, in linear time for any directory size.
 
-    # Join all file names into a single string, separated by space
-    add_files = " ".join(files)
-
-    # Add dir_path prefix to each file name
-    react_files = " ".join(f"{dir_path}/{file}" for file in files)
+    - story: base names with all STORY_REQUIRED_EXTENSIONS files
+    - component: .tsx files (not stories or excluded) whose base name has a
+      .config.ts file; a base name can be both a story and a component
+    - ts: remaining .ts/.tsx files not matching EXCLUDED_PREFIXES or
+      EXCLUDED_EXTENSIONS and whose base name is in neither group above
 
-    # Calculate documentation path
-    # 1. Remove 'react/src' from the beginning of dir_path (first occurrence only)
-    # 2. Remove any slash at the start or end of resulting path
-    relative_path = dir_path.replace('react/src', '', 1).strip('/')
-    
-    # Build final documentation path:
-    # - If relative_path is not empty, use 'docs/react/{relative_path}'
-    # - If relative_path is empty (we're at react/src root), use just 'docs/react'
-    doc_path = f"docs/react/{relative_path}" if relative_path else "docs/react"
-    
-    base_aider = f"aider --subtree-only --no-auto-commit --yes --sonnet --cache-prompts --no-stream --no-check-update" 
-    guidelines = f'--read "{doc_path}"'
-    message = f'--message-file "{base}/pkg/akads/prompts/react.md"'
-    command = f"{base_aider} {guidelines} {message} {react_files}"
+    Args:
+        files (List[str]): File names of the directory
+        dir_path (str): Directory path for the files
 
-    # print(f"\nFiles: {files}")
-    # print(f"react_files: {react_files}")
-    # print(f"relative_path: react/src/{relative_path}")
-    # print(f"doc_path: {doc_path}/README.md") 
-    # print(f"\nrun_command: \n {command}")
+    Returns:
+        Dict[str, List[Dict[str, str]]]: "story", "component" and "ts" groups,
+            in order of first appearance in files
+    """
+    excluded_extensions = tuple(EXCLUDED_EXTENSIONS)
+    excluded_prefixes = tuple(EXCLUDED_PREFIXES)
+    story_suffixes = {ext[1:] for ext in STORY_REQUIRED_EXTENSIONS}
 
-    # Helper function to get the base name of a file (without extension)
-    def get_base_name(file):
-        return file.split('.')[0]
+    # Suffixes present for each base name: "Button.config.ts" -> "config.ts"
+    suffixes: Dict[str, Set[str]] = {}
+    for file in files:
+        base_name, dot, suffix = file.partition('.')
+        if dot:
+            suffixes.setdefault(base_name, set()).add(suffix)
 
-    # Process story files
-    story_files = {}
+    story_files: Dict[str, Dict[str, str]] = {}
+    component_files: Dict[str, Dict[str, str]] = {}
     for file in files:
+        if not file.endswith('.tsx'):
+            continue
+        base_name = file.split('.')[0]
         if file.endswith('.stories.tsx'):
-            base_name = get_base_name(file).replace('.stories', '')
-            if all(f"{base_name}{ext}" in files for ext in STORY_REQUIRED_EXTENSIONS):
+            if base_name not in story_files and story_suffixes <= suffixes[base_name]:
                 story_files[base_name] = format_component_info(
                     base_name,
                     [f"{base_name}{ext}" for ext in STORY_REQUIRED_EXTENSIONS],
                     dir_path
                 )
-
-    # Process component files
-    component_files = {}
-    for file in files:
-        if (file.endswith('.tsx') and 
-            not file.endswith('.stories.tsx') and 
-            not any(file.endswith(ext) for ext in EXCLUDED_EXTENSIONS)):
-            base_name = get_base_name(file)
-            if f"{base_name}.config.ts" in files:
+        elif not file.endswith(excluded_extensions):
+            if base_name not in component_files and 'config.ts' in suffixes.get(base_name, ()):
                 component_files[base_name] = format_component_info(
                     base_name,
                     [f"{base_name}{ext}" for ext in COMPONENT_REQUIRED_EXTENSIONS],
                     dir_path
                 )
 
-    # Process remaining ts files
     ts_files = []
     for file in files:
-        base_name = get_base_name(file)
-        if ((file.endswith('.ts') or file.endswith('.tsx')) and
-            not any(file.startswith(prefix) for prefix in EXCLUDED_PREFIXES) and
-            not any(file.endswith(ext) for ext in EXCLUDED_EXTENSIONS) and
+        base_name = file.split('.')[0]
+        if (file.endswith(('.ts', '.tsx')) and
+            not file.startswith(excluded_prefixes) and
+            not file.endswith(excluded_extensions) and
             base_name not in story_files and
-            base_name not in component_files and
-            file not in [item for sublist in story_files.values() for item in sublist] and
-            file not in [item for sublist in component_files.values() for item in sublist]):
+            base_name not in component_files):
             ts_files.append({
                 "name": base_name,
                 "file": file,
                 "path": dir_path
             })
 
-    # Print results
-    if story_files:
-        print("\nRun Storybook Doc:")
-        for info in story_files.values():
-            print(info["name"])
-            print(info["path"] + "/" + info["component"])
-            print(info["path"] + "/" + info["config"])
-            print(info["path"] + "/" + info["story"])
-
-    if component_files:
-        print("\nRun Component Doc:")
-        for info in component_files.values():
-            print(info["name"])
-            print(info["path"] + "/" + info["component"])
-            print(info["path"] + "/" + info["config"])
-
-    if ts_files:
-        print("\nRun TS Doc:")
-        for info in ts_files:
-            print(info["name"])
-            print(info["path"]+ "/" + info["file"])
+    return {
+        "story": list(story_files.values()),
+        "component": list(component_files.values()),
+        "ts": ts_files
+    }
+
+def display_command(files: List[str], dir_path: str, mode: str = "prod",
+                    context: Optional[RunContext] = None) -> Optional[Dict[str, Any]]:
+    """
+    Builds the plan and aider command for the given set of files.
+
+    The plan is displayed by pkg.akads.output, in the human or JSONL format.
+
+    Args:
+        files (List[str]): List of files to be documented.
+        dir_path (str): Current directory path.
+        mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        context (Optional[RunContext]): Run context (resolved when omitted)
+
+    Returns:
+        Optional[Dict[str, Any]]: Directory plan (kind, path, doc_path, prompt,
+            files, groups and aider command), or None if there is nothing to document
+    """
+    # Get the run context for the current environment
+    context = context or get_run_context(mode)
+
+    # Join all file names into a single string, separated by space
+    add_files = " ".join(files)
+
+    # Add dir_path prefix to each file name
+    react_paths = [f"{dir_path}/{file}" for file in files]
+    react_files = " ".join(react_paths)
+
+    # Calculate documentation path
+    # 1. Remove 'react/src' from the beginning of dir_path (first occurrence only)
+    # 2. Remove any slash at the start or end of resulting path
+    relative_path = dir_path.replace('react/src', '', 1).strip('/')
+    
+    # Build final documentation path:
+    # - If relative_path is not empty, use 'docs/react/{relative_path}'
+    # - If relative_path is empty (we're at react/src root), use just 'docs/react'
+    doc_path = context.docs("react", relative_path)
+    
+    prompt_path = context.prompt("react")
+    command = build_command(doc_path, prompt_path, react_paths)
+
+    # print(f"\nFiles: {files}")
+    # print(f"react_files: {react_files}")
+    # print(f"relative_path: react/src/{relative_path}")
+    # print(f"doc_path: {doc_path}/README.md") 
+    # print(f"\nrun_command: \n {command}")
+
+    groups = classify_files(files, dir_path)
 
     # Check if there is any files to process
-    if story_files or component_files or ts_files:
-        print()
-        print("-" * 80)
+    if not (groups["story"] or groups["component"] or groups["ts"]):
+        return None
+
+    return {
+        "kind": "react",
+        "path": dir_path,
+        "doc_path": doc_path,
+        "prompt": prompt_path,
+        "files": react_paths,
+        "groups": groups,
+        "command": command
+    }
 
-def process_directory(json: Dict[str, Any], current_path: str = "", mode: str = "prod") -> None:
+def process_directory(json: Dict[str, Any], current_path: str = "", mode: str = "prod",
+                      context: Optional[RunContext] = None,
+                      on_plan: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
     """
-    Recursively processes a directory and displays commands for found files.
+    Recursively processes a directory and builds the plans of found files.
 
     Args:
         json (Dict[str, Any]): Directory structure to process.
         current_path (str): Current path in directory structure.
         mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        on_plan (Optional[Callable[[Dict[str, Any]], None]]): Called with each
+            plan as soon as it is built (e.g. PlanWriter.write)
+
+    Returns:
+        List[Dict[str, Any]]: Plans of the directories with files to document
     """
+    context = context or get_run_context(mode)
+    plans = []
     for key, value in json.items():
         if key == '__snapshots__':
             continue
         if key == 'files':
             if value:
-                display_command(value, current_path, mode)
+                plan = display_command(value, current_path, mode, context)
+                if plan:
+                    plans.append(plan)
+                    if on_plan is not None:
+                        on_plan(plan)
         else:
             new_path = os.path.join(current_path, key)
-            process_directory(value, new_path, mode)
+            plans.extend(process_directory(value, new_path, mode, context, on_plan))
+    return plans
 
-def run(json: Dict[str, Any], mode: str = "prod") -> None:
+@traced("akads.react.run")
+def run(json: Dict[str, Any], mode: str = "prod", context: Optional[RunContext] = None,
+        on_plan: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
     """
-    Processes the React src directory structure and displays commands for found files.
+    Processes the React src directory structure and builds the plans of found files.
 
     Args:
         json (Dict[str, Any]): The complete JSON structure.
         mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        on_plan (Optional[Callable[[Dict[str, Any]], None]]): Called with each
+            plan as soon as it is built (e.g. PlanWriter.write)
+
+    Returns:
+        List[Dict[str, Any]]: Plans of the directories with files to document
     """
     print("-" * 80)
     print("Starting - React Docs:")
     print("-" * 80)
-    process_directory(json["react"]["src"], "react/src", mode)
+    plans = process_directory(json["react"]["src"], "react/src", mode, context, on_plan)
     print("Processing completed.")
     print("-" * 80)
+    return plans
@@ -7,8 +7,10 @@ and generating documentation based on different command strategies.
 
 import os
 import subprocess
-from typing import Dict, Any, List
-from utils.get_base_path import get_base_path
+from typing import Callable, Dict, Any, List, Optional
+from utils.get_run_context import RunContext, get_run_context
+from utils.trace_span import traced
+from .execute import build_command
 
 # File patterns to exclude
 EXCLUDED_EXTENSIONS = [
@@ -38,32 +40,39 @@ def format_scss_info(file: str, dir_path: str) -> Dict[str, str]:
         "path": dir_path
     }
 
-def display_command(files: List[str], dir_path: str, mode: str = "prod") -> None:
+def display_command(files: List[str], dir_path: str, mode: str = "prod",
+                    context: Optional[RunContext] = None) -> Optional[Dict[str, Any]]:
     """
-    Generates and displays the command for the given set of files.
+    Builds the plan and aider command for the given set of files.
+
+    The plan is displayed by pkg.akads.output, in the human or JSONL format.
 
     Args:
         files (List[str]): List of files to be documented.
         dir_path (str): Current directory path.
         mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        context (Optional[RunContext]): Run context (resolved when omitted)
+
+    Returns:
+        Optional[Dict[str, Any]]: Directory plan (kind, path, doc_path, prompt,
+            files, groups and aider command), or None if there is nothing to document
     """
-    # Get base path for the current environment
-    base = get_base_path()
+    # Get the run context for the current environment
+    context = context or get_run_context(mode)
 
     # Join all file names into a single string, separated by space
     add_files = " ".join(files)
 
     # Add dir_path prefix to each file name
-    sass_files = " ".join(f"{dir_path}/{file}" for file in files)
+    sass_paths = [f"{dir_path}/{file}" for file in files]
+    sass_files = " ".join(sass_paths)
 
     # Calculate documentation path
     relative_path = dir_path.replace('sass/src', '', 1).strip('/')
-    doc_path = f"docs/sass/{relative_path}" if relative_path else "docs/sass"
+    doc_path = context.docs("sass", relative_path)
     
-    base_aider = f"aider --subtree-only --no-auto-commit --yes --sonnet --cache-prompts --no-stream --no-check-update" 
-    guidelines = f'--read "{doc_path}"'
-    message = f'--message-file "{base}/pkg/akads/prompts/sass.md"'
-    command = f"{base_aider} {guidelines} {message} {sass_files}"
+    prompt_path = context.prompt("sass")
+    command = build_command(doc_path, prompt_path, sass_paths)
 
     # print(f"\nFiles: {files}")
     # print(f"sass_files: {sass_files}")
@@ -79,42 +88,72 @@ def display_command(files: List[str], dir_path: str, mode: str = "prod") -> None
             not any(file.endswith(ext) for ext in EXCLUDED_EXTENSIONS)):
             scss_files.append(format_scss_info(file, dir_path))
 
-    # Print results
-    if scss_files:
-        print("\nRun SCSS Doc:")
-        for info in scss_files:
-            print(info)
-        print()
-        print("-" * 80)
+    # Check if there is any files to process
+    if not scss_files:
+        return None
+
+    return {
+        "kind": "sass",
+        "path": dir_path,
+        "doc_path": doc_path,
+        "prompt": prompt_path,
+        "files": sass_paths,
+        "groups": {"scss": scss_files},
+        "command": command
+    }
 
-def process_directory(json: Dict[str, Any], current_path: str = "", mode: str = "prod") -> None:
+def process_directory(json: Dict[str, Any], current_path: str = "", mode: str = "prod",
+                      context: Optional[RunContext] = None,
+                      on_plan: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
     """
-    Recursively processes a directory and displays commands for found files.
+    Recursively processes a directory and builds the plans of found files.
 
     Args:
         json (Dict[str, Any]): Directory structure to process.
         current_path (str): Current path in directory structure.
         mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        on_plan (Optional[Callable[[Dict[str, Any]], None]]): Called with each
+            plan as soon as it is built (e.g. PlanWriter.write)
+
+    Returns:
+        List[Dict[str, Any]]: Plans of the directories with files to document
     """
+    context = context or get_run_context(mode)
+    plans = []
     for key, value in json.items():
         if key == 'files':
             if value:
-                display_command(value, current_path, mode)
+                plan = display_command(value, current_path, mode, context)
+                if plan:
+                    plans.append(plan)
+                    if on_plan is not None:
+                        on_plan(plan)
         else:
             new_path = os.path.join(current_path, key)
-            process_directory(value, new_path, mode)
+            plans.extend(process_directory(value, new_path, mode, context, on_plan))
+    return plans
 
-def run(json: Dict[str, Any], mode: str = "prod") -> None:
+@traced("akads.sass.run")
+def run(json: Dict[str, Any], mode: str = "prod", context: Optional[RunContext] = None,
+        on_plan: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
     """
-    Processes the Sass src directory structure and displays commands for found files.
+    Processes the Sass src directory structure and builds the plans of found files.
 
     Args:
         json (Dict[str, Any]): The complete JSON structure.
         mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        on_plan (Optional[Callable[[Dict[str, Any]], None]]): Called with each
+            plan as soon as it is built (e.g. PlanWriter.write)
+
+    Returns:
+        List[Dict[str, Any]]: Plans of the directories with files to document
     """
     print("-" * 80)
     print("Starting - Sass Docs:")
     print("-" * 80)
-    process_directory(json["sass"]["src"], "sass/src", mode)
+    plans = process_directory(json["sass"]["src"], "sass/src", mode, context, on_plan)
     print("Processing completed.")
     print("-" * 80)
+    return plans
@@ -0,0 +1,16 @@
+"""
+Benchmark suite of the documentation and changelog entry points.
+
+For programmatic usage:
+    from pkg.benchmark import run
+    ok = run(profile="small", repeat=5)
+
+    # Build a synthetic repository only
+    from pkg.benchmark import PROFILES, build_repo
+    build_repo("/tmp/bench-repo", PROFILES["medium"])
+"""
+
+from .run import run
+from .synthetic import PROFILES, RepoSpec, build_repo
+
+__all__ = ['PROFILES', 'RepoSpec', 'build_repo', 'run']
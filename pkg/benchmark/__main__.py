@@ -0,0 +1,65 @@
+"""
+Command-line interface for the benchmark suite.
+
+For command-line usage:
+    # Time every stage in the small synthetic repository
+    python -m pkg.benchmark
+
+    # Record the baseline of the medium profile, then compare later runs with it
+    python -m pkg.benchmark --profile medium --save-baseline
+    python -m pkg.benchmark --profile medium --threshold 0.1
+
+    # Only some stages, with a custom history
+    python -m pkg.benchmark --stages scan_tree,write_git_logs --commits 2000 --merges 100
+"""
+
+import argparse
+import sys
+from dataclasses import asdict, replace
+from utils.run_jobs import DEFAULT_JOBS
+from .run import DEFAULT_REPEAT, DEFAULT_THRESHOLD, run
+from .synthetic import LAYOUTS, PROFILES, RepoSpec
+
+def main():
+    """
+    Parse command line arguments and run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Time the pipeline stages in a synthetic monorepo")
+    parser.add_argument("--profile", choices=list(PROFILES), default="small",
+                      help="Repository shape and baseline name (default: small)")
+    for field_name, default in asdict(RepoSpec()).items():
+        if field_name == "layout":
+            parser.add_argument("--layout", choices=LAYOUTS, help="Directory layout")
+        else:
+            parser.add_argument(f"--{field_name.replace('_', '-')}", type=type(default),
+                              help=f"Override the profile's {field_name.replace('_', ' ')}")
+    parser.add_argument("--stages",
+                      help="Comma-separated stages to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                      help=f"Runs per stage, the best is kept (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                      help=f"Allowed slowdown against the baseline (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--baseline",
+                      help="Baseline file (default: .benchmarks/<profile>.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                      help="Save the results as the baseline instead of comparing")
+    parser.add_argument("--repo",
+                      help="Build the repository here and keep it (default: a temporary directory)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                      help=f"Concurrent fake aider jobs of akads.execute (default: {DEFAULT_JOBS})")
+    parser.add_argument("--aider-delay", type=float, default=0.0,
+                      help="Seconds each fake aider call waits (default: 0)")
+    args = parser.parse_args()
+
+    overrides = {name: value for name, value in vars(args).items()
+                 if name in asdict(RepoSpec()) and value is not None}
+    spec = replace(PROFILES[args.profile], **overrides)
+    stages = args.stages.split(",") if args.stages else None
+
+    ok = run(args.profile, spec, stages, args.repeat, args.threshold, args.baseline,
+             args.save_baseline, args.repo, args.jobs, args.aider_delay)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Check of the batched documentation calls.
+
+Builds a synthetic repository (see synthetic.py), plans its
+directories and runs them with execute_plans, batching small directories,
+twice:
+
+- with the fake aider of pkg.benchmark, which writes a README.md in every
+  documentation directory listed by the batch message file: every directory
+  of a batch must get its docs in its own docs/<kind>/<path>, nowhere else,
+  and be recorded in the manifest;
+- with an aider that exits 0 without writing anything: no directory of a
+  batch may be recorded in the manifest, and the run must fail;
+- with a batch holding a directory and its parent, and an aider that only
+  writes the child's docs: the parent must fail and stay out of the
+  manifest, since docs written below it belong to the child.
+
+Command-line usage:
+    python -m pkg.benchmark.check_batch
+
+    # Keep the synthetic repository for inspection
+    python -m pkg.benchmark.check_batch --keep
+"""
+
+import argparse
+import io
+import os
+import shlex
+import shutil
+import stat
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from typing import Any, Dict, List, Set
+from utils.get_run_context import RunContext, get_run_context
+from utils.scan_tree import scan_tree
+from pkg.akads.batch import DEFAULT_BATCH_TOKENS, pack_plans
+from pkg.akads.generators import get_generators
+from pkg.akads.manifest import get_manifest_path, load_manifest
+from pkg.akads.run import execute_plans, process_structure
+from pkg.pipeline.run import select_sections
+from .run import prepare_repo
+from .synthetic import PROFILES, build_repo
+
+def _install_silent_aider(bin_dir: str) -> None:
+    """Write an `aider` script that succeeds without writing anything."""
+    os.makedirs(bin_dir, exist_ok=True)
+    script = os.path.join(bin_dir, "aider")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write("#!/bin/sh\nexit 0\n")
+    os.chmod(script, os.stat(script).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+def _install_child_aider(bin_dir: str, doc_path: str) -> None:
+    """Write an `aider` script that only writes a README.md in doc_path."""
+    os.makedirs(bin_dir, exist_ok=True)
+    script = os.path.join(bin_dir, "aider")
+    target = shlex.quote(os.path.abspath(doc_path))
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(f"#!/bin/sh\nmkdir -p {target} && echo '# Docs' > {target}/README.md\n")
+    os.chmod(script, os.stat(script).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+def _written_docs(context: RunContext) -> Set[str]:
+    """Documentation directories holding a README.md."""
+    return {
+        os.path.normpath(root)
+        for root, _, names in os.walk(context.docs())
+        if "README.md" in names
+    }
+
+def _execute(plans: List[Dict[str, Any]], context: RunContext, bin_dir: str) -> bool:
+    """Run the plans with the aider of bin_dir, from an empty docs directory (and manifest)."""
+    shutil.rmtree(context.docs(), ignore_errors=True)
+    path = os.environ.get("PATH", "")
+    os.environ["PATH"] = bin_dir + os.pathsep + path
+    try:
+        with redirect_stdout(io.StringIO()):
+            return execute_plans(plans, context, jobs=4, timeout=None, retries=0, force=True,
+                                 batch_tokens=DEFAULT_BATCH_TOKENS)
+    finally:
+        os.environ["PATH"] = path
+
+def check(plans: List[Dict[str, Any]], context: RunContext, fake_bin: str, silent_bin: str) -> List[str]:
+    """
+    Run the batched calls with both aiders and check where the docs went.
+
+    Args:
+        plans (List[Dict[str, Any]]): Directory plans
+        context (RunContext): Run context of the synthetic repository
+        fake_bin (str): Directory of the fake aider following the batch messages
+        silent_bin (str): Directory of the aider writing nothing
+
+    Returns:
+        List[str]: Failed checks (empty if all passed)
+    """
+    errors = []
+    batches = pack_plans(plans, context.tmp("akads_batches"), DEFAULT_BATCH_TOKENS)
+    members = [plan for batch in batches for plan in batch.get("plans", [])]
+    batched = {os.path.normpath(plan["doc_path"]) for plan in members}
+    singles = [batch for batch in batches if "plans" not in batch]
+    print(f"📦 {len(plans)} directories in {len(batches)} calls, {len(members)} of them batched")
+    if not members:
+        return ["no directories were batched"]
+
+    if not _execute(plans, context, fake_bin):
+        errors.append("the batched run with the fake aider failed")
+    written = _written_docs(context)
+    for doc_path in sorted(batched - written):
+        errors.append(f"no docs written to {doc_path}")
+    for doc_path in sorted(written - batched):
+        errors.append(f"docs written outside of the batched directories: {doc_path}")
+    targets = load_manifest(get_manifest_path(context))["targets"]
+    missing = [plan["doc_path"] for plan in plans if plan["doc_path"] not in targets]
+    if missing:
+        errors.append(f"{len(missing)} documented directories missing from the manifest")
+    print(f"{'✅' if not errors else '❌'} fake aider: docs of {len(written & batched)} of "
+          f"{len(batched)} batched directories in their own docs/<kind>/<path>")
+
+    count = len(errors)
+    if _execute(plans, context, silent_bin):
+        errors.append("the run with an aider writing nothing succeeded")
+    targets = load_manifest(get_manifest_path(context))["targets"]
+    recorded = [plan["doc_path"] for plan in members if plan["doc_path"] in targets]
+    for doc_path in recorded:
+        errors.append(f"undocumented batched directory recorded in the manifest: {doc_path}")
+    if any(plan["doc_path"] not in targets for plan in singles):
+        errors.append("successful single-directory calls missing from the manifest")
+    print(f"{'✅' if len(errors) == count else '❌'} silent aider: {len(recorded)} of {len(members)} "
+          "undocumented batched directories recorded")
+    return errors
+
+def check_nested(plans: List[Dict[str, Any]], context: RunContext, child_bin: str) -> List[str]:
+    """
+    Batch a directory with its parent and only write the child's docs.
+
+    Args:
+        plans (List[Dict[str, Any]]): Directory plans
+        context (RunContext): Run context of the synthetic repository
+        child_bin (str): Directory for the aider writing the child's docs only
+
+    Returns:
+        List[str]: Failed checks (empty if all passed)
+    """
+    child = next((plan for plan in plans if plan["kind"] == "react"), None)
+    if child is None:
+        return ["no React directory to nest"]
+    parent = dict(child, path=os.path.dirname(child["path"]), doc_path=os.path.dirname(child["doc_path"]))
+    nested = [parent, child]
+    if len(pack_plans(nested, context.tmp("akads_batches"), DEFAULT_BATCH_TOKENS)) != 1:
+        return ["the directory and its parent were not batched"]
+    _install_child_aider(child_bin, child["doc_path"])
+
+    errors = []
+    if _execute(nested, context, child_bin):
+        errors.append("the run succeeded although the parent was not documented")
+    targets = load_manifest(get_manifest_path(context))["targets"]
+    if parent["doc_path"] in targets:
+        errors.append(f"undocumented parent recorded in the manifest: {parent['doc_path']}")
+    if child["doc_path"] not in targets:
+        errors.append(f"documented child missing from the manifest: {child['doc_path']}")
+    print(f"{'✅' if not errors else '❌'} nested: only the docs of {child['path']} written, "
+          f"parent {parent['path']} {'recorded' if parent['doc_path'] in targets else 'not recorded'}")
+    return errors
+
+def main():
+    """
+    Main function of the batched calls check.
+    Called when running as a module: python -m pkg.benchmark.check_batch
+    """
+    parser = argparse.ArgumentParser(description="Check that batched aider calls document each directory")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small",
+                      help="Synthetic repository profile (default: small)")
+    parser.add_argument("--keep", action="store_true",
+                      help="Keep the synthetic repository")
+    args = parser.parse_args()
+
+    repo = tempfile.mkdtemp(prefix="akads-batch-")
+    previous_dir = os.getcwd()
+    try:
+        print(f"🏗️  Building the {args.profile} synthetic repository in {repo}...")
+        build_repo(repo, PROFILES[args.profile])
+        fake_bin = os.path.dirname(prepare_repo(repo))
+        silent_bin = os.path.join(repo, ".git", "silent-bin")
+        _install_silent_aider(silent_bin)
+        os.chdir(repo)
+
+        context = get_run_context()
+        generators = get_generators()
+        with redirect_stdout(io.StringIO()):
+            plans = process_structure(select_sections(scan_tree("./"), generators), context.mode,
+                                      context, generators)
+        errors = check(plans, context, fake_bin, silent_bin)
+        errors += check_nested(plans, context, os.path.join(repo, ".git", "child-bin"))
+    finally:
+        os.chdir(previous_dir)
+        if not args.keep:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    if errors:
+        print("\n❌ Batched calls check failed:")
+        for error in errors:
+            print(f"   {error}")
+        sys.exit(1)
+    print("\n✨ Every batched directory was documented in its own directory")
+
+if __name__ == "__main__":
+    main()
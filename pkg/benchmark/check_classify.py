@@ -0,0 +1,211 @@
+"""
+Regression check of pkg.akads.run_doc_react.classify_files.
+
+classify_files replaced a quadratic grouping (list membership checks and
+flattened lists rebuilt for every candidate file) with set and suffix
+indexes. This check keeps the previous algorithm as a reference and
+asserts that both give the same story, component and TS groups, in the
+same order, on:
+
+- synthetic directories of 50,000 files (components with and without
+  stories and configs, helpers, excluded and index files, multi-dot names);
+- many small randomized directories covering the edge cases.
+
+The reference is slow on purpose: at 50,000 files it takes about 30 seconds
+per directory, against a fraction of a second for classify_files.
+
+Command-line usage:
+    # Full check (50,000-file directories)
+    python -m pkg.benchmark.check_classify
+
+    # Quicker run with smaller directories
+    python -m pkg.benchmark.check_classify --files 5000 --random 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+from pkg.akads.run_doc_react import (
+    COMPONENT_REQUIRED_EXTENSIONS, EXCLUDED_EXTENSIONS, EXCLUDED_PREFIXES, STORY_REQUIRED_EXTENSIONS,
+    classify_files, format_component_info
+)
+
+DEFAULT_FILES = 50_000
+DEFAULT_RANDOM = 1_000
+DIR_PATH = "react/src/components"
+
+Groups = Dict[str, List[Dict[str, str]]]
+
+def reference_classify(files: List[str], dir_path: str) -> Groups:
+    """
+    Group the files with the algorithm classify_files replaced.
+
+    Args:
+        files (List[str]): File names of the directory
+        dir_path (str): Directory path for the files
+
+    Returns:
+        Groups: "story", "component" and "ts" groups
+    """
+    def get_base_name(file):
+        return file.split('.')[0]
+
+    story_files = {}
+    for file in files:
+        if file.endswith('.stories.tsx'):
+            base_name = get_base_name(file).replace('.stories', '')
+            if all(f"{base_name}{ext}" in files for ext in STORY_REQUIRED_EXTENSIONS):
+                story_files[base_name] = format_component_info(
+                    base_name,
+                    [f"{base_name}{ext}" for ext in STORY_REQUIRED_EXTENSIONS],
+                    dir_path
+                )
+
+    component_files = {}
+    for file in files:
+        if (file.endswith('.tsx') and
+            not file.endswith('.stories.tsx') and
+            not any(file.endswith(ext) for ext in EXCLUDED_EXTENSIONS)):
+            base_name = get_base_name(file)
+            if f"{base_name}.config.ts" in files:
+                component_files[base_name] = format_component_info(
+                    base_name,
+                    [f"{base_name}{ext}" for ext in COMPONENT_REQUIRED_EXTENSIONS],
+                    dir_path
+                )
+
+    ts_files = []
+    for file in files:
+        base_name = get_base_name(file)
+        if ((file.endswith('.ts') or file.endswith('.tsx')) and
+            not any(file.startswith(prefix) for prefix in EXCLUDED_PREFIXES) and
+            not any(file.endswith(ext) for ext in EXCLUDED_EXTENSIONS) and
+            base_name not in story_files and
+            base_name not in component_files and
+            file not in [item for sublist in story_files.values() for item in sublist] and
+            file not in [item for sublist in component_files.values() for item in sublist]):
+            ts_files.append({
+                "name": base_name,
+                "file": file,
+                "path": dir_path
+            })
+
+    return {
+        "story": list(story_files.values()),
+        "component": list(component_files.values()),
+        "ts": ts_files
+    }
+
+def _component_files(rng: random.Random, name: str) -> List[str]:
+    """Files of one component with a random subset of its companions."""
+    files = []
+    if rng.random() < 0.9:
+        files.append(f"{name}.tsx")
+    for suffix, chance in ((".config.ts", 0.7), (".stories.tsx", 0.5), (".test.tsx", 0.3),
+                           (".mock.ts", 0.1), (".d.ts", 0.05), (".module.scss", 0.2)):
+        if rng.random() < chance:
+            files.append(f"{name}{suffix}")
+    return files
+
+def build_directory(size: int, seed: int, shape: str = "mixed") -> List[str]:
+    """
+    Build the file names of a synthetic directory.
+
+    Args:
+        size (int): Number of files
+        seed (int): Random seed
+        shape (str): "mixed" (components, helpers, excluded and index files),
+            "components" (components only) or "helpers" (.ts files only)
+
+    Returns:
+        List[str]: File names in random order, so the order of the groups
+            (which follows the order of the files) is checked too
+    """
+    rng = random.Random(seed)
+    files: List[str] = []
+    index = 0
+    while len(files) < size:
+        index += 1
+        roll = rng.random()
+        if shape == "helpers" or (shape == "mixed" and roll < 0.25):
+            files.append(f"use{index}.ts" if rng.random() < 0.8 else f"helper.{index}.ts")
+        elif shape == "mixed" and roll < 0.30:
+            files.append(rng.choice([f"index{index}.ts", f"index.{index}.tsx", f"README{index}.md"]))
+        else:
+            files.extend(_component_files(rng, f"Component{index}"))
+    files = files[:size]
+    rng.shuffle(files)
+    return files
+
+def compare(files: List[str], label: str,
+            classify: Callable[[List[str], str], Groups] = classify_files) -> Tuple[bool, float, float]:
+    """
+    Compare classify_files with the reference on one directory.
+
+    Args:
+        files (List[str]): File names
+        label (str): Name shown in errors
+        classify (Callable[[List[str], str], Groups]): Implementation under test
+
+    Returns:
+        Tuple[bool, float, float]: Whether the groups match, and the seconds
+            taken by the reference and by the implementation
+    """
+    started = time.perf_counter()
+    expected = reference_classify(files, DIR_PATH)
+    reference_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = classify(files, DIR_PATH)
+    classify_time = time.perf_counter() - started
+
+    if actual == expected:
+        return True, reference_time, classify_time
+    for group in ("story", "component", "ts"):
+        if actual[group] != expected[group]:
+            print(f"❌ {label}: {group} group differs "
+                  f"({len(actual[group])} entries, expected {len(expected[group])})")
+            for got, want in zip(actual[group], expected[group]):
+                if got != want:
+                    print(f"   first difference: {got} != {want}")
+                    break
+    return False, reference_time, classify_time
+
+def main():
+    """
+    Main function of the classify_files regression check.
+    Called when running as a module: python -m pkg.benchmark.check_classify
+    """
+    parser = argparse.ArgumentParser(description="Check classify_files against the previous algorithm")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES,
+                      help=f"Files in each large directory (default: {DEFAULT_FILES:,})")
+    parser.add_argument("--random", type=int, default=DEFAULT_RANDOM,
+                      help=f"Small randomized directories (default: {DEFAULT_RANDOM:,})")
+    args = parser.parse_args()
+
+    ok = True
+    for seed, shape in enumerate(("mixed", "components", "helpers")):
+        files = build_directory(args.files, seed, shape)
+        print(f"🔍 {shape}: {len(files):,} files...", end=" ", flush=True)
+        matched, reference_time, classify_time = compare(files, shape)
+        ok = ok and matched
+        print(f"{'✅' if matched else '❌'} reference {reference_time:.2f}s, classify_files {classify_time:.3f}s")
+
+    rng = random.Random(1000)
+    mismatches = 0
+    for seed in range(args.random):
+        files = build_directory(rng.randint(1, 60), 1000 + seed, rng.choice(("mixed", "components")))
+        if not compare(files, f"random directory {seed}")[0]:
+            mismatches += 1
+    print(f"{'✅' if not mismatches else '❌'} {args.random - mismatches:,} of {args.random:,} "
+          "randomized directories match")
+
+    if not ok or mismatches:
+        print("\n❌ classify_files differs from the previous algorithm")
+        sys.exit(1)
+    print("\n✨ classify_files matches the previous algorithm")
+
+if __name__ == "__main__":
+    main()
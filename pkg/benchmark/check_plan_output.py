@@ -0,0 +1,153 @@
+"""
+Check of the akads plan output.
+
+Builds a synthetic repository (see synthetic.py), writes its project tree
+and runs python -m pkg.akads in it, in a fresh process, with tracing
+enabled ($CODEX_TRACE):
+
+- with --format jsonl: every stdout line must be a JSON record (no status
+  message or trace summary), and the trace file must be written;
+- with the human format: every plan must be displayed while its section is
+  processed, between the "Starting" and "Processing completed." banners,
+  and there must be as many plans as JSONL records.
+
+Command-line usage:
+    python -m pkg.benchmark.check_plan_output
+
+    # Keep the synthetic repository for inspection
+    python -m pkg.benchmark.check_plan_output --keep
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List, Tuple
+from utils.scan_tree import scan_tree, write_tree
+from utils.trace_span import TRACE_ENV
+from .run import CODEX_ROOT, prepare_repo
+from .synthetic import PROFILES, build_repo
+
+# Last line of a plan in the human format, after an empty line
+SEPARATOR = "-" * 80
+
+def _run_akads(repo: str, trace_path: str, *args: str) -> Tuple[int, str, str]:
+    """Run pkg.akads in the repository with tracing; returns exit code, stdout and stderr."""
+    env = dict(os.environ, PYTHONPATH=CODEX_ROOT)
+    env[TRACE_ENV] = trace_path
+    result = subprocess.run([sys.executable, "-m", "pkg.akads", *args], cwd=repo, env=env,
+                            capture_output=True, text=True)
+    return result.returncode, result.stdout, result.stderr
+
+def check_jsonl(repo: str, trace_path: str) -> Tuple[int, List[str]]:
+    """
+    Check that stdout only has JSON records with tracing enabled.
+
+    Args:
+        repo (str): Synthetic repository with .tmp/tree_project.json
+        trace_path (str): Trace file to write
+
+    Returns:
+        Tuple[int, List[str]]: Number of records, and the failed checks
+    """
+    errors = []
+    code, stdout, stderr = _run_akads(repo, trace_path, "--format", "jsonl")
+    if code != 0:
+        errors.append(f"pkg.akads --format jsonl exited with {code}")
+    lines = stdout.splitlines()
+    invalid = []
+    for line in lines:
+        try:
+            json.loads(line)
+        except json.JSONDecodeError:
+            invalid.append(line)
+    for line in invalid[:5]:
+        errors.append(f"non-JSON line on stdout: {line!r}")
+    if len(invalid) > 5:
+        errors.append(f"... and {len(invalid) - 5} more non-JSON lines")
+    if not lines:
+        errors.append("no records on stdout")
+    if not os.path.exists(trace_path):
+        errors.append(f"trace file not written: {trace_path}")
+    if "Trace summary" not in stderr:
+        errors.append("no trace summary on stderr")
+    print(f"{'✅' if not errors else '❌'} jsonl: {len(lines) - len(invalid)} of {len(lines)} "
+          "stdout lines are JSON records")
+    return len(lines) - len(invalid), errors
+
+def check_human(repo: str, trace_path: str, records: int) -> List[str]:
+    """
+    Check that human-format plans are displayed while their section runs.
+
+    Args:
+        repo (str): Synthetic repository with .tmp/tree_project.json
+        trace_path (str): Trace file to write
+        records (int): Number of JSONL records of the same run
+
+    Returns:
+        List[str]: Failed checks
+    """
+    errors = []
+    code, stdout, _ = _run_akads(repo, trace_path)
+    if code != 0:
+        errors.append(f"pkg.akads exited with {code}")
+
+    plans = 0
+    outside = 0
+    in_section = False
+    previous = None
+    for line in stdout.splitlines():
+        if line.startswith("Starting - "):
+            in_section = True
+        elif line == "Processing completed.":
+            in_section = False
+        elif line == SEPARATOR and previous == "":
+            plans += 1
+            outside += not in_section
+        previous = line
+    if outside:
+        errors.append(f"{outside} plans displayed outside of their section")
+    if plans != records:
+        errors.append(f"{plans} plans displayed in the human format, {records} JSONL records")
+    print(f"{'✅' if not errors else '❌'} human: {plans - outside} of {plans} plans displayed "
+          "while their section is processed")
+    return errors
+
+def main():
+    """
+    Main function of the plan output check.
+    Called when running as a module: python -m pkg.benchmark.check_plan_output
+    """
+    parser = argparse.ArgumentParser(description="Check the akads plan output with tracing enabled")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small",
+                      help="Synthetic repository profile (default: small)")
+    parser.add_argument("--keep", action="store_true",
+                      help="Keep the synthetic repository")
+    args = parser.parse_args()
+
+    repo = tempfile.mkdtemp(prefix="akads-output-")
+    try:
+        print(f"🏗️  Building the {args.profile} synthetic repository in {repo}...")
+        build_repo(repo, PROFILES[args.profile])
+        prepare_repo(repo)
+        write_tree(scan_tree(repo), os.path.join(repo, ".tmp", "tree_project.json"))
+        trace_path = os.path.join(repo, ".tmp", "trace.json")
+
+        records, errors = check_jsonl(repo, trace_path)
+        errors += check_human(repo, trace_path, records)
+    finally:
+        if not args.keep:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    if errors:
+        print("\n❌ Plan output check failed:")
+        for error in errors:
+            print(f"   {error}")
+        sys.exit(1)
+    print("\n✨ JSONL stdout only has records, and human plans are displayed in order")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Fake aider command for offline benchmarks.
+
+Accepts the arguments of the akads and changelog aider commands, reads the
+--read and --message-file inputs and the files passed to the session (as
+aider would), waits $FAKE_AIDER_DELAY seconds to stand in for the model,
+and writes a short Markdown result to every .md file passed to the session
+(e.g. .tmp/changelog.md). Like the model would, it also writes a README.md
+in every documentation directory listed by the message file of a batched
+akads call (see pkg.akads.batch). Other files are never modified.
+
+Example usage:
+    from pkg.benchmark.fake_aider import install_fake_aider
+
+    bin_dir = install_fake_aider("/tmp/fake-bin")
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+
+Command-line usage:
+    python -m pkg.benchmark.fake_aider --read docs/react --message-file prompt.md Button.tsx
+    FAKE_AIDER_DELAY=0.5 python -m pkg.benchmark.fake_aider --read .tmp/git_log_detailed.txt \\
+        --message-file pkg/changelog/prompt.md .tmp/changelog.md
+"""
+
+import os
+import re
+import shlex
+import stat
+import sys
+import time
+from typing import List, Tuple
+
+# Seconds each call waits, standing in for the model
+DELAY_ENV = "FAKE_AIDER_DELAY"
+
+# aider options followed by a value
+VALUE_OPTIONS = ("--read", "--message-file", "--model", "--file")
+
+# Documentation directory line of a batched akads message
+DOC_DIRECTORY = re.compile(r"^Documentation directory: (.+)$", re.MULTILINE)
+
+def parse_args(args: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split aider arguments into input files and session files.
+
+    Args:
+        args (List[str]): Arguments after the program name
+
+    Returns:
+        Tuple[List[str], List[str]]: --read/--message-file paths and
+            positional (session) paths; other options are ignored
+    """
+    inputs, session = [], []
+    position = 0
+    while position < len(args):
+        arg = args[position]
+        if arg in VALUE_OPTIONS and position + 1 < len(args):
+            if arg in ("--read", "--message-file"):
+                inputs.append(args[position + 1])
+            position += 2
+            continue
+        if not arg.startswith("-"):
+            session.append(arg)
+        position += 1
+    return inputs, session
+
+def get_doc_directories(paths: List[str]) -> List[str]:
+    """
+    Get the documentation directories listed by batch message files.
+
+    Args:
+        paths (List[str]): --read/--message-file paths
+
+    Returns:
+        List[str]: Documentation directories, in message order
+    """
+    directories = []
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            directories.extend(DOC_DIRECTORY.findall(f.read()))
+    return directories
+
+def read_size(path: str) -> int:
+    """
+    Read a file, or every file below a directory, and return the bytes read.
+    """
+    if os.path.isdir(path):
+        return sum(read_size(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    try:
+        with open(path, "rb") as f:
+            return len(f.read())
+    except OSError:
+        return 0
+
+def main():
+    """
+    Main function of the fake aider command.
+    Called when running as a module: python -m pkg.benchmark.fake_aider
+    """
+    inputs, session = parse_args(sys.argv[1:])
+    size = sum(read_size(path) for path in inputs + session)
+    time.sleep(float(os.environ.get(DELAY_ENV, "0") or 0))
+
+    outputs = [path for path in session if path.endswith(".md")]
+    outputs += [os.path.join(directory, "README.md") for directory in get_doc_directories(inputs)]
+    for path in outputs:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# Fake aider output\n\nRead {len(inputs) + len(session)} paths ({size:,} bytes).\n")
+    print(f"fake aider: {len(inputs)} inputs, {len(session)} session files, {size:,} bytes")
+
+def install_fake_aider(bin_dir: str) -> str:
+    """
+    Write an executable `aider` script that runs this module.
+
+    Args:
+        bin_dir (str): Directory of the script (created if missing); put it
+            first on PATH to replace aider
+
+    Returns:
+        str: Absolute path of bin_dir
+    """
+    bin_dir = os.path.abspath(bin_dir)
+    os.makedirs(bin_dir, exist_ok=True)
+    script = os.path.join(bin_dir, "aider")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write("#!/bin/sh\n")
+        f.write(f"exec {shlex.quote(sys.executable)} {shlex.quote(os.path.abspath(__file__))} \"$@\"\n")
+    os.chmod(script, os.stat(script).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return bin_dir
+
+if __name__ == "__main__":
+    main()
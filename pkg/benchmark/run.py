@@ -0,0 +1,357 @@
+"""
+Core implementation of the benchmark suite.
+
+Every stage of the documentation and changelog entry points is timed in a
+synthetic repository (see synthetic.py), built fresh for each run from a
+RepoSpec, so the numbers only depend on the code and the machine:
+
+    tree_project.sh, scan_tree               project tree
+    tree_git_changes.sh, get_git_changes     last commit changes
+    tree_generate_all.sh, pipeline           all trees (shell vs one process)
+    git_logs.sh, write_git_logs              the four changelog logs
+    akads.plan                               akads directory plans
+    changelog.get_paths                      changelog log selection
+    akads.execute, changelog.run             aider jobs, with a fake aider
+
+The codex root is linked into the repository as .codex, as in a real
+project. aider is replaced by pkg.benchmark.fake_aider, so no network or
+model is needed. Each stage is run `repeat` times and its best time kept.
+
+Results can be saved as a baseline (.benchmarks/<profile>.json) and later
+runs compared with it: a stage slower than its baseline by more than the
+threshold (and by at least MIN_REGRESSION seconds) is a regression.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.get_git_changes import build_tree, get_git_changes, get_release_range
+from utils.get_run_context import RunContext, get_run_context
+from utils.run_jobs import DEFAULT_JOBS
+from utils.scan_tree import scan_tree
+from pkg.akads.generators import get_generators
+from pkg.akads.run import execute_plans, process_structure
+from pkg.changelog.generate import LOG_FILES, write_git_logs
+from pkg.changelog.map_reduce import MODEL_COMMAND
+from pkg.changelog.run import generate_logs, get_paths, run as run_changelog
+from pkg.pipeline.run import run_pipeline, select_sections
+from .fake_aider import DELAY_ENV, install_fake_aider
+from .synthetic import PROFILES, RepoSpec, build_repo
+
+# Directory containing bin/, pkg/ and utils/, linked as .codex in the repository
+CODEX_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_DIR = ".benchmarks"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2
+
+# Slowdowns below this many seconds are noise, whatever the ratio
+MIN_REGRESSION = 0.05
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One timed step.
+
+    Attributes:
+        name (str): Stage name
+        function (Callable[[Any], Any]): Timed function, called with the
+            setup result
+        setup (Optional[Callable[[], Any]]): Untimed preparation, run once
+        tools (Tuple[str, ...]): Commands the stage needs (skipped if missing)
+    """
+    name: str
+    function: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    tools: Tuple[str, ...] = ()
+
+def _script(context: RunContext, name: str, *args: str) -> None:
+    """Run a bin/ script, failing on a non-zero exit code."""
+    subprocess.run([f"{context.bin_path}/{name}", *args], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def _git_changes(_: Any) -> None:
+    """Compute the last commit and release change trees, as tree_generate_all.sh does."""
+    changed, removed = get_git_changes()
+    build_tree(changed, require_existing=True)
+    release_range = get_release_range()
+    if release_range is not None:
+        release_changed, release_removed = get_git_changes(release_range)
+        build_tree(release_changed + release_removed)
+
+def _plan_setup() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Scan the project and return the akads structure and generators."""
+    generators = get_generators()
+    return select_sections(scan_tree("./"), generators), generators
+
+def get_stages(context: RunContext, fake_aider: str, jobs: int = DEFAULT_JOBS) -> List[Stage]:
+    """
+    Get the benchmark stages, in running order.
+
+    Args:
+        context (RunContext): Run context of the synthetic repository
+        fake_aider (str): Path of the fake aider command
+        jobs (int): Concurrent aider jobs of akads.execute
+
+    Returns:
+        List[Stage]: Stages
+    """
+    model_command = [fake_aider, *MODEL_COMMAND[1:]]
+
+    def execute_setup() -> Any:
+        json_data, generators = _plan_setup()
+        return process_structure(json_data, context.mode, context, generators)
+
+    def execute(plans: List[Dict[str, Any]]) -> None:
+        if not execute_plans(plans, context, jobs, timeout=None, retries=0, force=True):
+            raise RuntimeError("aider jobs failed")
+
+    return [
+        Stage("tree_project.sh", lambda _: _script(context, "tree_project.sh", "./", context.tmp("tree_project.json")),
+              tools=("bash", "jq")),
+        Stage("scan_tree", lambda _: scan_tree("./")),
+        Stage("tree_git_changes.sh", lambda _: _script(context, "tree_git_changes.sh"), tools=("bash", "jq")),
+        Stage("get_git_changes", _git_changes),
+        Stage("tree_generate_all.sh", lambda _: _script(context, "tree_generate_all.sh"), tools=("bash",)),
+        Stage("pipeline", lambda _: run_pipeline("./", context.mode, context=context)),
+        Stage("git_logs.sh", lambda _: [_script(context, name.replace(".txt", ".sh")) for name, _ in LOG_FILES],
+              tools=("bash",)),
+        Stage("write_git_logs", lambda _: write_git_logs(tempfile.mkdtemp(dir=context.tmp()))),
+        Stage("akads.plan", lambda setup: process_structure(setup[0], context.mode, context, setup[1]),
+              setup=_plan_setup),
+        Stage("changelog.get_paths", lambda _: get_paths(context),
+              setup=lambda: generate_logs(context, use_cache=False)),
+        Stage("akads.execute", execute, setup=execute_setup),
+        Stage("changelog.run", lambda _: run_changelog(use_cache=False, model_command=model_command)),
+    ]
+
+class _Silenced:
+    """
+    Redirect stdout and stderr, including subprocesses, to /dev/null.
+    """
+
+    def __enter__(self):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.saved = [os.dup(1), os.dup(2)]
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        os.close(devnull)
+        return self
+
+    def __exit__(self, *_):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, saved in zip((1, 2), self.saved):
+            os.dup2(saved, fd)
+            os.close(saved)
+
+def prepare_repo(path: str) -> str:
+    """
+    Link the codex root into a synthetic repository and install the fake aider.
+
+    Args:
+        path (str): Synthetic repository
+
+    Returns:
+        str: Path of the fake aider command
+    """
+    os.symlink(CODEX_ROOT, os.path.join(path, ".codex"))
+    with open(os.path.join(path, ".git", "info", "exclude"), "a", encoding="utf-8") as f:
+        f.write(".codex\n.tmp/\n.cache/\n")
+    bin_dir = install_fake_aider(os.path.join(path, ".git", "benchmark-bin"))
+    return os.path.join(bin_dir, "aider")
+
+def time_stages(path: str, names: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+                jobs: int = DEFAULT_JOBS, aider_delay: float = 0.0) -> Tuple[Dict[str, float], List[str]]:
+    """
+    Time the stages in a prepared synthetic repository.
+
+    Args:
+        path (str): Synthetic repository (see prepare_repo)
+        names (Optional[List[str]]): Stages to run (default: all)
+        repeat (int): Runs per stage; the best time is kept
+        jobs (int): Concurrent aider jobs of akads.execute
+        aider_delay (float): Seconds each fake aider call waits
+
+    Returns:
+        Tuple[Dict[str, float], List[str]]: Best seconds by stage, and the
+            names of the stages that failed
+    """
+    results: Dict[str, float] = {}
+    failed: List[str] = []
+    previous_dir = os.getcwd()
+    previous_env = {name: os.environ.get(name) for name in ("PATH", DELAY_ENV, "CHANGELOG_CACHE_DIR")}
+    os.chdir(path)
+    try:
+        fake_aider = os.path.join(os.path.abspath(".git"), "benchmark-bin", "aider")
+        os.environ["PATH"] = os.path.dirname(fake_aider) + os.pathsep + os.environ.get("PATH", "")
+        os.environ[DELAY_ENV] = str(aider_delay)
+        os.environ["CHANGELOG_CACHE_DIR"] = os.path.abspath(".cache/changelog")
+        context = get_run_context()
+        os.makedirs(context.tmp(), exist_ok=True)
+
+        all_stages = get_stages(context, fake_aider, jobs)
+        unknown = sorted(set(names or []) - {stage.name for stage in all_stages})
+        if unknown:
+            print(f"❌ Unknown stages: {', '.join(unknown)}")
+            print(f"💡 Available stages: {', '.join(stage.name for stage in all_stages)}")
+            failed.extend(unknown)
+
+        for stage in all_stages:
+            if names and stage.name not in names:
+                continue
+            missing = [tool for tool in stage.tools if shutil.which(tool) is None]
+            if missing:
+                print(f"⏭️  Skipping {stage.name} ({', '.join(missing)} not installed)")
+                continue
+
+            print(f"⏱️  {stage.name}...", end=" ", flush=True)
+            times = []
+            try:
+                with _Silenced():
+                    data = stage.setup() if stage.setup else None
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        stage.function(data)
+                        times.append(time.perf_counter() - started)
+            except (Exception, SystemExit) as e:
+                print(f"❌ failed: {e}")
+                failed.append(stage.name)
+                continue
+            results[stage.name] = min(times)
+            print(f"{results[stage.name]:.3f}s")
+    finally:
+        os.chdir(previous_dir)
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return results, failed
+
+def get_baseline_path(profile: str) -> str:
+    """
+    Get the default baseline file of a profile.
+
+    Args:
+        profile (str): Profile name
+
+    Returns:
+        str: .benchmarks/<profile>.json
+    """
+    return os.path.join(BASELINE_DIR, f"{profile}.json")
+
+def save_baseline(path: str, spec: RepoSpec, results: Dict[str, float]) -> None:
+    """
+    Write the results and the repository shape to a baseline file.
+
+    Args:
+        path (str): Baseline file
+        spec (RepoSpec): Repository shape
+        results (Dict[str, float]): Best seconds by stage
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"spec": asdict(spec), "stages": results}, f, indent=2)
+        f.write("\n")
+
+def compare_results(results: Dict[str, float], baseline: Dict[str, float],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Print the results next to a baseline and find the regressions.
+
+    Args:
+        results (Dict[str, float]): Best seconds by stage
+        baseline (Dict[str, float]): Baseline seconds by stage
+        threshold (float): Allowed slowdown ratio (0.2: 20% slower)
+
+    Returns:
+        List[str]: Names of the regressed stages
+    """
+    regressions = []
+    width = max(len(name) for name in results)
+    print()
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"🆕 {name:<{width}}  {seconds:8.3f}s  (no baseline)")
+            continue
+        previous = baseline[name]
+        change = (seconds - previous) / previous if previous > 0 else 0.0
+        regressed = seconds > previous * (1 + threshold) and seconds - previous >= MIN_REGRESSION
+        if regressed:
+            regressions.append(name)
+        icon = "❌" if regressed else "✅"
+        print(f"{icon} {name:<{width}}  {seconds:8.3f}s  (baseline {previous:.3f}s, {change:+.0%})")
+    return regressions
+
+def run(profile: str = "small", spec: Optional[RepoSpec] = None, stages: Optional[List[str]] = None,
+        repeat: int = DEFAULT_REPEAT, threshold: float = DEFAULT_THRESHOLD,
+        baseline_path: Optional[str] = None, update_baseline: bool = False,
+        repo_path: Optional[str] = None, jobs: int = DEFAULT_JOBS, aider_delay: float = 0.0) -> bool:
+    """
+    Build a synthetic repository, time every stage and compare with the baseline.
+
+    Args:
+        profile (str): Profile of the repository shape and baseline name
+        spec (Optional[RepoSpec]): Repository shape (default: the profile's)
+        stages (Optional[List[str]]): Stages to run (default: all)
+        repeat (int): Runs per stage; the best time is kept
+        threshold (float): Allowed slowdown ratio against the baseline
+        baseline_path (Optional[str]): Baseline file (default:
+            .benchmarks/<profile>.json)
+        update_baseline (bool): Save the results as the new baseline
+        repo_path (Optional[str]): Where to build the repository, kept
+            afterwards (default: a temporary directory)
+        jobs (int): Concurrent aider jobs of akads.execute
+        aider_delay (float): Seconds each fake aider call waits
+
+    Returns:
+        bool: True if every stage ran and none regressed
+    """
+    spec = spec or PROFILES[profile]
+    baseline_path = baseline_path or get_baseline_path(profile)
+    print(f"\n🚀 Starting benchmark ({profile})...\n")
+    print(f"📦 {spec}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(repo_path or os.path.join(tmp, "repo"))
+        started = time.perf_counter()
+        head = build_repo(path, spec)
+        prepare_repo(path)
+        print(f"🏗️  Synthetic repository built in {time.perf_counter() - started:.3f}s: {path} (HEAD {head[:12]})\n")
+        results, failed = time_stages(path, stages, repeat, jobs, aider_delay)
+
+    if not results:
+        print("\n❌ No stage ran")
+        return False
+
+    regressions: List[str] = []
+    if update_baseline:
+        save_baseline(baseline_path, spec, results)
+        print(f"\n💾 Baseline saved to {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("spec") != asdict(spec):
+            print(f"\n⚠️  {baseline_path} was recorded with another repository shape, not comparing")
+        else:
+            regressions = compare_results(results, baseline.get("stages", {}), threshold)
+    else:
+        print(f"\n💡 No baseline in {baseline_path}; save one with --save-baseline")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} stages slower than the baseline by more than {threshold:.0%}: "
+              f"{', '.join(regressions)}")
+    if failed:
+        print(f"\n❌ Failed stages: {', '.join(failed)}")
+    if not regressions and not failed:
+        print("\n✨ Benchmark complete!\n")
+    return not regressions and not failed
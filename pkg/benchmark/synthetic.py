@@ -0,0 +1,321 @@
+"""
+Reproducible synthetic monorepos for the benchmarks.
+
+A RepoSpec describes the tree (directory count, files per directory,
+React/Sass layout) and the history (commits, merge commits, tags). The
+repository is written with a single `git fast-import` stream, with fixed
+authors and dates, so the same spec always gives the same files and the
+same commit SHAs, on any machine and without network access.
+
+Layout:
+    react/src/<area>/<Name>/      Name.tsx, Name.config.ts, Name.stories.tsx, helpers (.ts)
+    sass/src/<area>/<part>/       _variables.scss, style files (.scss)
+    package.json, README.md, yarn.lock
+
+History: an initial commit with the whole tree, then commits changing a
+few files each (with some added and removed files). Merge commits join a
+topic branch of two commits after one commit on main. Tags are spread
+evenly, the last one on the last commit.
+
+Example usage:
+    from pkg.benchmark.synthetic import PROFILES, build_repo
+
+    build_repo("/tmp/bench-repo", PROFILES["small"])
+
+Command-line usage:
+    python -m pkg.benchmark.synthetic /tmp/bench-repo --profile medium
+    python -m pkg.benchmark.synthetic /tmp/bench-repo --directories 500 --commits 1000 --merges 50
+"""
+
+import argparse
+import os
+import posixpath
+import random
+import shutil
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+LAYOUTS = ("mixed", "react", "sass")
+
+AUTHORS = [
+    ("Ana Souza", "ana@example.com"),
+    ("Bruno Lima", "bruno@example.com"),
+    ("Carla Dias", "carla@example.com"),
+    ("Diego Alves", "diego@example.com"),
+]
+
+# Commit timestamps start here and advance one hour per commit
+START_TIMESTAMP = 1_700_000_000
+
+@dataclass(frozen=True)
+class RepoSpec:
+    """
+    Shape of a synthetic repository.
+
+    Attributes:
+        directories (int): Component (React) or partial (Sass) directories
+        files_per_directory (int): Files in each directory (at least 3)
+        layout (str): "mixed" (3 React directories for each Sass one),
+            "react" or "sass"
+        commits (int): Regular commits after the initial one
+        merges (int): Merge commits (each adds three regular commits)
+        tags (int): Release tags (v1.0.0, v2.0.0...), the last on HEAD
+        files_per_commit (int): Files changed by each regular commit
+        seed (int): Seed of the file and change choices
+    """
+    directories: int = 100
+    files_per_directory: int = 5
+    layout: str = "mixed"
+    commits: int = 200
+    merges: int = 20
+    tags: int = 3
+    files_per_commit: int = 3
+    seed: int = 0
+
+PROFILES: Dict[str, RepoSpec] = {
+    "small": RepoSpec(directories=60, files_per_directory=4, commits=80, merges=8, tags=2),
+    "medium": RepoSpec(directories=600, files_per_directory=6, commits=800, merges=60, tags=4),
+    "large": RepoSpec(directories=4000, files_per_directory=8, commits=4000, merges=300, tags=6),
+}
+
+def _pascal(index: int) -> str:
+    """Component name of a directory index (e.g. "Widget12")."""
+    kinds = ("Button", "Card", "Modal", "Table", "Widget", "Form", "Menu", "Badge")
+    return f"{kinds[index % len(kinds)]}{index}"
+
+def get_layout_paths(spec: RepoSpec) -> List[str]:
+    """
+    Get the file paths of the initial tree.
+
+    Args:
+        spec (RepoSpec): Repository shape
+
+    Returns:
+        List[str]: Repository-relative file paths
+    """
+    if spec.layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {spec.layout} (expected one of {', '.join(LAYOUTS)})")
+
+    count = max(3, spec.files_per_directory)
+    paths = ["package.json", "README.md", "yarn.lock"]
+    for index in range(spec.directories):
+        sass = spec.layout == "sass" or (spec.layout == "mixed" and index % 4 == 3)
+        if sass:
+            directory = f"sass/src/area{index % 7}/part{index}"
+            names = ["_variables.scss"] + [f"style{j}.scss" for j in range(count - 1)]
+        else:
+            name = _pascal(index)
+            directory = f"react/src/area{index % 12}/{name}"
+            names = [f"{name}.tsx", f"{name}.config.ts", f"{name}.stories.tsx"]
+            names += [f"use{name}{j}.ts" for j in range(count - 3)]
+        paths.extend(f"{directory}/{name}" for name in names)
+    return paths
+
+def render_file(path: str, revision: int) -> bytes:
+    """
+    Get the content of a file at a revision (one extra line per change).
+
+    Args:
+        path (str): Repository-relative path
+        revision (int): Number of changes made to the file
+
+    Returns:
+        bytes: File content
+    """
+    name = os.path.basename(path).split(".")[0]
+    if path.endswith(".scss"):
+        lines = [f"// {path}", f".{name} {{", "  display: flex;", "  padding: 8px;", "}"]
+        lines += [f".{name}-v{rev} {{ margin: {rev}px; }}" for rev in range(1, revision + 1)]
+    elif path.endswith((".ts", ".tsx")):
+        lines = [f"// {path}", "import React from 'react';", "",
+                 f"export function {name}(props: Record<string, unknown>) {{",
+                 "  return null;", "}"]
+        lines += [f"export const {name}Revision{rev} = {rev};" for rev in range(1, revision + 1)]
+    else:
+        lines = [f"{path} revision {rev}" for rev in range(revision + 1)]
+    return ("\n".join(lines) + "\n").encode()
+
+class _History:
+    """
+    Writes the fast-import stream of a spec.
+    """
+
+    def __init__(self, spec: RepoSpec):
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+        self.chunks: List[bytes] = []
+        self.mark = 0
+        self.count = 0
+        self.tips: List[int] = []
+
+    def _commit(self, ref: str, parents: List[int], changes: Dict[str, Optional[int]],
+                message: str) -> int:
+        self.mark += 1
+        self.count += 1
+        author, email = AUTHORS[self.count % len(AUTHORS)]
+        timestamp = START_TIMESTAMP + self.count * 3600
+        data = message.encode()
+        out = [f"commit {ref}\nmark :{self.mark}\n",
+               f"author {author} <{email}> {timestamp} +0000\n",
+               f"committer {author} <{email}> {timestamp} +0000\n",
+               f"data {len(data)}\n"]
+        self.chunks.append("".join(out).encode() + data + b"\n")
+        if parents:
+            self.chunks.append(f"from :{parents[0]}\n".encode())
+            for parent in parents[1:]:
+                self.chunks.append(f"merge :{parent}\n".encode())
+        for path, revision in sorted(changes.items()):
+            if revision is None:
+                self.chunks.append(f"D {path}\n".encode())
+            else:
+                content = render_file(path, revision)
+                self.chunks.append(f"M 100644 inline {path}\ndata {len(content)}\n".encode() + content + b"\n")
+        self.chunks.append(b"\n")
+        return self.mark
+
+    def _change(self, state: Dict[str, int], number: int) -> Tuple[Dict[str, Optional[int]], str]:
+        """
+        Pick the changes of one regular commit and apply them to state.
+        """
+        paths = list(state)
+        changes: Dict[str, Optional[int]] = {}
+        for path in self.random.sample(paths, min(self.spec.files_per_commit, len(paths))):
+            state[path] += 1
+            changes[path] = state[path]
+
+        if number % 10 == 0:
+            base = self.random.choice([path for path in paths if "/" in path] or paths)
+            new_path = posixpath.join(posixpath.dirname(base), f"added{number}{posixpath.splitext(base)[1]}")
+            state[new_path] = 0
+            changes[new_path] = 0
+        elif number % 15 == 0 and len(state) > self.spec.files_per_commit + 1:
+            removed = self.random.choice([path for path in paths if path not in changes])
+            del state[removed]
+            changes[removed] = None
+
+        first = next(iter(changes))
+        area = first.split("/")[0] if "/" in first else "root"
+        kind = ("feat", "fix", "refactor", "chore", "perf")[number % 5]
+        name = os.path.basename(first).split(".")[0]
+        message = f"{kind}({area}): update {name} [#{1000 + number}]"
+        if number % 3 == 0:
+            message += f"\n\nChanges {len(changes)} files.\n\nRefs: #{1000 + number}"
+        return changes, message
+
+    def build(self) -> bytes:
+        spec = self.spec
+        state = {path: 0 for path in get_layout_paths(spec)}
+        head = self._commit("refs/heads/main", [], dict(state), "chore: initial import")
+        self.tips.append(head)
+
+        total = spec.commits + 3 * spec.merges
+        merge_every = total // (spec.merges + 1) if spec.merges else 0
+        number = 0
+        merges = 0
+        while number < total:
+            number += 1
+            if merge_every and merges < spec.merges and number % merge_every == 0 and number + 2 <= total:
+                # Topic branch of two commits, one commit on main, then the merge
+                base = dict(state)
+                topic_state = dict(state)
+                topic = head
+                topic_changes: Dict[str, Optional[int]] = {}
+                for _ in range(2):
+                    changes, message = self._change(topic_state, number)
+                    topic = self._commit("refs/heads/topic", [topic], changes, message)
+                    topic_changes.update(changes)
+                    number += 1
+
+                touched = set(topic_changes)
+                main_state = {path: rev for path, rev in base.items() if path not in touched}
+                changes, message = self._change(main_state, number)
+                head = self._commit("refs/heads/main", [head], changes, message)
+                self.tips.append(head)
+
+                merges += 1
+                state = dict(main_state)
+                state.update({path: rev for path, rev in topic_state.items() if path in touched})
+                for path in touched:
+                    if topic_changes[path] is None:
+                        state.pop(path, None)
+                merge_changes = {path: state.get(path) for path in touched}
+                head = self._commit("refs/heads/main", [head, topic], merge_changes,
+                                    f"Merge branch 'topic-{merges}'")
+                self.tips.append(head)
+                continue
+
+            changes, message = self._change(state, number)
+            head = self._commit("refs/heads/main", [head], changes, message)
+            self.tips.append(head)
+
+        # Tags evenly spread over main, the last one on HEAD
+        for tag in range(1, spec.tags + 1):
+            position = len(self.tips) * tag // spec.tags - 1
+            self.chunks.append(f"reset refs/tags/v{tag}.0.0\nfrom :{self.tips[position]}\n\n".encode())
+        self.chunks.append(b"reset refs/heads/topic\n\n")
+        return b"".join(self.chunks)
+
+def build_repo(path: str, spec: RepoSpec, force: bool = True) -> str:
+    """
+    Create a synthetic repository and check out its main branch.
+
+    Args:
+        path (str): Directory to create
+        spec (RepoSpec): Repository shape
+        force (bool): Replace an existing directory
+
+    Returns:
+        str: HEAD commit SHA
+
+    Raises:
+        FileExistsError: If path exists and force is False
+        subprocess.CalledProcessError: If a git command fails
+    """
+    if os.path.exists(path):
+        if not force:
+            raise FileExistsError(path)
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    def git(*args: str, data: Optional[bytes] = None) -> bytes:
+        return subprocess.run(["git", "-C", path, *args], input=data, capture_output=True, check=True).stdout
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.name", AUTHORS[0][0])
+    git("config", "user.email", AUTHORS[0][1])
+    git("fast-import", "--quiet", "--force", data=_History(spec).build())
+    git("reset", "-q", "--hard", "main")
+    return git("rev-parse", "HEAD").decode().strip()
+
+def main():
+    """
+    Main function to create a synthetic repository.
+    Called when running as a module: python -m pkg.benchmark.synthetic
+    """
+    parser = argparse.ArgumentParser(description="Create a reproducible synthetic monorepo")
+    parser.add_argument("path", help="Directory to create (replaced if it exists)")
+    parser.add_argument("--profile", choices=list(PROFILES), default="small",
+                      help="Preset shape (default: small)")
+    for field_name, default in asdict(RepoSpec()).items():
+        if field_name == "layout":
+            parser.add_argument("--layout", choices=LAYOUTS, help="Directory layout")
+        else:
+            parser.add_argument(f"--{field_name.replace('_', '-')}", type=type(default),
+                              help=f"Override the profile's {field_name.replace('_', ' ')}")
+    args = parser.parse_args()
+
+    overrides = {name: value for name, value in vars(args).items()
+                 if name in asdict(RepoSpec()) and value is not None}
+    spec = replace(PROFILES[args.profile], **overrides)
+    try:
+        head = build_repo(args.path, spec)
+    except (ValueError, subprocess.CalledProcessError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print(f"✅ Synthetic repository created in {args.path} (HEAD {head[:12]})")
+    print(f"📦 {spec}")
+
+if __name__ == "__main__":
+    main()
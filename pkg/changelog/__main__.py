@@ -3,15 +3,43 @@ Command-line interface for changelog generation.
 
 For command-line usage:
     python -m pkg.changelog
+    python -m pkg.changelog --map-reduce --jobs 8
+    python -m pkg.changelog --trace .tmp/trace.json
 """
 
 import argparse
+import shlex
+from .map_reduce import DEFAULT_CHUNK_TOKENS, DEFAULT_JOBS, MapReduceConfig, get_model_command
 from .run import run
 
 def main():
     parser = argparse.ArgumentParser(description="Generate changelog documentation")
+    parser.add_argument("--no-cache", action="store_true",
+                      help="Read every commit from git instead of the commit cache")
+    parser.add_argument("--map-reduce", action="store_true",
+                      help="Summarize logs over the token threshold in chunks instead of fitting them to it")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                      help=f"Chunks summarized at once in map-reduce mode (default: {DEFAULT_JOBS})")
+    parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS,
+                      help=f"Token budget of a chunk (default: {DEFAULT_CHUNK_TOKENS:,})")
+    parser.add_argument("--model-command",
+                      help="Model command with {input}, {prompt} and {output} placeholders "
+                           "(default: $CHANGELOG_MODEL_COMMAND or aider)")
+    parser.add_argument("--trace",
+                      help="Write a Chrome trace of the stages to this file and print a summary "
+                           "(default: $CODEX_TRACE)")
     args = parser.parse_args()
-    run()
+
+    model_command = shlex.split(args.model_command) if args.model_command else get_model_command()
+    map_reduce = None
+    if args.map_reduce:
+        map_reduce = MapReduceConfig(
+            jobs=args.jobs,
+            chunk_tokens=args.chunk_tokens,
+            model_command=model_command,
+            use_cache=not args.no_cache
+        )
+    run(use_cache=not args.no_cache, map_reduce=map_reduce, model_command=model_command, trace=args.trace)
 
 if __name__ == "__main__":
     main()
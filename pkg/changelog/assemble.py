@@ -0,0 +1,313 @@
+"""
+Token-budgeted assembly of the detailed changelog logs.
+
+Instead of switching a whole log from detailed to simple once it is too
+large, the assembler keeps the patches of as many commits as fit under the
+token budget. The remaining commits are degraded one by one to their
+--name-status form, the least significant per token first.
+
+A commit's significance comes from the lines it changes (growing slowly,
+so huge commits are degraded first), whether it is a merge, and which
+paths it touches (tests, docs, lock files and generated or vendored files
+count less). The trailing full diff of release logs repeats the commit
+patches and is degraded like a commit of low significance.
+
+The assembled log always fits the budget: when even the name-status forms
+are too large, commits are reduced to their header and file count, and as
+a last resort the log is truncated.
+
+Example usage:
+    from pkg.changelog.assemble import assemble_log_file
+
+    stats = assemble_log_file(".tmp/git_release_detailed.txt",
+                              ".tmp/git_release_budgeted.txt", 185_000)
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SEPARATOR = "-" * 41
+TERMINATOR = "=" * 41
+TRUNCATED = "[... truncated to fit the token budget ...]"
+
+_COMMIT_LINE = re.compile(r"Commit: [0-9a-f]{7,64}$")
+_TRAILER_LINES = (
+    "Merge Commit: ",
+    "Commits introduced by this merge:",
+    "New commits introduced by this merge:",
+    "New Commits Introduced by This Merge:",
+    TERMINATOR,
+    "diff --git ",
+)
+
+# Paths that say little about user-facing changes
+_LOW_SIGNAL_PATHS = re.compile(
+    r"(^|/)(tests?|__tests__|__snapshots__|docs?|vendor|third_party|node_modules|dist|build|fixtures)/"
+    r"|\.(test|spec|stories|snap|lock|min\.js|min\.css|map|md|svg|png|jpe?g|gif|ico)$"
+    r"|(^|/)(package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|Cargo\.lock|go\.sum)$"
+)
+
+@dataclass
+class Section:
+    """
+    A commit (or the trailing full diff) of a detailed log.
+
+    Attributes:
+        forms (List[str]): Detailed, name-status and minimal texts
+        value (float): Significance of keeping the detailed patch
+        merge (bool): Whether the section is a merge commit
+        full_diff (bool): Whether the section is the release full diff
+        level (int): Selected form (0: detailed, 1: name-status, 2: minimal)
+        sizes (List[int]): UTF-8 size of each form
+    """
+    forms: List[str]
+    value: float
+    merge: bool = False
+    full_diff: bool = False
+    level: int = 0
+    sizes: List[int] = field(default_factory=list, init=False)
+
+    def __post_init__(self):
+        self.sizes = [len(form.encode("utf-8", "surrogateescape")) for form in self.forms]
+
+def _name_status(patch: List[str]) -> Tuple[List[str], int]:
+    """
+    Derive --name-status lines and the changed line count from a patch.
+    """
+    entries: List[str] = []
+    changed = 0
+    current: Optional[Dict[str, str]] = None
+
+    def flush():
+        if current is not None:
+            entries.append(_format_entry(current))
+
+    for line in patch:
+        if line.startswith(("diff --git ", "diff --cc ", "diff --combined ")):
+            flush()
+            current = {"header": line, "status": "M"}
+        elif current is None:
+            continue
+        elif line.startswith("new file mode"):
+            current["status"] = "A"
+        elif line.startswith("deleted file mode"):
+            current["status"] = "D"
+        elif line.startswith("similarity index "):
+            current["similarity"] = line[len("similarity index "):].rstrip("%")
+        elif line.startswith(("rename from ", "copy from ")):
+            current["status"] = "R" if line.startswith("rename") else "C"
+            current["from"] = line.split(" from ", 1)[1]
+        elif line.startswith(("rename to ", "copy to ")):
+            current["to"] = line.split(" to ", 1)[1]
+        elif line.startswith("--- a/"):
+            current.setdefault("from", line[6:].rstrip("\t"))
+        elif line.startswith("+++ b/"):
+            current["to"] = line[6:].rstrip("\t")
+        elif line.startswith(("+", "-")) and not line.startswith(("+++ ", "--- ")):
+            changed += 1
+    flush()
+    return entries, changed
+
+def _format_entry(entry: Dict[str, str]) -> str:
+    """
+    Format one --name-status line from the parsed headers of a file patch.
+    """
+    header = entry["header"]
+    if header.startswith("diff --git "):
+        paths = header[len("diff --git "):]
+        half = (len(paths) - 3) // 2
+        fallback = paths[2:half + 2] if paths[half:half + 3] == " b/" else paths[2:]
+    else:
+        fallback = header.split(" ", 2)[2]
+
+    status = entry["status"]
+    if status in ("R", "C"):
+        return f"{status}{entry.get('similarity', '')}\t{entry.get('from', fallback)}\t{entry.get('to', fallback)}"
+    if status == "D":
+        return f"D\t{entry.get('from', fallback)}"
+    return f"{status}\t{entry.get('to', entry.get('from', fallback))}"
+
+def _significance(paths: List[str], changed: int, merge: bool) -> float:
+    """
+    Score how much keeping a patch is worth.
+    """
+    if not paths:
+        return 0.0
+    source_share = sum(1 for path in paths if not _LOW_SIGNAL_PATHS.search(path)) / len(paths)
+    value = math.log2(2 + changed) * (0.25 + 0.75 * source_share)
+    return value * (0.5 if merge else 1.0)
+
+def _build_section(lines: List[str], merge: bool, full_diff: bool = False) -> Section:
+    """
+    Build the detailed, name-status and minimal forms of a section.
+
+    Lines of a commit section run from its "Commit:" line to its separator;
+    lines of the full diff section are the diff itself.
+    """
+    detailed = "".join(f"{line}\n" for line in lines)
+    patch_start = next(
+        (index for index, line in enumerate(lines)
+         if line.startswith(("diff --git ", "diff --cc ", "diff --combined "))),
+        None
+    )
+    if patch_start is None:
+        return Section([detailed, detailed, detailed], 0.0, merge, full_diff)
+
+    header = lines[:patch_start]
+    entries, changed = _name_status(lines[patch_start:])
+    paths = [entry.rsplit("\t", 1)[1] for entry in entries]
+    summary = f"{len(entries)} files changed, {changed} lines changed"
+
+    if full_diff:
+        name_status = f"Full diff omitted ({summary}):\n" + "".join(f"{entry}\n" for entry in entries)
+        minimal = f"Full diff omitted ({summary})\n"
+        value = _significance(paths, changed, merge) * 0.25
+        return Section([detailed, name_status, minimal], value, merge, full_diff)
+
+    # Keep the header without the trailing blank line git leaves before the patch
+    while header and not header[-1]:
+        header.pop()
+    head = "".join(f"{line}\n" for line in header)
+    name_status = head + "\n" + "".join(f"{entry}\n" for entry in entries) + f"\n{SEPARATOR}\n"
+    subject = header[:header.index("")] if "" in header else header
+    minimal = "".join(f"{line}\n" for line in subject) + f"({summary})\n\n{SEPARATOR}\n"
+    return Section([detailed, name_status, minimal], _significance(paths, changed, merge), merge)
+
+def parse_log(text: str) -> List[object]:
+    """
+    Split a detailed log into fixed text and commit sections.
+
+    Args:
+        text (str): Content of a git_log_detailed.txt / git_release_detailed.txt
+
+    Returns:
+        List[object]: Fixed strings and Section objects, in log order
+    """
+    lines = text.split("\n")
+    trailing_newline = lines and lines[-1] == ""
+    if trailing_newline:
+        lines.pop()
+
+    starts = [
+        index for index, line in enumerate(lines)
+        if _COMMIT_LINE.match(line) and index > 0 and lines[index - 1] == ""
+    ]
+    parts: List[object] = []
+    position = 0
+    for number, start in enumerate(starts):
+        limit = starts[number + 1] - 1 if number + 1 < len(starts) else len(lines)
+        end = next(
+            (index for index in range(start + 1, limit)
+             if lines[index] == SEPARATOR and (
+                 index + 1 >= limit or lines[index + 1] == ""
+                 or lines[index + 1].startswith(_TRAILER_LINES))),
+            None
+        )
+        if end is None:
+            continue
+
+        merge = start >= 2 and lines[start - 2].startswith("Merge Commit: ")
+        parts.append("".join(f"{line}\n" for line in lines[position:start]))
+        parts.append(_build_section(lines[start:end + 1], merge))
+        position = end + 1
+
+    # The full diff of release logs follows the last commit
+    tail = lines[position:]
+    diff_start = next((index for index, line in enumerate(tail) if line.startswith("diff --git ")), None)
+    if diff_start is not None:
+        diff_end = len(tail)
+        while diff_end > diff_start and tail[diff_end - 1] == TERMINATOR:
+            diff_end -= 1
+        parts.append("".join(f"{line}\n" for line in tail[:diff_start]))
+        parts.append(_build_section(tail[diff_start:diff_end], False, full_diff=True))
+        tail = tail[diff_end:]
+    parts.append("".join(f"{line}\n" for line in tail))
+
+    if not trailing_newline and isinstance(parts[-1], str) and parts[-1].endswith("\n"):
+        parts[-1] = parts[-1][:-1]
+    return parts
+
+def _select(sections: List[Section], budget: int) -> None:
+    """
+    Choose the form of every section so the total size fits the budget.
+
+    Upgrades are taken greedily by value per byte: first from minimal to
+    name-status (if not all name-status forms fit), then from name-status
+    to the detailed patch.
+    """
+    for section in sections:
+        section.level = 2
+    used = sum(section.sizes[2] for section in sections)
+
+    for target in (1, 0):
+        candidates = sorted(
+            (section for section in sections if section.level == target + 1),
+            key=lambda section: -section.value / max(1, section.sizes[target] - section.sizes[target + 1])
+        )
+        for section in candidates:
+            cost = section.sizes[target] - section.sizes[target + 1]
+            if used + cost <= budget:
+                section.level = target
+                used += cost
+        if any(section.level > target for section in sections):
+            break
+
+def assemble_log(text: str, token_budget: int) -> Tuple[str, Dict[str, int]]:
+    """
+    Assemble a detailed log that fits a token budget.
+
+    Args:
+        text (str): Content of a detailed log
+        token_budget (int): Maximum tokens (UTF-8 bytes / 4) of the result
+
+    Returns:
+        Tuple[str, Dict[str, int]]: Assembled log and statistics (commits,
+            detailed, name_status, minimal, tokens)
+    """
+    budget = token_budget * 4 + 3
+    parts = parse_log(text)
+    sections = [part for part in parts if isinstance(part, Section)]
+    fixed = sum(len(part.encode("utf-8", "surrogateescape")) for part in parts if isinstance(part, str))
+    _select(sections, budget - fixed)
+
+    result = "".join(part if isinstance(part, str) else part.forms[part.level] for part in parts)
+    data = result.encode("utf-8", "surrogateescape")
+    if len(data) > budget:
+        marker = f"\n{TRUNCATED}\n{TERMINATOR}\n".encode()
+        if budget >= len(marker):
+            data = data[:budget - len(marker)] + marker
+        else:
+            data = data[:budget]
+        result = data.decode("utf-8", "ignore")
+        data = result.encode("utf-8", "surrogateescape")
+
+    commits = [section for section in sections if not section.full_diff]
+    stats = {
+        "commits": len(commits),
+        "detailed": sum(1 for section in commits if section.level == 0),
+        "name_status": sum(1 for section in commits if section.level == 1),
+        "minimal": sum(1 for section in commits if section.level == 2),
+        "tokens": len(data) // 4,
+    }
+    return result, stats
+
+def assemble_log_file(input_path: str, output_path: str, token_budget: int) -> Dict[str, int]:
+    """
+    Assemble a detailed log file into a file that fits a token budget.
+
+    Args:
+        input_path (str): Detailed log path
+        output_path (str): Assembled log path
+        token_budget (int): Maximum tokens of the assembled log
+
+    Returns:
+        Dict[str, int]: Statistics from assemble_log
+    """
+    with open(input_path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        text = f.read()
+    result, stats = assemble_log(text, token_budget)
+    with open(output_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+        f.write(result)
+    return stats
@@ -0,0 +1,209 @@
+"""
+Persistent per-commit cache of changelog intermediate results.
+
+Commits are immutable, so what is derived from a commit (its rendered log
+section, a model-produced summary) only depends on the commit SHA and on
+how it was produced: the log formats and pathspec, or the prompt. Entries
+are keyed by commit SHA inside a namespace named after the hash of those
+inputs, so changing a prompt or format starts a fresh namespace.
+
+The cache is a plain directory (default .cache/changelog, or
+$CHANGELOG_CACHE_DIR) that CI can persist between jobs:
+
+    .cache/changelog/<namespace>/<sha[:2]>/<sha>.z
+
+Entries are zlib-compressed and written atomically. Reads refresh the
+entry's mtime, and prune() evicts the least recently used entries once the
+cache is larger than its size limit.
+
+Example usage:
+    from pkg.changelog.cache import CommitCache, get_cache_dir, get_namespace
+
+    cache = CommitCache(get_cache_dir(), get_namespace(open(prompt_path, "rb").read()))
+    summary = cache.get(commit)
+    if summary is None:
+        cache.put(commit, summarize(commit))
+    cache.prune()
+
+Command-line usage:
+    python -m pkg.changelog.cache stats
+    python -m pkg.changelog.cache prune --max-mb 128
+    python -m pkg.changelog.cache clear
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import zlib
+from typing import List, Optional, Tuple, Union
+
+DEFAULT_CACHE_DIR = ".cache/changelog"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def get_cache_dir() -> str:
+    """
+    Get the cache directory ($CHANGELOG_CACHE_DIR or .cache/changelog).
+
+    Returns:
+        str: Cache directory
+    """
+    return os.environ.get("CHANGELOG_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+def get_namespace(*parts: Union[str, bytes]) -> str:
+    """
+    Hash the inputs that results depend on (formats, prompt...) into a namespace.
+
+    Args:
+        *parts (Union[str, bytes]): Inputs, e.g. a prompt file's content
+
+    Returns:
+        str: Namespace name
+    """
+    digest = hashlib.blake2b(digest_size=10)
+    for part in parts:
+        data = part.encode() if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def _list_entries(root: str) -> List[Tuple[float, int, str]]:
+    """
+    List the (mtime, size, path) of every cache entry.
+    """
+    entries = []
+    for dir_path, _, file_names in os.walk(root):
+        for name in file_names:
+            if not name.endswith(".z"):
+                continue
+            path = os.path.join(dir_path, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+class CommitCache:
+    """
+    Cache of per-commit results in one namespace.
+
+    Attributes:
+        root (str): Cache directory (shared by all namespaces)
+        namespace (str): Namespace of the entries
+        max_bytes (int): Size limit enforced by prune()
+        hits (int): Entries found since creation
+        misses (int): Entries not found since creation
+        writes (int): Entries written since creation
+    """
+
+    def __init__(self, root: str, namespace: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _path(self, commit: str) -> str:
+        return os.path.join(self.root, self.namespace, commit[:2], f"{commit}.z")
+
+    def contains(self, commit: str) -> bool:
+        """Whether the cache has an entry for a commit."""
+        return os.path.exists(self._path(commit))
+
+    def get(self, commit: str) -> Optional[bytes]:
+        """
+        Get the cached result of a commit.
+
+        Args:
+            commit (str): Full commit SHA
+
+        Returns:
+            Optional[bytes]: Cached result, or None if missing or unreadable
+        """
+        path = self._path(commit)
+        try:
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+            os.utime(path)
+        except (OSError, zlib.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, commit: str, data: bytes) -> None:
+        """
+        Cache the result of a commit. Failures to write are ignored.
+
+        Args:
+            commit (str): Full commit SHA
+            data (bytes): Result
+        """
+        path = self._path(commit)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        self.writes += 1
+
+    def prune(self) -> Tuple[int, int]:
+        """
+        Evict the least recently used entries of all namespaces until the
+        cache fits max_bytes.
+
+        Returns:
+            Tuple[int, int]: Evicted entries and freed bytes
+        """
+        entries = _list_entries(self.root)
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            evicted += 1
+            freed += size
+        return evicted, freed
+
+def main():
+    """
+    Main function to inspect, prune or clear the cache.
+    Called when running as a module: python -m pkg.changelog.cache
+    """
+    parser = argparse.ArgumentParser(description="Manage the changelog commit cache")
+    parser.add_argument("command", choices=["stats", "prune", "clear"])
+    parser.add_argument("--cache-dir", default=get_cache_dir(),
+                      help=f"Cache directory (default: $CHANGELOG_CACHE_DIR or {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                      help="Size limit for prune, in MiB")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+        print(f"🗑️  Cleared {args.cache_dir}")
+    elif args.command == "prune":
+        cache = CommitCache(args.cache_dir, "", int(args.max_mb * 1024 * 1024))
+        evicted, freed = cache.prune()
+        print(f"🗑️  Evicted {evicted:,} entries ({freed:,} bytes)")
+    else:
+        entries = _list_entries(args.cache_dir)
+        if not entries:
+            print(f"❌ Error: No cache entries in {args.cache_dir}")
+            sys.exit(1)
+        namespaces = {os.path.relpath(path, args.cache_dir).split(os.sep)[0] for _, _, path in entries}
+        print(f"📊 {args.cache_dir}: {len(entries):,} entries in {len(namespaces)} namespace(s), "
+              f"{sum(size for _, size, _ in entries):,} bytes")
+
+if __name__ == "__main__":
+    main()
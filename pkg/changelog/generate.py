@@ -0,0 +1,589 @@
+"""
+Single-pass generator of the changelog git logs.
+
+This module writes the same files as bin/git_log_detailed.sh,
+bin/git_log_simple.sh, bin/git_release_detailed.sh and
+bin/git_release_simple.sh, byte for byte, without one git process per
+commit. The commits of all four logs are read from one
+`git log --no-walk --stdin --patch-with-raw` stream, parsed incrementally
+and written to the files as they arrive: the patch feeds the detailed logs
+and the raw diff gives the --name-status lines of the simple logs.
+
+Only the commit lists (one rev-list per range and per merge commit), the
+release header and the release diff take a git call of their own.
+
+Example usage:
+    from pkg.changelog.generate import write_git_logs
+
+    released = write_git_logs(".tmp")  # False when there are no tags
+
+    # Detailed logs in the compressed log store (see store.py)
+    store = LogStore.create(".tmp/git_logs")
+    write_git_logs(".tmp", store)
+    store.save()
+
+Command-line usage:
+    # Write the logs to .tmp/
+    python -m pkg.changelog.generate
+
+    # Time bin/git_*.sh against the generator and compare their output
+    python -m pkg.changelog.generate --benchmark
+"""
+
+import argparse
+import filecmp
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from itertools import zip_longest
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from utils.get_run_context import RunContext, get_run_context
+from .assemble import SEPARATOR, TERMINATOR
+from .cache import CommitCache, get_namespace
+from .store import LogStore
+
+# Files excluded from the logs (same EXCLUDE_PATHSPEC as the bin/git_*.sh scripts)
+EXCLUDE_PATHSPEC = [
+    ":(exclude)yarn.lock",
+    ":(exclude)package-lock.json",
+    ":(exclude)pnpm-lock.yaml",
+    ":(exclude)*.pyc",
+    ":(exclude)__pycache__/**",
+    ":(exclude).env",
+    ":(exclude)dist/**",
+    ":(exclude)build/**",
+    ":(exclude)*.log",
+    ":(exclude).DS_Store",
+    ":(exclude)coverage/**",
+    ":(exclude).nyc_output/**",
+    ":(exclude)*.min.js",
+    ":(exclude)*.min.css",
+    ":(exclude)_old/**",
+]
+
+# Output files and the git show format of their commits, in variant order
+LOG_FILES = (
+    ("git_log_detailed.txt", "Author: %an%nDate: %ad%nMessage: %s%n%nBody:%n%b"),
+    ("git_log_simple.txt", "%an - %ad%n%s%n%b"),
+    ("git_release_detailed.txt", "Author: %an <%ae>%nDate: %ad%nMessage: %s%n%nBody:%n%b"),
+    ("git_release_simple.txt", "%an <%ae> - %ad%n%s%n%b"),
+)
+LOG_DETAILED, LOG_SIMPLE, RELEASE_DETAILED, RELEASE_SIMPLE = range(len(LOG_FILES))
+DETAILED_VARIANTS = (LOG_DETAILED, RELEASE_DETAILED)
+
+# Start of every commit record in the git log stream
+RECORD_MARKER = b"\x00\x01"
+
+CHUNK_SIZE = 1 << 20
+
+# A log is a list of fixed bytes and (commit, variant) references to git show output
+Part = Union[bytes, Tuple[str, int]]
+
+# Headers of every variant, patch and name-status lines of a commit
+Record = Tuple[List[bytes], bytes, bytes]
+
+EMPTY_RECORD: Record = ([b""] * len(LOG_FILES), b"", b"")
+
+# git log arguments that records depend on
+LOG_ARGS = ["--patch-with-raw", "--cc", "--", ".", *EXCLUDE_PATHSPEC]
+
+# Cache namespace of the records (see cache.py)
+RECORD_NAMESPACE = get_namespace("records", *(log_format for _, log_format in LOG_FILES), *LOG_ARGS)
+
+def _git(*args: str) -> str:
+    """
+    Run a git command and return its stdout without trailing newlines.
+
+    Raises:
+        subprocess.CalledProcessError: If the git command fails
+    """
+    return subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        check=True,
+        text=True
+    ).stdout.rstrip("\n")
+
+class _RevLists:
+    """
+    Cached `git rev-list --reverse` results of commit ranges.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, List[str]] = {}
+
+    def get(self, revision_range: str) -> List[str]:
+        if revision_range not in self._cache:
+            self._cache[revision_range] = _git("rev-list", "--reverse", revision_range).split()
+        return self._cache[revision_range]
+
+def _log_commit(parts: List[Part], commit: str, variant: int, label: str = "Commit") -> None:
+    """
+    Append a commit the way log_commit() of the scripts prints it.
+    """
+    parts.append(f"\n{label}: {commit}\n".encode())
+    parts.append((commit, variant))
+    parts.append(f"\n{SEPARATOR}\n".encode())
+
+def _log_merge(detailed: List[Part], simple: List[Part], commit: str, parents: List[str],
+               rev_lists: _RevLists, variant: int, simple_title: str) -> None:
+    """
+    Append a merge commit and the commits it introduces to both variants.
+
+    The detailed scripts log `git rev-list --reverse <parent2>..<merge>`.
+    The simple scripts read `git log --pretty=format:%H --reverse
+    <parent1>..<merge>` with `while read`, which skips the last line (the
+    merge itself) as it has no trailing newline.
+    """
+    detailed.append(f"Merge Commit: {commit}\n".encode())
+    _log_commit(detailed, commit, variant)
+    detailed.append(b"Commits introduced by this merge:\n")
+    for introduced in rev_lists.get(f"{parents[1]}..{commit}"):
+        _log_commit(detailed, introduced, variant)
+
+    _log_commit(simple, commit, variant + 1, "Merge Commit")
+    simple.append(f"{simple_title}\n\n".encode())
+    for introduced in rev_lists.get(f"{parents[0]}..{commit}")[:-1]:
+        _log_commit(simple, introduced, variant + 1)
+
+def plan_logs(rev_lists: _RevLists) -> Tuple[List[Part], List[Part]]:
+    """
+    Plan the detailed and simple logs of the last commit.
+
+    Returns:
+        Tuple[List[Part], List[Part]]: Parts of git_log_detailed.txt and
+            git_log_simple.txt
+    """
+    commit, *parents = _git("rev-list", "--parents", "-n", "1", "HEAD").split()
+    detailed: List[Part] = []
+    simple: List[Part] = []
+
+    if len(parents) > 1:
+        _log_merge(detailed, simple, commit, parents, rev_lists, LOG_DETAILED,
+                   "New Commits Introduced by This Merge:")
+    else:
+        detailed.append(f"Regular Commit: {commit}\n".encode())
+        _log_commit(detailed, commit, LOG_DETAILED)
+        _log_commit(simple, commit, LOG_SIMPLE)
+
+    for parts in (detailed, simple):
+        parts.append(f"{TERMINATOR}\n".encode())
+    return detailed, simple
+
+def get_release_refs() -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    Get the current and previous release the way the release scripts do.
+
+    The previous release is the tag created before the current one, or the
+    first commit for the first release.
+
+    Returns:
+        Optional[Tuple[str, str, Optional[str]]]: (current tag, previous
+            reference, first commit if this is the first release), or None
+            when the repository has no tags
+    """
+    try:
+        current_tag = _git("describe", "--tags", "--abbrev=0")
+    except subprocess.CalledProcessError:
+        return None
+
+    tags = _git("tag", "--sort=-creatordate").split("\n")
+    if current_tag not in tags:
+        return None
+
+    index = tags.index(current_tag)
+    if index == len(tags) - 1:
+        first_commit = _git("rev-list", "--max-parents=0", "HEAD").split()[0]
+        return current_tag, f"{first_commit}^{{}}", first_commit
+    return current_tag, tags[index + 1], None
+
+def plan_release_logs(refs: Tuple[str, str, Optional[str]],
+                      rev_lists: _RevLists) -> Tuple[List[Part], List[Part]]:
+    """
+    Plan the detailed and simple release logs, up to the release diff.
+
+    Args:
+        refs (Tuple[str, str, Optional[str]]): Result of get_release_refs
+        rev_lists (_RevLists): Cached commit ranges
+
+    Returns:
+        Tuple[List[Part], List[Part]]: Parts of git_release_detailed.txt and
+            git_release_simple.txt
+    """
+    current_tag, previous, first_commit = refs
+    header = (
+        "CURRENT RELEASE:\n"
+        f"  Tag: {current_tag}\n"
+        f"  Date: {_git('log', '-1', '--format=%ai', current_tag)}\n"
+        "\n"
+        "PREVIOUS RELEASE:\n"
+    )
+    if first_commit is None:
+        header += f"  Tag: {previous}\n  Date: {_git('log', '-1', '--format=%ai', previous)}\n"
+    else:
+        header += "  No Previous Release, this is a First Release - Including all commits from repository start\n"
+    header += f"\n{SEPARATOR}\n"
+
+    detailed: List[Part] = [header.encode()]
+    simple: List[Part] = [header.encode()]
+
+    # For the first release the first commit is included too
+    if first_commit is not None:
+        _log_commit(detailed, first_commit, RELEASE_DETAILED)
+        _log_commit(simple, first_commit, RELEASE_SIMPLE)
+
+    for line in _git("rev-list", "--reverse", "--parents", f"{previous}..{current_tag}").splitlines():
+        commit, *parents = line.split()
+        if len(parents) > 1:
+            _log_merge(detailed, simple, commit, parents, rev_lists, RELEASE_DETAILED,
+                       "New commits introduced by this merge:")
+        else:
+            _log_commit(detailed, commit, RELEASE_DETAILED)
+            _log_commit(simple, commit, RELEASE_SIMPLE)
+    return detailed, simple
+
+def _parse_record(data: bytes) -> Tuple[str, Record]:
+    """
+    Parse one commit record of the git log stream.
+
+    A record is the commit hash and the header of every variant, NUL
+    separated, then a newline and the diff: raw lines, a blank line and the
+    patch (nothing for a merge without combined diff).
+    """
+    commit, *headers, diff = data.split(b"\x00", len(LOG_FILES) + 1)
+    diff = diff[1:]
+    raw = b""
+    if diff.startswith(b":"):
+        raw_end = diff.find(b"\n\n")
+        raw, diff = diff[:raw_end + 1], diff[raw_end + 2:]
+
+    # ":100644 100644 <sha> <sha> M\tpath" -> "M\tpath" (merges list more modes and shas)
+    name_status = b"".join(
+        head.rsplit(b" ", 1)[1] + b"\t" + paths + b"\n"
+        for head, _, paths in (line.partition(b"\t") for line in raw.splitlines())
+    )
+    return commit.decode(), (headers, diff, name_status)
+
+class _LogWriter:
+    """
+    Writes the parts of one log as the commits it references arrive.
+
+    Patches go through write_patch() when the output has one (LogStoreWriter).
+    """
+
+    def __init__(self, f: BinaryIO, parts: List[Part]):
+        self.f = f
+        self.write_patch = getattr(f, "write_patch", f.write)
+        self.parts = parts
+        self.position = 0
+
+    def write_commit(self, record: Record, variant: int) -> None:
+        """
+        Write a record as `git show --pretty=format:<variant format>` prints it.
+        """
+        headers, patch, name_status = record
+        if not headers[variant]:
+            return
+        self.f.write(headers[variant] + b"\n")
+        if variant in DETAILED_VARIANTS:
+            self.write_patch(patch)
+        else:
+            self.f.write(name_status)
+
+    def advance(self, records: Dict[str, Record], references: Counter) -> None:
+        while self.position < len(self.parts):
+            part = self.parts[self.position]
+            if isinstance(part, bytes):
+                self.f.write(part)
+            else:
+                commit, variant = part
+                if commit not in records:
+                    return
+                self.write_commit(records[commit], variant)
+                references[commit] -= 1
+                if not references[commit]:
+                    del records[commit]
+            self.position += 1
+
+def _read_records(process: subprocess.Popen):
+    """
+    Split the git log stream into commit records as it is read.
+    """
+    buffer = b""
+    for chunk in iter(lambda: process.stdout.read(CHUNK_SIZE), b""):
+        search_from = max(1, len(buffer) - len(RECORD_MARKER) + 1)
+        buffer += chunk
+        start = 0
+        # Records are separated by a newline before the next marker
+        while (end := buffer.find(RECORD_MARKER, max(search_from, start + 1))) != -1:
+            yield _parse_record(buffer[start + len(RECORD_MARKER):end - 1])
+            start = end
+        buffer = buffer[start:]
+    if buffer:
+        yield _parse_record(buffer[len(RECORD_MARKER):])
+
+def _iter_records(commits: List[str]):
+    """
+    Stream the records of the given commits from a single git log call.
+
+    Yields:
+        Tuple[str, Record]: Commit hash and record, in the given order.
+            Commits without changes under the pathspec are not printed by
+            git and are yielded as EMPTY_RECORD.
+    """
+    if not commits:
+        # Without revisions git log would show HEAD
+        return
+
+    log_format = "%x00".join(["%x00%x01%H", *(log_format for _, log_format in LOG_FILES), ""])
+    process = subprocess.Popen(
+        ["git", "log", "--no-walk=unsorted", "--stdin", f"--format=format:{log_format}",
+         *LOG_ARGS],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE
+    )
+    # git reads all of --stdin before it prints anything
+    process.stdin.write("".join(f"{commit}\n" for commit in commits).encode())
+    process.stdin.close()
+
+    expected = iter(commits)
+    try:
+        for commit, record in _read_records(process):
+            for pending in expected:
+                if pending == commit:
+                    break
+                yield pending, EMPTY_RECORD
+            yield commit, record
+        for pending in expected:
+            yield pending, EMPTY_RECORD
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+
+def encode_record(record: Record) -> bytes:
+    """
+    Serialize a record as length-prefixed fields (for the commit cache).
+    """
+    headers, patch, name_status = record
+    return b"".join(struct.pack("<I", len(field)) + field for field in (*headers, patch, name_status))
+
+def decode_record(data: bytes) -> Record:
+    """
+    Deserialize a record written by encode_record.
+
+    Raises:
+        ValueError: If the data is not a serialized record
+    """
+    fields = []
+    position = 0
+    while position < len(data):
+        (size,) = struct.unpack_from("<I", data, position)
+        fields.append(data[position + 4:position + 4 + size])
+        position += 4 + size
+    if position != len(data) or len(fields) != len(LOG_FILES) + 2:
+        raise ValueError("Invalid record")
+    return fields[:len(LOG_FILES)], fields[-2], fields[-1]
+
+def _iter_cached_records(commits: List[str], cache: CommitCache) -> Iterator[Tuple[str, Record]]:
+    """
+    Yield the records of the given commits from the cache, streaming only
+    the uncached ones from git (and caching them).
+    """
+    missing = [commit for commit in commits if not cache.contains(commit)]
+    missing_set = set(missing)
+    streamed = _iter_records(missing)
+    for commit in commits:
+        if commit in missing_set:
+            streamed_commit, record = next(streamed)
+            if streamed_commit != commit:
+                raise RuntimeError(f"Unexpected commit {streamed_commit} in the git log stream")
+            cache.put(commit, encode_record(record))
+            yield commit, record
+            continue
+
+        data = cache.get(commit)
+        try:
+            record = decode_record(data) if data is not None else None
+        except (ValueError, struct.error):
+            record = None
+        if record is None:
+            # Entry evicted or corrupted since it was listed
+            [(_, record)] = list(_iter_records([commit]))
+            cache.put(commit, encode_record(record))
+        yield commit, record
+    # Let git exit and check its status
+    for _ in streamed:
+        pass
+
+def _write_release_diff(previous: str, current_tag: str, detailed: _LogWriter, simple: _LogWriter) -> None:
+    """
+    Append the release diff: the patch to the detailed log and the --stat
+    summary to the simple log, from one `git diff --patch-with-stat` call.
+    """
+    process = subprocess.Popen(
+        ["git", "diff", "--patch-with-stat", f"{previous}..{current_tag}", "--", ".", *EXCLUDE_PATHSPEC],
+        stdout=subprocess.PIPE
+    )
+    stat = b""
+    in_stat = True
+    for chunk in iter(lambda: process.stdout.read(CHUNK_SIZE), b""):
+        if in_stat:
+            stat += chunk
+            # The stat lines end with a blank line before the patch
+            stat_end = stat.find(b"\n\n")
+            if stat_end == -1:
+                continue
+            in_stat = False
+            chunk = stat[stat_end + 2:]
+            stat = stat[:stat_end + 1]
+            simple.f.write(stat)
+        detailed.write_patch(chunk)
+    if in_stat:
+        simple.f.write(stat)
+    process.stdout.close()
+    if process.wait() != 0:
+        print(f"❌ Error generating diff between {previous} and {current_tag}")
+
+def write_git_logs(output_dir: str, store: Optional[LogStore] = None,
+                   cache: Optional[CommitCache] = None) -> bool:
+    """
+    Write the detailed and simple git logs and, in a release, the release logs.
+
+    Args:
+        output_dir (str): Directory of the log files (e.g. .tmp)
+        store (Optional[LogStore]): Store to write the detailed logs to
+            instead of output_dir (saved by the caller)
+        cache (Optional[CommitCache]): Commit cache in RECORD_NAMESPACE;
+            only uncached commits are read from git
+
+    Returns:
+        bool: True if the release logs were written (the repository has tags)
+
+    Raises:
+        subprocess.CalledProcessError: If a git command fails
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rev_lists = _RevLists()
+    logs = list(plan_logs(rev_lists))
+
+    refs = get_release_refs()
+    if refs is not None:
+        current_tag, previous, first_commit = refs
+        if first_commit is not None:
+            print(f"📌 This is the first release ({current_tag}). Comparing with first commit.")
+        print(f"📝 Processing changes between {previous} and {current_tag}...")
+        logs.extend(plan_release_logs(refs, rev_lists))
+
+    commit_lists = [[part[0] for part in parts if isinstance(part, tuple)] for parts in logs]
+    references = Counter(commit for commits in commit_lists for commit in commits)
+    # Interleave the logs so every log can be written while the stream is read
+    order = list(dict.fromkeys(
+        commit for commits in zip_longest(*commit_lists) for commit in commits if commit
+    ))
+
+    files = [
+        store.open_log(name) if store is not None and variant in DETAILED_VARIANTS
+        else open(os.path.join(output_dir, name), "wb")
+        for variant, (name, _) in enumerate(LOG_FILES[:len(logs)])
+    ]
+    try:
+        writers = [_LogWriter(f, parts) for f, parts in zip(files, logs)]
+        records: Dict[str, Record] = {}
+        for writer in writers:
+            writer.advance(records, references)
+        stream = _iter_records(order) if cache is None else _iter_cached_records(order, cache)
+        for commit, record in stream:
+            records[commit] = record
+            for writer in writers:
+                writer.advance(records, references)
+
+        if refs is not None:
+            _write_release_diff(previous, current_tag, writers[RELEASE_DETAILED], writers[RELEASE_SIMPLE])
+            for f in files[RELEASE_DETAILED:]:
+                f.write(f"{TERMINATOR}\n".encode())
+    finally:
+        for f in files:
+            f.close()
+    return refs is not None
+
+def benchmark(context: Optional[RunContext] = None) -> bool:
+    """
+    Time the bin/git_*.sh scripts against write_git_logs and compare their output.
+
+    The scripts write their logs to .tmp/ as usual; the generator writes to
+    a temporary directory.
+
+    Args:
+        context (Optional[RunContext]): Run context (resolved when omitted)
+
+    Returns:
+        bool: True if all logs are byte-identical
+    """
+    context = context or get_run_context()
+    scripts = [f"{context.bin_path}/{name.replace('.txt', '.sh')}" for name, _ in LOG_FILES]
+    for name, _ in LOG_FILES:
+        if os.path.exists(context.tmp(name)):
+            os.remove(context.tmp(name))
+
+    print("⏱️  Running bin/git_*.sh...")
+    started = time.perf_counter()
+    for script in scripts:
+        subprocess.run([script], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    shell_time = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("⏱️  Running write_git_logs...")
+        started = time.perf_counter()
+        write_git_logs(tmp)
+        python_time = time.perf_counter() - started
+
+        identical = True
+        for name, _ in LOG_FILES:
+            shell_output = context.tmp(name)
+            python_output = os.path.join(tmp, name)
+            if os.path.exists(shell_output) != os.path.exists(python_output) or (
+                    os.path.exists(shell_output) and not filecmp.cmp(shell_output, python_output, shallow=False)):
+                print(f"❌ {name} differs")
+                identical = False
+
+    print(f"\n📊 bin/git_*.sh:   {shell_time:.3f}s")
+    print(f"📊 write_git_logs: {python_time:.3f}s")
+    if python_time > 0:
+        print(f"📊 Speedup:        {shell_time / python_time:.1f}x")
+    if identical:
+        print("✅ Outputs are byte-identical")
+    else:
+        print("❌ Outputs differ")
+    return identical
+
+def main():
+    """
+    Main function to write the git logs.
+    Called when running as a module: python -m pkg.changelog.generate
+    """
+    parser = argparse.ArgumentParser(description="Write the changelog git logs in a single git pass")
+    parser.add_argument("--output-dir", default=".tmp",
+                      help="Directory of the log files (default: .tmp)")
+    parser.add_argument("--benchmark", action="store_true",
+                      help="Compare speed and output with the bin/git_*.sh scripts")
+    args = parser.parse_args()
+
+    try:
+        if args.benchmark:
+            sys.exit(0 if benchmark() else 1)
+
+        if write_git_logs(args.output_dir):
+            print(f"✅ Git and release logs saved to {args.output_dir}")
+        else:
+            print(f"✅ Git logs saved to {args.output_dir} (no tags, no release logs)")
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error: {' '.join(e.cmd)} failed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
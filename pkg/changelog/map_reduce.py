@@ -0,0 +1,248 @@
+"""
+Map-reduce changelog generation for logs larger than the context budget.
+
+The detailed log is split on commit boundaries into chunks under a token
+budget. Every chunk is summarized by its own model call (map_prompt.md), in
+a bounded pool of workers, and the summaries are joined into one file that
+the final pass reads with prompt.md to write .tmp/changelog.md (reduce).
+Wall time grows with the number of chunks divided by the number of workers.
+
+The model command is a template whose {input}, {prompt} and {output}
+arguments are replaced for every call. It defaults to aider and can be
+replaced, e.g. by a fake model in tests, with $CHANGELOG_MODEL_COMMAND or
+`python -m pkg.changelog --model-command`.
+
+Chunk summaries are kept in the commit cache, keyed by the chunk content
+and namespaced by the map prompt and model command, so re-runs only
+summarize new chunks.
+
+Example usage:
+    from pkg.changelog.map_reduce import MapReduceConfig, summarize_log
+
+    config = MapReduceConfig(jobs=8, model_command=["python", "fake_model.py", "{input}", "{prompt}", "{output}"])
+    summaries_path = summarize_log(log_text, context, config)
+"""
+
+import hashlib
+import os
+import shlex
+import shutil
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from utils.get_run_context import RunContext
+from utils.run_jobs import DEFAULT_RETRIES, DEFAULT_TIMEOUT, run_jobs
+from utils.trace_span import traced
+from .assemble import TRUNCATED, Section, parse_log
+from .cache import CommitCache, get_cache_dir, get_namespace
+
+MODEL_COMMAND = [
+    "aider",
+    "--subtree-only",
+    "--no-git",
+    "--yes",
+    "--sonnet",
+    "--cache-prompts",
+    "--no-stream",
+    "--no-check-update",
+    "--read", "{input}",
+    "--message-file", "{prompt}",
+    "{output}",
+]
+
+DEFAULT_JOBS = 4
+
+# Chunk budget, below the single-pass threshold to leave room for the prompt
+DEFAULT_CHUNK_TOKENS = 150_000
+
+def get_model_command() -> List[str]:
+    """
+    Get the model command template ($CHANGELOG_MODEL_COMMAND or aider).
+
+    Returns:
+        List[str]: Command arguments with {input}, {prompt} and {output}
+    """
+    command = os.environ.get("CHANGELOG_MODEL_COMMAND")
+    return shlex.split(command) if command else list(MODEL_COMMAND)
+
+def build_model_command(template: List[str], input_path: str, prompt_path: str, output_path: str) -> List[str]:
+    """
+    Fill the {input}, {prompt} and {output} arguments of a model command.
+
+    Args:
+        template (List[str]): Command template
+        input_path (str): File the model reads
+        prompt_path (str): Prompt file
+        output_path (str): File the model writes
+
+    Returns:
+        List[str]: Command arguments
+    """
+    values = {"{input}": input_path, "{prompt}": prompt_path, "{output}": output_path}
+    command = []
+    for arg in template:
+        for placeholder, value in values.items():
+            arg = arg.replace(placeholder, value)
+        command.append(arg)
+    return command
+
+@dataclass
+class MapReduceConfig:
+    """
+    Settings of the map-reduce mode.
+
+    Attributes:
+        jobs (int): Maximum number of concurrent model calls
+        chunk_tokens (int): Token budget of a chunk
+        model_command (List[str]): Model command template
+        timeout (Optional[float]): Seconds allowed per model call
+        retries (int): Extra attempts for a failed model call
+        use_cache (bool): Whether to reuse cached chunk summaries
+    """
+    jobs: int = DEFAULT_JOBS
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS
+    model_command: List[str] = field(default_factory=get_model_command)
+    timeout: Optional[float] = DEFAULT_TIMEOUT
+    retries: int = DEFAULT_RETRIES
+    use_cache: bool = True
+
+def _fit(section: Section, budget: int) -> str:
+    """
+    Get the most detailed form of a section that fits the budget.
+    """
+    for form, size in zip(section.forms, section.sizes):
+        if size <= budget:
+            return form
+    data = section.forms[-1].encode("utf-8", "surrogateescape")
+    marker = f"\n{TRUNCATED}\n".encode()
+    return (data[:max(0, budget - len(marker))] + marker).decode("utf-8", "ignore")
+
+def split_log(text: str, chunk_tokens: int = DEFAULT_CHUNK_TOKENS) -> Tuple[str, List[str]]:
+    """
+    Split a detailed log on commit boundaries into chunks under a token budget.
+
+    Commits are kept whole, with their patch when it fits in a chunk, else
+    with their file list or summary (see assemble.py). The full diff of
+    release logs repeats the commit patches and is left out.
+
+    Args:
+        text (str): Content of a detailed log
+        chunk_tokens (int): Token budget of a chunk, header included
+
+    Returns:
+        Tuple[str, List[str]]: Log header (release information) and chunks
+    """
+    parts = parse_log(text)
+    header = parts[0] if parts and isinstance(parts[0], str) else ""
+    budget = max(1, chunk_tokens * 4 - len(header.encode("utf-8", "surrogateescape")))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    pending = ""
+    for part in parts[1:] if header else parts:
+        if isinstance(part, str):
+            pending += part
+            continue
+        if part.full_diff:
+            pending = ""
+            continue
+
+        entry = pending + _fit(part, budget - len(pending.encode("utf-8", "surrogateescape")))
+        pending = ""
+        entry_size = len(entry.encode("utf-8", "surrogateescape"))
+        if current and size + entry_size > budget:
+            chunks.append(header + "".join(current))
+            current, size = [], 0
+        current.append(entry)
+        size += entry_size
+
+    if current:
+        chunks.append(header + "".join(current))
+    return header, chunks
+
+@traced("changelog.summarize_log")
+def summarize_log(text: str, context: RunContext, config: Optional[MapReduceConfig] = None) -> Optional[str]:
+    """
+    Summarize the chunks of a detailed log concurrently (map step).
+
+    Chunks are written to .tmp/changelog_chunks/, the summaries to
+    .tmp/changelog_summaries.md, which is the input of the reduce step.
+
+    Args:
+        text (str): Content of a detailed log
+        context (RunContext): Run context
+        config (Optional[MapReduceConfig]): Map-reduce settings
+
+    Returns:
+        Optional[str]: Path of the joined summaries, or None if a chunk
+            could not be summarized
+    """
+    config = config or MapReduceConfig()
+    header, chunks = split_log(text, config.chunk_tokens)
+    if not chunks:
+        print("⚠️  No commits to summarize")
+        return None
+
+    prompt_path = context.changelog_map_prompt
+    work_dir = context.tmp("changelog_chunks")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+
+    cache = None
+    if config.use_cache:
+        with open(prompt_path, "rb") as f:
+            namespace = get_namespace("summary", f.read(), *config.model_command)
+        cache = CommitCache(get_cache_dir(), namespace)
+
+    summaries: List[Optional[str]] = [None] * len(chunks)
+    plans: List[Dict[str, Any]] = []
+    for index, chunk in enumerate(chunks):
+        # Chunks hold immutable commits: their content identifies them
+        key = hashlib.blake2b(chunk.encode("utf-8", "surrogateescape"), digest_size=20).hexdigest()
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            summaries[index] = cached.decode("utf-8", "replace")
+            continue
+
+        chunk_path = os.path.join(work_dir, f"chunk_{index + 1:03d}.txt")
+        summary_path = os.path.join(work_dir, f"summary_{index + 1:03d}.md")
+        with open(chunk_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+            f.write(chunk)
+        plans.append({
+            "path": f"chunk_{index + 1:03d}",
+            "command": build_model_command(config.model_command, chunk_path, prompt_path, summary_path),
+            "index": index,
+            "key": key,
+            "output": summary_path
+        })
+
+    print(f"\n🧩 Split into {len(chunks)} chunks of up to {config.chunk_tokens:,} tokens "
+          f"({len(chunks) - len(plans)} cached)")
+    results = run_jobs(plans, config.jobs, config.timeout, config.retries,
+                       log_dir=context.tmp("changelog_logs"))
+
+    failed = []
+    for plan, result in zip(plans, results):
+        try:
+            with open(plan["output"], "r", encoding="utf-8", errors="replace") as f:
+                summary = f.read().strip()
+        except OSError:
+            summary = ""
+        if not result.ok or not summary:
+            failed.append(plan["path"])
+            continue
+        summaries[plan["index"]] = summary
+        if cache is not None:
+            cache.put(plan["key"], summary.encode("utf-8"))
+
+    if failed:
+        print(f"❌ Could not summarize {len(failed)} of {len(chunks)} chunks: {', '.join(failed)}")
+        return None
+
+    summaries_path = context.tmp("changelog_summaries.md")
+    with open(summaries_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+        f.write(header)
+        f.write(f"\nThis release was summarized in {len(chunks)} parts, in commit order.\n")
+        for index, summary in enumerate(summaries, 1):
+            f.write(f"\n# Part {index} of {len(chunks)}\n\n{summary}\n")
+    return summaries_path
@@ -5,26 +5,46 @@ Core implementation of the changelog generator.
 import subprocess
 import sys
 import os
-from typing import Literal
-from utils.get_base_path import get_base_path
+from typing import List, Literal, Optional
+from shared.require_aider import require_aider
+from utils.get_run_context import RunContext, get_run_context
 from utils.get_token_count import get_token_count
+from utils.trace_span import setup_tracing, trace_span, traced
+from .assemble import assemble_log, assemble_log_file
+from .cache import CommitCache, get_cache_dir
+from .generate import RECORD_NAMESPACE, write_git_logs
+from .map_reduce import MapReduceConfig, build_model_command, get_model_command, summarize_log
+from .store import LogStore, get_store_path
 
 LogType = Literal["log", "release"]
 
-def generate_logs() -> None:
+# Logs over this many tokens are fitted to it, or summarized in map-reduce mode
+TOKEN_THRESHOLD = 185_000
+
+@traced("changelog.generate_logs")
+def generate_logs(context: Optional[RunContext] = None, use_cache: bool = True) -> None:
     """
     Generate all git logs. Release logs will only be generated
-    if we're in a release.
+    if we're in a release. Detailed logs are written to the log store
+    (.tmp/git_logs), simple logs to .tmp.
+
+    Commits already rendered by a previous run are read from the commit
+    cache (.cache/changelog or $CHANGELOG_CACHE_DIR) instead of git.
+
+    Args:
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        use_cache (bool): Whether to use the commit cache
     """
-    base = get_base_path()
-    script_prefix = f"{base}/bin"
+    context = context or get_run_context()
 
     # Delete existing logs to avoid false positives
     log_files = [
-        ".tmp/git_log_detailed.txt",
-        ".tmp/git_log_simple.txt",
-        ".tmp/git_release_detailed.txt",
-        ".tmp/git_release_simple.txt"
+        context.tmp("git_log_detailed.txt"),
+        context.tmp("git_log_simple.txt"),
+        context.tmp("git_release_detailed.txt"),
+        context.tmp("git_release_simple.txt"),
+        context.tmp("git_log_budgeted.txt"),
+        context.tmp("git_release_budgeted.txt")
     ]
     
     print("\n🗑️  Cleaning up old logs...")
@@ -34,40 +54,66 @@ def generate_logs() -> None:
             print(f"   Deleted: {log_file}")
 
     try:
-        # Generate regular logs
+        # One git pass writes the regular and, in a release, the release logs
         print("\n📝 Generating git logs...")
-        subprocess.run([f"{script_prefix}/git_log_detailed.sh"], check=True)
-        subprocess.run([f"{script_prefix}/git_log_simple.sh"], check=True)
-        print("✅ Git logs generated successfully")
-
-        # Try to generate release logs
-        print("\n📝 Generating release logs...")
-        subprocess.run([f"{script_prefix}/git_release_detailed.sh"], check=True)
-        subprocess.run([f"{script_prefix}/git_release_simple.sh"], check=True)
-        print("✅ Release logs generated successfully")
+        store = LogStore.create(get_store_path(context.tmp()))
+        cache = CommitCache(get_cache_dir(), RECORD_NAMESPACE) if use_cache else None
+        with trace_span("changelog.write_git_logs", cached=cache is not None) as span:
+            released = write_git_logs(context.tmp(), store, cache)
+            store.save()
+            if cache is not None:
+                span.set(hits=cache.hits, writes=cache.writes)
+
+        if cache is not None:
+            evicted, _ = cache.prune()
+            print(f"♻️  Commit cache: {cache.hits:,} commits reused, {cache.writes:,} read from git"
+                  + (f", {evicted:,} old entries evicted" if evicted else ""))
+
+        stats = store.get_stats()["store"]
+        print(f"🗜️  Detailed logs stored: {stats['size']:,} bytes in {stats['stored']:,} bytes "
+              f"({stats['blobs']:,} unique blobs)")
+        if released:
+            print("✅ Git and release logs generated successfully")
+        else:
+            print("✅ Git logs generated successfully")
+            print("⚠️  No release logs generated, using regular logs")
     except subprocess.CalledProcessError as e:
         print(f"⚠️  No release logs generated, using regular logs")
 
-def get_paths() -> tuple[str, str]:
+@traced("changelog.get_paths")
+def get_paths(context: Optional[RunContext] = None,
+              map_reduce: Optional[MapReduceConfig] = None) -> tuple[str, str, bool]:
     """
     Get the correct paths based on the current environment.
     If release logs exist, use them. Otherwise, use regular logs.
-    
+
+    Detailed logs are read from the log store unless a plain file exists
+    (e.g. written by the bin/git_*.sh scripts); the selected view is rendered
+    to .tmp on demand.
+
+    Args:
+        context (Optional[RunContext]): Run context (resolved when omitted)
+        map_reduce (Optional[MapReduceConfig]): When set, logs over the
+            threshold are summarized chunk by chunk instead of budgeted
+
     Returns:
-        tuple[str, str]: Prompt path and log path
+        tuple[str, str, bool]: Prompt path, log path, and whether the log was
+            rendered from the store (a temporary view the caller may remove)
     """
-    base = get_base_path()
-    prompt_path = f"{base}/pkg/changelog/prompt.md"
-    token_threshold = 185_000
+    context = context or get_run_context()
+    prompt_path = context.changelog_prompt
+    token_threshold = TOKEN_THRESHOLD
 
     # Check if release logs exist
-    release_detailed = ".tmp/git_release_detailed.txt"
-    release_simple = ".tmp/git_release_simple.txt"
-    log_detailed = ".tmp/git_log_detailed.txt"
-    log_simple = ".tmp/git_log_simple.txt"
+    release_detailed = context.tmp("git_release_detailed.txt")
+    release_simple = context.tmp("git_release_simple.txt")
+    log_detailed = context.tmp("git_log_detailed.txt")
+    log_simple = context.tmp("git_log_simple.txt")
+    store = LogStore(get_store_path(context.tmp()))
 
     # If release logs exist, use them
-    if os.path.exists(release_detailed) or os.path.exists(release_simple):
+    if (os.path.exists(release_detailed) or os.path.exists(release_simple)
+            or store.has_log(os.path.basename(release_detailed))):
         print("\n📦 Using release logs")
         detailed_path = release_detailed
         simple_path = release_simple
@@ -76,51 +122,101 @@ def get_paths() -> tuple[str, str]:
         detailed_path = log_detailed
         simple_path = log_simple
 
-    # Check if we should use simple logs based on token count
-    token_count = get_token_count(detailed_path)
+    # Check if the detailed logs must be fitted to the budget
+    detailed_name = os.path.basename(detailed_path)
+    stored = not os.path.exists(detailed_path) and store.has_log(detailed_name)
+    if stored:
+        token_count = store.get_token_count(detailed_name)
+    else:
+        token_count = get_token_count(detailed_path)
 
     print(f"\n📊 Token count: {token_count:,}")
     print(f"📊 Threshold: {token_threshold:,} tokens")
 
+    if token_count > token_threshold and map_reduce is not None:
+        # Summarize every commit in chunks, then write the changelog from the summaries
+        if stored:
+            text = store.read_log(detailed_name).decode("utf-8", "surrogateescape")
+        else:
+            with open(detailed_path, "r", encoding="utf-8", errors="surrogateescape") as f:
+                text = f.read()
+        summaries_path = summarize_log(text, context, map_reduce)
+        if summaries_path is not None:
+            print(f"🧩 Using chunk summaries ({get_token_count(summaries_path):,} tokens)")
+            return prompt_path, summaries_path, False
+        print("⚠️  Falling back to budgeted logs")
+
     if token_count > token_threshold:
-        print("⚠️  Using simple logs due to size limit")
-        log_path = simple_path
+        # Keep the patches of as many commits as fit, degrading the rest
+        budgeted_path = detailed_path.replace("_detailed.txt", "_budgeted.txt")
+        try:
+            if stored:
+                text = store.read_log(detailed_name).decode("utf-8", "surrogateescape")
+                result, stats = assemble_log(text, token_threshold)
+                with open(budgeted_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+                    f.write(result)
+            else:
+                stats = assemble_log_file(detailed_path, budgeted_path, token_threshold)
+        except OSError as e:
+            print(f"⚠️  Using simple logs due to size limit ({e})")
+            log_path = simple_path
+        else:
+            print(f"⚖️  Using budgeted logs: {stats['detailed']} of {stats['commits']} commits with patches, "
+                  f"{stats['name_status']} with file lists, {stats['minimal']} with summaries "
+                  f"({stats['tokens']:,} tokens)")
+            log_path = budgeted_path
     else:
         print("✅ Using detailed logs")
-        log_path = detailed_path
+        log_path = store.render(detailed_name, detailed_path) if stored else detailed_path
+        return prompt_path, log_path, stored
 
-    return prompt_path, log_path
+    return prompt_path, log_path, False
 
-def run() -> None:
+def run(use_cache: bool = True, map_reduce: Optional[MapReduceConfig] = None,
+        model_command: Optional[List[str]] = None, trace: Optional[str] = None) -> None:
     """
     Runs the aider command to generate changelog documentation.
+
+    Args:
+        use_cache (bool): Whether to reuse commits cached by previous runs
+        map_reduce (Optional[MapReduceConfig]): When set, logs over the token
+            threshold are summarized in chunks before the final pass
+        model_command (Optional[List[str]]): Command template of the final
+            pass (default: $CHANGELOG_MODEL_COMMAND or aider)
+        trace (Optional[str]): Write a Chrome trace of the stages to this
+            file (default: $CODEX_TRACE; no trace when unset)
     """
+    setup_tracing(trace)
+
+    # Resolve the environment once for the whole run
+    context = get_run_context()
+
     # Generate all logs
-    generate_logs()
+    generate_logs(context, use_cache)
     
-    # Get paths
-    prompt_path, log_path = get_paths()
+    # Install aider before its first use (checked in-process, installed from the
+    # wheelhouse if present); in map-reduce mode get_paths already calls the model
+    template = model_command or get_model_command()
+    commands = [template] + ([map_reduce.model_command] if map_reduce is not None else [])
+    if any(command[0] == "aider" for command in commands):
+        require_aider()
     
-    # Install aider right before using it
-    subprocess.run(["python", "-m", "shared.require_aider"], check=True)
+    # Get paths
+    prompt_path, log_path, rendered = get_paths(context, map_reduce)
     
-    # Build and run aider command
-    command = f"""aider \\
-  --subtree-only \\
-  --no-git \\
-  --yes \\
-  --sonnet \\
-  --cache-prompts \\
-  --no-stream \\
-  --no-check-update \\
-  --read {log_path}  \\
-  --message-file {prompt_path} \\
-  .tmp/changelog.md"""
+    # Build and run the model command (aider by default)
+    command = build_model_command(template, log_path, prompt_path, context.tmp("changelog.md"))
     
     print()
-    print(f"Running command: {command}")
+    print(f"Running command: {' '.join(command)}")
     print()
     
-    subprocess.run(command, shell=True)
+    with trace_span("changelog.model", program=command[0]) as span:
+        span.set(returncode=subprocess.run(command).returncode)
+
+    # The log store keeps the detailed logs, so their rendered view is not kept
+    # (plain files, e.g. from the bin/git_*.sh scripts, are left alone)
+    if rendered and os.path.exists(log_path):
+        os.remove(log_path)
     
     print()
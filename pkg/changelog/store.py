@@ -0,0 +1,358 @@
+"""
+Content-addressed, compressed store of the detailed changelog logs.
+
+A detailed release log repeats every commit patch in the full diff between
+the releases, and the detailed log of the last commit repeats patches of the
+release log. The store (.tmp/git_logs/) splits patches into one blob per
+file section, keeps every distinct blob once, keyed by its BLAKE2b hash and
+compressed with a stdlib codec, and records each log as the list of its
+blob keys. Text between patches (commit headers, separators) is stored as
+blobs too.
+
+Logs are rendered on demand as a stream of blobs. The character count of
+every blob (same count as `wc -m`) is kept in the index, so the token count
+of a log is known without rendering or decompressing it.
+
+Example usage:
+    from pkg.changelog.store import LogStore
+
+    store = LogStore.create(".tmp/git_logs")
+    write_git_logs(".tmp", store)  # Detailed logs go to the store
+    store.save()
+
+    store = LogStore(".tmp/git_logs")
+    tokens = store.get_token_count("git_release_detailed.txt")
+    store.render("git_release_detailed.txt", ".tmp/git_release_detailed.txt")
+
+Command-line usage:
+    # Logical, unique and stored size of every log
+    python -m pkg.changelog.store stats
+
+    # Render a log to a file (or stdout)
+    python -m pkg.changelog.store render git_release_detailed.txt .tmp/git_release_detailed.txt
+"""
+
+import argparse
+import bz2
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import re
+import shutil
+import sys
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from utils.get_token_count import count_chars
+
+STORE_DIR = "git_logs"
+STORE_VERSION = 1
+PACK_NAME = "objects.pack"
+INDEX_NAME = "index.json.gz"
+
+# Stdlib codecs: (compress, decompress)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+DEFAULT_CODEC = "zlib"
+
+# Start of a file section in a patch
+_SECTION_START = re.compile(rb"^diff --(?:git|cc|combined) ", re.MULTILINE)
+_SECTION_PREFIX_SIZE = len(b"diff --combined ")
+
+class LogStore:
+    """
+    Pack of compressed blobs and the blob lists of the stored logs.
+
+    Blobs are appended to objects.pack; index.json.gz maps every key to its
+    [offset, compressed size, size, characters] and every log name to its
+    blob keys.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.pack_path = os.path.join(root, PACK_NAME)
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self.index: Dict[str, Any] = {
+            "version": STORE_VERSION, "codec": DEFAULT_CODEC, "objects": {}, "logs": {}
+        }
+        self._pack: Optional[BinaryIO] = None
+
+        try:
+            with gzip.open(self.index_path, "rt", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == STORE_VERSION and index.get("codec") in CODECS:
+                self.index = index
+        except (OSError, EOFError, ValueError):
+            pass
+
+    @classmethod
+    def create(cls, root: str, codec: str = DEFAULT_CODEC) -> "LogStore":
+        """
+        Create an empty store, removing any previous one.
+
+        Args:
+            root (str): Store directory
+            codec (str): Name of the compression codec in CODECS
+
+        Returns:
+            LogStore: Empty store
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}")
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root)
+        store = cls(root)
+        store.index["codec"] = codec
+        return store
+
+    def put(self, data: bytes) -> str:
+        """
+        Store a blob once.
+
+        Args:
+            data (bytes): Blob content
+
+        Returns:
+            str: Blob key
+        """
+        key = hashlib.blake2b(data, digest_size=12).hexdigest()
+        objects = self.index["objects"]
+        if key not in objects:
+            compressed = CODECS[self.index["codec"]][0](data)
+            if self._pack is None:
+                self._pack = open(self.pack_path, "ab")
+            offset = self._pack.seek(0, os.SEEK_END)
+            self._pack.write(compressed)
+            objects[key] = [offset, len(compressed), len(data), count_chars(data)]
+        return key
+
+    def get(self, key: str) -> bytes:
+        """
+        Read a blob.
+
+        Args:
+            key (str): Blob key
+
+        Returns:
+            bytes: Blob content
+        """
+        offset, length, _, _ = self.index["objects"][key]
+        if self._pack is not None:
+            self._pack.flush()
+        with open(self.pack_path, "rb") as f:
+            f.seek(offset)
+            return CODECS[self.index["codec"]][1](f.read(length))
+
+    def open_log(self, name: str) -> "LogStoreWriter":
+        """
+        Open a log for writing; it is added to the store when closed.
+
+        Args:
+            name (str): Log name (e.g. git_release_detailed.txt)
+
+        Returns:
+            LogStoreWriter: File-like writer
+        """
+        return LogStoreWriter(self, name)
+
+    def has_log(self, name: str) -> bool:
+        """Whether the store holds a log."""
+        return name in self.index["logs"]
+
+    def iter_log(self, name: str) -> Iterator[bytes]:
+        """
+        Render a log as a stream of blobs.
+
+        Args:
+            name (str): Log name
+
+        Yields:
+            bytes: Consecutive parts of the log
+        """
+        objects = self.index["objects"]
+        codec = CODECS[self.index["codec"]][1]
+        if self._pack is not None:
+            self._pack.flush()
+        with open(self.pack_path, "rb") as f:
+            for key in self.index["logs"][name]:
+                offset, length, _, _ = objects[key]
+                f.seek(offset)
+                yield codec(f.read(length))
+
+    def read_log(self, name: str) -> bytes:
+        """Render a whole log in memory."""
+        return b"".join(self.iter_log(name))
+
+    def render(self, name: str, output_path: str) -> str:
+        """
+        Render a log to a file.
+
+        Args:
+            name (str): Log name
+            output_path (str): File to write
+
+        Returns:
+            str: The output path
+        """
+        with open(output_path, "wb") as f:
+            for data in self.iter_log(name):
+                f.write(data)
+        return output_path
+
+    def get_token_count(self, name: str) -> int:
+        """
+        Get the token count (characters / 4) of a log from the index.
+
+        Same count as utils.get_token_count on the rendered log.
+
+        Args:
+            name (str): Log name
+
+        Returns:
+            int: Number of tokens of the rendered log
+        """
+        objects = self.index["objects"]
+        return sum(objects[key][3] for key in self.index["logs"][name]) // 4
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the size of every log and of the store.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Log name (and "store") to its blobs,
+                rendered size, unique content size and compressed size
+        """
+        objects = self.index["objects"]
+        stats = {}
+        for name, keys in self.index["logs"].items():
+            unique = set(keys)
+            stats[name] = {
+                "blobs": len(keys),
+                "size": sum(objects[key][2] for key in keys),
+                "unique": sum(objects[key][2] for key in unique),
+                "stored": sum(objects[key][1] for key in unique),
+            }
+        stats["store"] = {
+            "blobs": len(objects),
+            "size": sum(log["size"] for log in stats.values()),
+            "unique": sum(entry[2] for entry in objects.values()),
+            "stored": sum(entry[1] for entry in objects.values()),
+        }
+        return stats
+
+    def save(self) -> None:
+        """
+        Flush the pack and atomically write the index.
+        """
+        if self._pack is not None:
+            self._pack.close()
+            self._pack = None
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(temp_path, self.index_path)
+
+class LogStoreWriter:
+    """
+    Writes one log to a store, splitting patches into file section blobs.
+
+    write() takes text that is stored as written; write_patch() takes patch
+    output, in any chunks, that is split at its "diff --git" lines.
+    """
+
+    def __init__(self, store: LogStore, name: str):
+        self.store = store
+        self.name = name
+        self.keys: List[str] = []
+        self._text = bytearray()
+        self._patch = bytearray()
+        self._scanned = 0
+
+    def _flush_text(self) -> None:
+        if self._text:
+            self.keys.append(self.store.put(bytes(self._text)))
+            self._text.clear()
+
+    def _flush_patch(self, final: bool) -> None:
+        # A section ends where the next one starts; the last one may continue in the next chunk
+        ends = [match.start() for match in _SECTION_START.finditer(self._patch, self._scanned)]
+        if final:
+            ends.append(len(self._patch))
+
+        position = 0
+        for end in ends:
+            if end > position:
+                self.keys.append(self.store.put(bytes(self._patch[position:end])))
+                position = end
+        del self._patch[:position]
+        # Only the tail can hold the start of a "diff --" line cut by the chunk
+        self._scanned = max(0, len(self._patch) - _SECTION_PREFIX_SIZE)
+
+    def write(self, data: bytes) -> None:
+        self._flush_patch(final=True)
+        self._text += data
+
+    def write_patch(self, data: bytes) -> None:
+        self._flush_text()
+        self._patch += data
+        self._flush_patch(final=False)
+
+    def close(self) -> None:
+        self._flush_patch(final=True)
+        self._flush_text()
+        self.store.index["logs"][self.name] = self.keys
+
+def get_store_path(tmp_root: str) -> str:
+    """
+    Get the store directory under the temporary directory.
+
+    Args:
+        tmp_root (str): Temporary directory (e.g. .tmp)
+
+    Returns:
+        str: Store directory (e.g. .tmp/git_logs)
+    """
+    return os.path.join(tmp_root, STORE_DIR)
+
+def main():
+    """
+    Main function to inspect or render the stored logs.
+    Called when running as a module: python -m pkg.changelog.store
+    """
+    parser = argparse.ArgumentParser(description="Inspect the changelog log store")
+    parser.add_argument("--store", default=get_store_path(".tmp"),
+                      help="Store directory (default: .tmp/git_logs)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Show the size of every stored log")
+    render_parser = subparsers.add_parser("render", help="Render a log to a file or stdout")
+    render_parser.add_argument("name", help="Log name (e.g. git_release_detailed.txt)")
+    render_parser.add_argument("output", nargs="?", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    store = LogStore(args.store)
+    if args.command == "stats":
+        if not store.index["logs"]:
+            print(f"❌ Error: No logs in {args.store}")
+            sys.exit(1)
+        for name, stats in store.get_stats().items():
+            print(f"📊 {name}: {stats['blobs']:,} blobs, {stats['size']:,} bytes rendered, "
+                  f"{stats['unique']:,} unique, {stats['stored']:,} stored")
+        return
+
+    if not store.has_log(args.name):
+        print(f"❌ Error: Log not found: {args.name}")
+        sys.exit(1)
+    if args.output:
+        store.render(args.name, args.output)
+        print(f"✅ Rendered {args.name} to {args.output}")
+    else:
+        for data in store.iter_log(args.name):
+            sys.stdout.buffer.write(data)
+
+if __name__ == "__main__":
+    main()
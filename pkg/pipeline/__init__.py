@@ -0,0 +1,15 @@
+"""
+Single-process documentation pipeline.
+
+For programmatic usage:
+    from pkg.pipeline import run
+    result = run(mode="dev", changes="commit")
+    print(len(result.plans), result.timings)
+
+    # Also write the .tmp/tree_*.json files
+    run(export=True)
+"""
+
+from .run import PipelineResult, run, run_pipeline
+
+__all__ = ['PipelineResult', 'run', 'run_pipeline']
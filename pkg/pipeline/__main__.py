@@ -0,0 +1,68 @@
+"""
+Command-line interface for the documentation pipeline.
+
+For command-line usage:
+    # Scan, compute changes and siblings, and plan the docs in one process
+    python -m pkg.pipeline
+
+    # Also write the .tmp/tree_*.json files
+    python -m pkg.pipeline --export
+
+    # Document the directories changed by the last commit, 8 aider jobs at a time
+    python -m pkg.pipeline --changes commit --execute --jobs 8
+
+    # Compare with tree_generate_all.sh + pkg.akads
+    python -m pkg.pipeline --benchmark
+"""
+
+import argparse
+from utils.run_jobs import DEFAULT_JOBS, DEFAULT_RETRIES, DEFAULT_TIMEOUT
+from pkg.akads.batch import DEFAULT_BATCH_TOKENS
+from .run import CHANGE_TREES, benchmark, run
+
+def main():
+    """
+    Parse command line arguments and run the pipeline.
+    """
+    parser = argparse.ArgumentParser(description="Scan the project and plan its documentation in one process")
+    parser.add_argument("start_path", nargs="?", default="./",
+                      help="Directory to scan (default: ./)")
+    parser.add_argument("--mode", choices=["prod", "dev"], default="prod",
+                      help="Running mode: prod (production) or dev (development)")
+    parser.add_argument("--changes", choices=list(CHANGE_TREES),
+                      help="Only document directories changed by the last commit, the release, "
+                           "or with siblings changed by the last commit")
+    parser.add_argument("--export", action="store_true",
+                      help="Also write the .tmp/tree_*.json files of tree_generate_all.sh")
+    parser.add_argument("--incremental", action="store_true",
+                      help="Rescan only directories changed since the last incremental scan")
+    parser.add_argument("--radius", type=int, default=0,
+                      help="Also include sibling directories up to this many levels away")
+    parser.add_argument("--execute", action="store_true",
+                      help="Run the aider command of every directory instead of only displaying it")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                      help=f"Maximum number of aider processes running at once (default: {DEFAULT_JOBS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                      help=f"Seconds allowed per aider attempt (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                      help=f"Extra attempts for failed or timed-out jobs (default: {DEFAULT_RETRIES})")
+    parser.add_argument("--batch-tokens", type=int, default=DEFAULT_BATCH_TOKENS,
+                      help=f"Token budget for packing small directories, 0 to disable (default: {DEFAULT_BATCH_TOKENS})")
+    parser.add_argument("--force", action="store_true",
+                      help="With --execute, also run directories whose inputs are unchanged")
+    parser.add_argument("--benchmark", action="store_true",
+                      help="Time tree_generate_all.sh + pkg.akads against the pipeline")
+    parser.add_argument("--trace",
+                      help="Write a Chrome trace of the stages to this file and print a summary "
+                           "(default: $CODEX_TRACE)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.start_path, args.mode)
+        return
+
+    run(args.start_path, args.mode, args.changes, args.export, args.incremental, args.radius,
+        args.execute, args.jobs, args.timeout, args.retries, args.force, args.batch_tokens, args.trace)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Core implementation of the single-process documentation pipeline.
+
+A documentation run used to chain bin/tree_generate_all.sh (four Python
+processes writing JSON trees to .tmp) and pkg.akads (re-reading those
+trees). This pipeline runs the same steps in one process and hands the
+in-memory structures from one step to the next:
+
+    scan_tree -> get_git_changes (commit, release) -> get_siblings -> akads plans
+
+Writing the .tmp/tree_*.json files is an optional export, with the same
+content as tree_generate_all.sh, for tools that still read them.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from utils.get_git_changes import build_tree, get_git_changes, get_release_range
+from utils.get_run_context import RunContext, get_run_context
+from utils.get_siblings import build_dir_index, get_siblings, iter_tree_files
+from utils.run_jobs import DEFAULT_JOBS, DEFAULT_RETRIES, DEFAULT_TIMEOUT
+from utils.scan_tree import refresh_tree, scan_tree, write_tree
+from utils.trace_span import setup_tracing, traced
+from pkg.akads.batch import DEFAULT_BATCH_TOKENS
+from pkg.akads.generators import Generator, get_generators
+from pkg.akads.run import execute_plans, process_structure, select_changes
+
+# Change trees that --changes can restrict the documented directories to
+CHANGE_TREES = {
+    "commit": "tree_git_changed",
+    "release": "tree_release_all",
+    "siblings": "tree_git_siblings",
+}
+
+@dataclass
+class PipelineResult:
+    """
+    Structures built by one pipeline run.
+
+    Attributes:
+        project (Dict[str, Any]): Project tree (tree_project.json)
+        trees (Dict[str, Dict[str, Any]]): Change and sibling trees by name
+            (e.g. "tree_git_changed"); release trees only in a release
+        plans (List[Dict[str, Any]]): akads directory plans
+        timings (Dict[str, float]): Seconds spent in each step
+    """
+    project: Dict[str, Any] = field(default_factory=dict)
+    trees: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    plans: List[Dict[str, Any]] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+def get_change_trees(changed: List[str], removed: List[str], prefix: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the changed, removed and all-changes trees of a change set.
+
+    Args:
+        changed (List[str]): Changed paths; missing files are skipped
+        removed (List[str]): Removed paths
+        prefix (str): Tree name prefix ("tree_git" or "tree_release")
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Trees by name
+    """
+    return {
+        f"{prefix}_changed": build_tree(changed, require_existing=True),
+        f"{prefix}_removed": build_tree(removed),
+        f"{prefix}_all": build_tree(changed + removed),
+    }
+
+def select_sections(project: Dict[str, Any], generators: Dict[str, Generator]) -> Dict[str, Any]:
+    """
+    Keep the "src" subtree of every section handled by a generator, like
+    load_cached_json does with the generators' key paths.
+
+    Args:
+        project (Dict[str, Any]): Project tree
+        generators (Dict[str, Generator]): Generators by section
+
+    Returns:
+        Dict[str, Any]: Project structure for process_structure
+    """
+    return {
+        section: {"src": project[section]["src"]}
+        for section in generators
+        if isinstance(project.get(section), dict) and "src" in project[section]
+    }
+
+def export_trees(result: PipelineResult, context: RunContext) -> List[str]:
+    """
+    Write the trees to .tmp, as bin/tree_generate_all.sh does.
+
+    Args:
+        result (PipelineResult): Pipeline structures
+        context (RunContext): Run context
+
+    Returns:
+        List[str]: Paths of the written files
+    """
+    paths = [context.tmp("tree_project.json")]
+    write_tree(result.project, paths[0])
+    for name, tree in result.trees.items():
+        paths.append(context.tmp(f"{name}.json"))
+        write_tree(tree, paths[-1])
+    return paths
+
+@traced("pipeline.run_pipeline")
+def run_pipeline(start_path: str = "./", mode: str = "prod", changes: Optional[str] = None,
+                 export: bool = False, incremental: bool = False, radius: int = 0,
+                 context: Optional[RunContext] = None) -> PipelineResult:
+    """
+    Scan the tree, compute git changes and siblings, and plan the akads docs.
+
+    Args:
+        start_path (str): Directory to scan
+        mode (str): Running mode, either "prod" or "dev"
+        changes (Optional[str]): Only plan directories of a change tree
+            ("commit", "release" or "siblings"; default: the whole structure)
+        export (bool): Write the .tmp/tree_*.json files
+        incremental (bool): Rescan only directories changed since the last
+            incremental scan (reads and writes .tmp/tree_project.json)
+        radius (int): Parent/child directory levels of the siblings
+        context (Optional[RunContext]): Run context (resolved when omitted)
+
+    Returns:
+        PipelineResult: In-memory structures and step timings
+    """
+    context = context or get_run_context(mode)
+    result = PipelineResult()
+
+    def step(name: str, started: float) -> float:
+        now = time.perf_counter()
+        result.timings[name] = now - started
+        return now
+
+    started = time.perf_counter()
+    print("🌳 Scanning project tree...")
+    if incremental:
+        result.project = refresh_tree(start_path, context.tmp("tree_project.json"))
+    else:
+        result.project = scan_tree(start_path)
+    now = step("scan", started)
+
+    print("🔍 Computing git changes...")
+    changed, removed = get_git_changes()
+    result.trees.update(get_change_trees(changed, removed, "tree_git"))
+    release_range = get_release_range()
+    if release_range is not None:
+        release_changed, release_removed = get_git_changes(release_range)
+        if release_changed or release_removed:
+            print(f"📦 Release changes: {release_range[0]} -> {release_range[1]}")
+            result.trees.update(get_change_trees(release_changed, release_removed, "tree_release"))
+    now = step("git changes", now)
+
+    result.trees["tree_git_siblings"] = get_siblings(
+        build_dir_index(result.project), iter_tree_files(result.trees["tree_git_changed"]), radius
+    )
+    now = step("siblings", now)
+
+    if export:
+        paths = export_trees(result, context)
+        print(f"💾 Exported {len(paths)} trees to {context.tmp_root}")
+        now = step("export", now)
+
+    generators = get_generators()
+    json_data = select_sections(result.project, generators)
+    if changes:
+        tree_name = CHANGE_TREES[changes]
+        if tree_name not in result.trees:
+            print(f"\n✨ No {changes} changes to document\n")
+            step("plan", now)
+            return result
+        json_data = select_changes(json_data, result.trees[tree_name])
+        if not json_data:
+            print("\n✨ No documented directories affected by the changes\n")
+            step("plan", now)
+            return result
+    # Without React or Sass sections, process_structure prints the hint
+    result.plans = process_structure(json_data, mode, context, generators)
+    step("plan", now)
+    return result
+
+def print_timings(timings: Dict[str, float]) -> None:
+    """
+    Print the time spent in each step and in total.
+
+    Args:
+        timings (Dict[str, float]): Seconds by step
+    """
+    print("\n⏱️  Timings:")
+    for name, seconds in timings.items():
+        print(f"   {name}: {seconds:.3f}s")
+    print(f"   total: {sum(timings.values()):.3f}s")
+
+def benchmark(start_path: str = "./", mode: str = "prod", context: Optional[RunContext] = None) -> None:
+    """
+    Time the shell path (tree_generate_all.sh + pkg.akads reading .tmp)
+    against the pipeline, both end to end in fresh processes.
+
+    Args:
+        start_path (str): Directory to scan
+        mode (str): Running mode, either "prod" or "dev"
+        context (Optional[RunContext]): Run context (resolved when omitted)
+    """
+    context = context or get_run_context(mode)
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(context.base))
+    runs = [
+        ("tree_generate_all.sh + pkg.akads", [
+            [f"{context.bin_path}/tree_generate_all.sh"],
+            [sys.executable, "-m", "pkg.akads", "--mode", mode,
+             "--json-path", context.tmp("tree_project.json")],
+        ]),
+        ("pkg.pipeline", [
+            [sys.executable, "-m", "pkg.pipeline", start_path, "--mode", mode],
+        ]),
+    ]
+
+    times = []
+    with tempfile.TemporaryFile() as log:
+        for name, commands in runs:
+            print(f"⏱️  Running {name}...")
+            started = time.perf_counter()
+            for command in commands:
+                subprocess.run(command, check=True, stdout=log, stderr=log, env=env)
+            times.append(time.perf_counter() - started)
+
+    print()
+    for (name, _), seconds in zip(runs, times):
+        print(f"📊 {name}: {seconds:.3f}s")
+    if times[1] > 0:
+        print(f"📊 Speedup: {times[0] / times[1]:.1f}x")
+
+def run(start_path: str = "./", mode: str = "prod", changes: Optional[str] = None,
+        export: bool = False, incremental: bool = False, radius: int = 0, execute: bool = False,
+        jobs: int = DEFAULT_JOBS, timeout: Optional[float] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES, force: bool = False,
+        batch_tokens: int = DEFAULT_BATCH_TOKENS, trace: Optional[str] = None) -> PipelineResult:
+    """
+    Runs the documentation pipeline in a single process.
+
+    Args:
+        start_path (str): Directory to scan (default: "./")
+        mode (str): Running mode, either "prod" or "dev" (default: "prod")
+        changes (Optional[str]): Only document directories of a change tree
+            ("commit", "release" or "siblings")
+        export (bool): Also write the .tmp/tree_*.json files
+        incremental (bool): Rescan only directories changed since the last
+            incremental scan
+        radius (int): Parent/child directory levels of the siblings
+        execute (bool): Run the aider jobs of the plans
+        jobs (int): Maximum number of aider processes running at once
+        timeout (Optional[float]): Seconds allowed per aider attempt
+        retries (int): Extra attempts for failed or timed-out jobs
+        force (bool): Run every plan, even if its inputs are unchanged
+        batch_tokens (int): Token budget for packing small directories
+        trace (Optional[str]): Write a Chrome trace of the stages to this
+            file (default: $CODEX_TRACE; no trace when unset)
+
+    Returns:
+        PipelineResult: In-memory structures and step timings
+    """
+    setup_tracing(trace)
+    print(f"\n🚀 Starting documentation pipeline in {mode} mode...\n")
+    context = get_run_context(mode)
+    print(f"📍 Base path: {context.base}")
+
+    try:
+        result = run_pipeline(start_path, mode, changes, export, incremental, radius, context)
+    except NotADirectoryError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if execute:
+        started = time.perf_counter()
+        succeeded = execute_plans(result.plans, context, jobs, timeout, retries, force, batch_tokens)
+        result.timings["execute"] = time.perf_counter() - started
+        if not succeeded:
+            print_timings(result.timings)
+            sys.exit(1)
+
+    print_timings(result.timings)
+    print("\n✨ Documentation pipeline complete!\n")
+    return result
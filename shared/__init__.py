@@ -7,12 +7,16 @@ Available modules:
 
 # Import specific functions to expose at package level
 from .require_aider import (
+    get_installed_version,
     is_package_installed,
     install_aider,
+    require_aider,
 )
 
 # Define what should be available when using 'from shared import *'
 __all__ = [
+    'get_installed_version',
     'is_package_installed',
     'install_aider',
+    'require_aider',
 ]
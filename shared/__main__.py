@@ -49,6 +49,8 @@ def main():
         # Import and run the module
         module = import_module(f'.{module_name}', package='shared')
         if hasattr(module, 'main'):
+            # The module parses its own options
+            sys.argv = sys.argv[:1]
             module.main()
         else:
             print(f"❌ Error: Module '{module_name}' has no main() function")
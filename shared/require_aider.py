@@ -1,53 +1,180 @@
 """
 Aider requirement checker and installer.
 
-This script checks if aider-chat is installed in the current virtual environment
-and installs version 0.60.0 if it's not present.
+This script checks if aider-chat 0.60.0 is installed in the current virtual
+environment and installs it if it's not present.
+
+The check reads the installed package metadata in-process (importlib.metadata)
+instead of running `pip show`, so it takes milliseconds. Installs use a
+local wheelhouse only when $AIDER_WHEELHOUSE is set or .cache/wheelhouse
+already holds the aider-chat wheel: pip then installs from it without the
+network. Otherwise aider-chat is installed from the index in a single pip
+run. Filling the wheelhouse (e.g. for a CI cache) is a separate step.
 
 Usage:
     python -m shared.require_aider
+
+    # Fill the wheelhouse without installing
+    python -m shared.require_aider --fill-wheelhouse
 """
 
+import argparse
+import glob
+import os
 import subprocess
 import sys
+from importlib import metadata
+from typing import Optional
+from utils.trace_span import traced
+
+AIDER_PACKAGE = "aider-chat"
+AIDER_VERSION = "0.60.0"
+DEFAULT_WHEELHOUSE = ".cache/wheelhouse"
+
+def get_installed_version(package_name: str) -> Optional[str]:
+    """
+    Get the installed version of a package from its metadata.
+
+    Args:
+        package_name (str): Name of the package to check
+
+    Returns:
+        Optional[str]: Installed version, or None if not installed
+    """
+    try:
+        return metadata.version(package_name)
+    except metadata.PackageNotFoundError:
+        return None
 
-def is_package_installed(package_name: str) -> bool:
+def is_package_installed(package_name: str, version: Optional[str] = None) -> bool:
     """
     Check if a package is installed in the current environment.
 
     Args:
         package_name (str): Name of the package to check
+        version (Optional[str]): Exact version required (any version if None)
 
     Returns:
         bool: True if package is installed, False otherwise
     """
-    try:
-        subprocess.check_output([sys.executable, "-m", "pip", "show", package_name])
-        return True
-    except subprocess.CalledProcessError:
-        return False
+    installed = get_installed_version(package_name)
+    return installed is not None and (version is None or installed == version)
+
+def get_wheelhouse_dir() -> Optional[str]:
+    """
+    Get the wheelhouse to install from.
+
+    Returns:
+        Optional[str]: $AIDER_WHEELHOUSE if set, else .cache/wheelhouse if it
+            already holds the aider-chat wheel, else None (use the index)
+    """
+    wheelhouse = os.environ.get("AIDER_WHEELHOUSE")
+    if wheelhouse:
+        return wheelhouse
+    return DEFAULT_WHEELHOUSE if has_aider_wheel(DEFAULT_WHEELHOUSE) else None
+
+def has_aider_wheel(wheelhouse: str) -> bool:
+    """
+    Check if a wheelhouse holds the pinned aider-chat wheel.
+
+    Args:
+        wheelhouse (str): Wheelhouse directory
 
-def install_aider():
+    Returns:
+        bool: True if the wheel is present
+    """
+    name = AIDER_PACKAGE.replace("-", "_")
+    return bool(glob.glob(os.path.join(wheelhouse, f"{name}-{AIDER_VERSION}-*.whl")))
+
+def fill_wheelhouse(wheelhouse: str) -> None:
+    """
+    Download aider-chat 0.60.0 and its dependencies as wheels.
+
+    Args:
+        wheelhouse (str): Wheelhouse directory
+
+    Raises:
+        subprocess.CalledProcessError: If pip fails
+    """
+    os.makedirs(wheelhouse, exist_ok=True)
+    subprocess.check_call([sys.executable, "-m", "pip", "wheel", "--quiet",
+                           "--wheel-dir", wheelhouse, f"{AIDER_PACKAGE}=={AIDER_VERSION}"])
+
+@traced("shared.install_aider")
+def install_aider(wheelhouse: Optional[str] = None):
     """
     Install aider-chat version 0.60.0 using pip.
+
+    When the wheelhouse holds the aider-chat wheel, the install is offline;
+    if it fails, or the wheel is not there, the package is installed from
+    the index. The wheelhouse is never filled here (see fill_wheelhouse).
+
+    Args:
+        wheelhouse (Optional[str]): Wheelhouse directory (None: use the index)
     """
+    requirement = f"{AIDER_PACKAGE}=={AIDER_VERSION}"
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "aider-chat==0.60.0"])
-        print("✅ Successfully installed aider-chat 0.60.0")
+        if wheelhouse and has_aider_wheel(wheelhouse):
+            try:
+                print(f"📂 Installing from wheelhouse: {wheelhouse}")
+                subprocess.check_call([sys.executable, "-m", "pip", "install", "--quiet",
+                                       "--no-index", "--find-links", wheelhouse, requirement])
+                print(f"✅ Successfully installed {AIDER_PACKAGE} {AIDER_VERSION}")
+                return
+            except subprocess.CalledProcessError as e:
+                print(f"⚠️  Wheelhouse install failed ({e}), installing from the index")
+        elif wheelhouse:
+            print(f"⚠️  No {AIDER_PACKAGE} {AIDER_VERSION} wheel in {wheelhouse}, installing from the index")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", requirement])
+        print(f"✅ Successfully installed {AIDER_PACKAGE} {AIDER_VERSION}")
     except subprocess.CalledProcessError as e:
-        print(f"❌ Error installing aider-chat: {e}")
+        print(f"❌ Error installing {AIDER_PACKAGE}: {e}")
         sys.exit(1)
 
+@traced("shared.require_aider")
+def require_aider(wheelhouse: Optional[str] = None) -> None:
+    """
+    Install aider-chat 0.60.0 unless that exact version is already installed.
+
+    Args:
+        wheelhouse (Optional[str]): Wheelhouse directory (default: see
+            get_wheelhouse_dir)
+    """
+    installed = get_installed_version(AIDER_PACKAGE)
+    if installed == AIDER_VERSION:
+        print(f"✅ {AIDER_PACKAGE} {AIDER_VERSION} is already installed")
+        return
+
+    if installed is None:
+        print(f"📦 Installing {AIDER_PACKAGE} {AIDER_VERSION}...")
+    else:
+        print(f"📦 Replacing {AIDER_PACKAGE} {installed} with {AIDER_VERSION}...")
+    install_aider(wheelhouse or get_wheelhouse_dir())
+
 def main():
     """
     Main function to check and install aider-chat if needed.
     Called when running as a module: python -m shared.require_aider
     """
-    if is_package_installed("aider-chat"):
-        print("✅ aider-chat is already installed")
-    else:
-        print("📦 Installing aider-chat 0.60.0...")
-        install_aider()
+    parser = argparse.ArgumentParser(description=f"Install {AIDER_PACKAGE} {AIDER_VERSION} if needed")
+    parser.add_argument("--wheelhouse",
+                      help=f"Local wheel cache (default: $AIDER_WHEELHOUSE, or {DEFAULT_WHEELHOUSE} "
+                           "if it holds the wheel)")
+    parser.add_argument("--fill-wheelhouse", action="store_true",
+                      help="Only download the wheels to the wheelhouse")
+    args = parser.parse_args()
+
+    if args.fill_wheelhouse:
+        wheelhouse = args.wheelhouse or os.environ.get("AIDER_WHEELHOUSE") or DEFAULT_WHEELHOUSE
+        try:
+            fill_wheelhouse(wheelhouse)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Error downloading {AIDER_PACKAGE}: {e}")
+            sys.exit(1)
+        print(f"✅ Wheels saved to {wheelhouse}")
+        return
+
+    require_aider(args.wheelhouse)
 
 if __name__ == "__main__":
     main()
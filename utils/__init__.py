@@ -4,12 +4,15 @@ Utility functions for the codex project.
 
 from .get_base_path import get_base_path
 from .load_json import load_json
-from .load_template import load_template
+from .load_template import load_template, render_template
 from .get_token_count import get_token_count
+from .get_sort_key import get_sort_key
 
 __all__ = [
     'get_base_path',
     'load_json',
     'load_template',
-    'get_token_count'
+    'render_template',
+    'get_token_count',
+    'get_sort_key'
 ]
@@ -6,8 +6,14 @@ Usage:
     
 Available modules:
     - get_base_path: Path resolution for dev/prod modes
+    - get_run_context: Run context resolved once per run
     - load_json: JSON file loading and parsing
+    - load_cached_json: JSON loading through a binary snapshot cache
     - load_template: Template processing
+    - get_token_count: Token estimates of files
+    - scan_tree: Project tree scanning
+    - get_git_changes: Git change trees
+    - get_siblings: Sibling files of changed files
 """
 
 import sys
@@ -15,8 +21,14 @@ from importlib import import_module
 
 AVAILABLE_MODULES = {
     'get_base_path': 'Path resolution for dev/prod modes',
+    'get_run_context': 'Run context resolved once per run',
     'load_json': 'JSON file loading and parsing',
-    'load_template': 'Template processing'
+    'load_cached_json': 'JSON loading through a binary snapshot cache',
+    'load_template': 'Template processing',
+    'get_token_count': 'Token estimates of files',
+    'scan_tree': 'Project tree scanning',
+    'get_git_changes': 'Git change trees',
+    'get_siblings': 'Sibling files of changed files'
 }
 
 def print_usage():
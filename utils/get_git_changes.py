@@ -0,0 +1,235 @@
+"""
+Git change-set builder.
+
+This module builds the changed/removed/all JSON trees produced by
+bin/tree_git_changes.sh and bin/tree_git_release_changes.sh. It runs a
+single NUL-separated `git diff-tree` (last commit) or `git diff` (release
+range) call and builds the three nested trees in one pass, instead of one
+jq process per changed file.
+
+Example usage:
+    from utils.get_git_changes import get_git_changes, build_tree
+
+    changed, removed = get_git_changes()
+    tree = build_tree(changed)
+
+Command-line usage:
+    # Last commit (.tmp/tree_git_changed.json, _removed.json, _all.json)
+    python -m utils.get_git_changes
+
+    # Between the current and previous release (.tmp/tree_release_*.json)
+    python -m utils.get_git_changes --release
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from utils.get_sort_key import get_sort_key
+from utils.scan_tree import write_tree
+
+DEFAULT_OUTPUTS = (
+    ".tmp/tree_git_changed.json",
+    ".tmp/tree_git_removed.json",
+    ".tmp/tree_git_all.json",
+)
+
+RELEASE_OUTPUTS = (
+    ".tmp/tree_release_changed.json",
+    ".tmp/tree_release_removed.json",
+    ".tmp/tree_release_all.json",
+)
+
+def _git(*args: str) -> Optional[bytes]:
+    """
+    Run a git command and return its stdout, or None if it fails.
+    """
+    try:
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_name_status(output: bytes) -> Tuple[List[str], List[str]]:
+    """
+    Parse NUL-separated `--name-status -z` output into changed and removed paths.
+
+    Renamed and copied entries count as changed under their new path, like
+    in the shell scripts; deleted entries ("D") are removed.
+
+    Args:
+        output (bytes): Raw output of git diff-tree/diff with -z --name-status
+
+    Returns:
+        Tuple[List[str], List[str]]: Changed paths and removed paths
+    """
+    fields = output.split(b"\0")
+    changed = []
+    removed = []
+    index = 0
+    while index < len(fields):
+        status = fields[index].decode("ascii", "replace")
+        index += 1
+        if not status:
+            continue
+        count = 2 if status[0] in "RC" and (len(status) == 1 or status[1:].isdigit()) else 1
+        paths = fields[index:index + count]
+        index += count
+        if not paths or not paths[-1]:
+            continue
+
+        if status == "D":
+            removed.append(paths[0].decode("utf-8", "surrogateescape"))
+        else:
+            changed.append(paths[-1].decode("utf-8", "surrogateescape"))
+    return changed, removed
+
+def get_release_range() -> Optional[Tuple[str, str]]:
+    """
+    Get the previous and current release references.
+
+    The previous reference is the tag before the current one, or the first
+    commit of the repository for the first release.
+
+    Returns:
+        Optional[Tuple[str, str]]: (previous, current), or None when the
+            repository has no tags
+    """
+    current = _git("describe", "--tags", "--abbrev=0")
+    if current is None:
+        return None
+    current_tag = current.decode().strip()
+
+    previous = _git("describe", "--tags", "--abbrev=0", f"{current_tag}^")
+    if previous is not None:
+        return previous.decode().strip(), current_tag
+
+    first_commit = (_git("rev-list", "--max-parents=0", "HEAD") or b"").decode().split()
+    print(f"Notice: This is the first release ({current_tag}). Will compare with first commit.")
+    return (first_commit[0] if first_commit else ""), current_tag
+
+def get_git_changes(release_range: Optional[Tuple[str, str]] = None) -> Tuple[List[str], List[str]]:
+    """
+    Get the changed and removed paths of the last commit or a release range.
+
+    Args:
+        release_range (Optional[Tuple[str, str]]): (previous, current)
+            references to diff; the last commit is used when omitted
+
+    Returns:
+        Tuple[List[str], List[str]]: Changed paths and removed paths (empty
+            if git fails)
+    """
+    if release_range is None:
+        output = _git("diff-tree", "-r", "-z", "--name-status", "--no-commit-id",
+                      "-M", "--cc", "--root", "HEAD")
+    else:
+        previous, current = release_range
+        output = _git("diff", "-z", "--name-status", f"{previous}..{current}")
+    return parse_name_status(output or b"")
+
+def build_tree(paths: Iterable[str], require_existing: bool = False) -> Dict[str, Any]:
+    """
+    Build a nested directory structure from a list of file paths.
+
+    Paths are de-duplicated and visited in `sort -u` order, which fixes the
+    order of the object keys; every "files" list is then sorted by code
+    point, matching the jq program of the shell scripts.
+
+    Args:
+        paths (Iterable[str]): Repository-relative file paths
+        require_existing (bool): Skip paths that are not existing files
+
+    Returns:
+        Dict[str, Any]: Nested structure with "files" lists
+    """
+    tree: Dict[str, Any] = {}
+    for path in sorted(set(paths), key=get_sort_key()):
+        if not path or (require_existing and not os.path.isfile(path)):
+            continue
+
+        *parts, name = path.split("/")
+        node = tree
+        for part in parts:
+            node = node.setdefault(part, {})
+        node.setdefault("files", []).append(name)
+
+    def sort_files(node: Dict[str, Any]) -> None:
+        for key, value in node.items():
+            if isinstance(value, list):
+                value.sort()
+            else:
+                sort_files(value)
+
+    sort_files(tree)
+    return tree
+
+def write_git_changes(changed: List[str], removed: List[str], outputs: Tuple[str, str, str]) -> None:
+    """
+    Write the changed, removed and all-changes trees.
+
+    Args:
+        changed (List[str]): Changed paths; missing files are skipped
+        removed (List[str]): Removed paths
+        outputs (Tuple[str, str, str]): Changed, removed and all output paths
+    """
+    output_changed, output_removed, output_all = outputs
+    write_tree(build_tree(changed, require_existing=True), output_changed)
+    write_tree(build_tree(removed), output_removed)
+    write_tree(build_tree(changed + removed), output_all)
+
+def main():
+    """
+    Main function to generate the git change trees.
+    Called when running as a module: python -m utils.get_git_changes
+    """
+    parser = argparse.ArgumentParser(description="Generate JSON trees of git changes")
+    parser.add_argument("--release", action="store_true",
+                      help="Compare the current release with the previous one instead of the last commit")
+    parser.add_argument("outputs", nargs="*",
+                      help="Changed, removed and all-changes output paths")
+    args = parser.parse_args()
+
+    defaults = RELEASE_OUTPUTS if args.release else DEFAULT_OUTPUTS
+    outputs = tuple(args.outputs) + defaults[len(args.outputs):]
+    if len(outputs) != 3:
+        print("❌ Error: At most three output paths are accepted")
+        sys.exit(1)
+
+    if not args.release:
+        changed, removed = get_git_changes()
+        write_git_changes(changed, removed, outputs)
+        print("Git changes saved to:")
+    else:
+        if _git("rev-parse", "--is-inside-work-tree") is None:
+            print("Notice: Not in a git repository. Skipping release tree generation.")
+            return
+
+        release_range = get_release_range()
+        if release_range is None:
+            print("Notice: No tags/releases found in the repository. Skipping release tree generation.")
+            print("To track release changes, create a release using:")
+            print("  git tag v1.0.0 (or desired version)")
+            print("  git push origin v1.0.0")
+            return
+
+        previous, current = release_range
+        print(f"Analyzing changes between releases: {previous} -> {current}")
+        changed, removed = get_git_changes(release_range)
+        if not changed and not removed:
+            print("Notice: No changes found between releases. Skipping tree generation.")
+            return
+
+        write_git_changes(changed, removed, outputs)
+        print("Release changes saved to:")
+
+    print(f"  - Changed files: {outputs[0]}")
+    print(f"  - Removed files: {outputs[1]}")
+    print(f"  - All changes: {outputs[2]}")
+
+if __name__ == "__main__":
+    main()
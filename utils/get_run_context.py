@@ -0,0 +1,112 @@
+"""
+Run context utility shared by the pipeline entry points.
+
+This module resolves the execution environment once per run and keeps the
+result in a RunContext: the base path (see utils.get_base_path), the running
+mode, the prompt files and the output roots. Entry points create the context
+once and pass it down, so directory walkers never re-detect the environment.
+
+Example usage:
+    from utils.get_run_context import get_run_context
+
+    context = get_run_context(mode="dev")
+    print(context.base)             # "." or ".codex"
+    print(context.prompt("react"))  # "./pkg/akads/prompts/react.md"
+    print(context.tmp("git_log_simple.txt"))  # ".tmp/git_log_simple.txt"
+"""
+
+import os
+from dataclasses import dataclass
+from utils.get_base_path import get_base_path
+
+@dataclass(frozen=True)
+class RunContext:
+    """
+    Environment of a single pipeline run.
+
+    Attributes:
+        base (str): Base path of the codex files ("." or ".codex")
+        mode (str): Running mode, either "prod" or "dev"
+        tmp_root (str): Directory of generated trees and logs
+        docs_root (str): Directory of generated documentation
+    """
+    base: str
+    mode: str = "prod"
+    tmp_root: str = ".tmp"
+    docs_root: str = "docs"
+
+    @property
+    def bin_path(self) -> str:
+        """Directory of the bin/ shell scripts."""
+        return f"{self.base}/bin"
+
+    @property
+    def changelog_prompt(self) -> str:
+        """Prompt file of the changelog generator."""
+        return f"{self.base}/pkg/changelog/prompt.md"
+
+    @property
+    def changelog_map_prompt(self) -> str:
+        """Prompt file of the changelog chunk summaries (map-reduce mode)."""
+        return f"{self.base}/pkg/changelog/map_prompt.md"
+
+    def prompt(self, name: str) -> str:
+        """
+        Get the path of a documentation prompt.
+
+        Args:
+            name (str): Prompt name (e.g. "react", "sass")
+
+        Returns:
+            str: Path of pkg/akads/prompts/<name>.md under the base path
+        """
+        return f"{self.base}/pkg/akads/prompts/{name}.md"
+
+    def tmp(self, *parts: str) -> str:
+        """
+        Get a path under the temporary output root.
+
+        Args:
+            *parts (str): Path components below tmp_root
+
+        Returns:
+            str: Joined path
+        """
+        return os.path.join(self.tmp_root, *parts)
+
+    def docs(self, *parts: str) -> str:
+        """
+        Get a path under the documentation output root, skipping empty parts.
+
+        Args:
+            *parts (str): Path components below docs_root
+
+        Returns:
+            str: Joined path
+        """
+        return "/".join([self.docs_root, *(part for part in parts if part)])
+
+def get_run_context(mode: str = "prod") -> RunContext:
+    """
+    Resolve the environment once and create the run context.
+
+    Args:
+        mode (str): Running mode, either "prod" or "dev" (default: "prod")
+
+    Returns:
+        RunContext: Context to pass down through the run
+    """
+    return RunContext(base=get_base_path(), mode=mode)
+
+def main():
+    """
+    Main function to display the resolved run context.
+    Called when running as a module: python -m utils.get_run_context
+    """
+    context = get_run_context()
+    print(f"📍 Base path: {context.base}")
+    print(f"📂 Outputs: {context.tmp_root}, {context.docs_root}")
+    print(f"📝 Prompts: {context.prompt('react')}, {context.prompt('sass')}, {context.changelog_prompt}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Sibling file resolver.
+
+This module builds the sibling files structure (.tmp/tree_git_siblings.json):
+every file in the same directory as a changed file. The project tree is
+indexed by directory path once, so siblings of any number of changed paths
+are resolved at any depth without re-reading the tree, replacing the
+hardcoded root/bin/pkg.changelog branches of bin/tree_git_siblings.sh.
+
+Example usage:
+    from utils.get_siblings import build_dir_index, get_siblings
+
+    index = build_dir_index(project_tree)
+    siblings = get_siblings(index, ["pkg/akads/run.py", "README.md"])
+
+Command-line usage:
+    python -m utils.get_siblings
+    python -m utils.get_siblings --radius 1
+"""
+
+import argparse
+import posixpath
+import sys
+from typing import Any, Dict, Iterable, Iterator, Set
+from utils.load_json import load_json
+from utils.scan_tree import write_tree
+
+def iter_tree_files(tree: Dict[str, Any], prefix: str = "") -> Iterator[str]:
+    """
+    Iterate over the file paths stored in a nested tree structure.
+
+    Args:
+        tree (Dict[str, Any]): Nested structure with "files" lists
+        prefix (str): Path of the tree root
+
+    Yields:
+        str: File paths relative to the tree root
+    """
+    for key, value in tree.items():
+        if key == "files" and isinstance(value, list):
+            for name in value:
+                yield f"{prefix}/{name}" if prefix else name
+        elif isinstance(value, dict):
+            yield from iter_tree_files(value, f"{prefix}/{key}" if prefix else key)
+
+def build_dir_index(tree: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index every directory of a project tree by its path.
+
+    Args:
+        tree (Dict[str, Any]): Project structure (tree_project.json)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Directory path ("" for the root) to its node
+    """
+    index = {}
+    stack = [("", tree)]
+    while stack:
+        path, node = stack.pop()
+        index[path] = node
+        for key, value in node.items():
+            if isinstance(value, dict):
+                stack.append((f"{path}/{key}" if path else key, value))
+    return index
+
+def select_directories(index: Dict[str, Dict[str, Any]], paths: Iterable[str], radius: int = 0) -> Set[str]:
+    """
+    Select the directories whose files are siblings of the given paths.
+
+    Args:
+        index (Dict[str, Dict[str, Any]]): Directory index from build_dir_index
+        paths (Iterable[str]): Changed file paths
+        radius (int): Also select parent and child directories up to this
+            many levels away (default: 0, only the containing directory)
+
+    Returns:
+        Set[str]: Selected directory paths present in the project tree
+    """
+    selected = set()
+    visited = set()
+    for path in paths:
+        directory = posixpath.dirname(path)
+        if directory in visited or directory not in index:
+            continue
+        visited.add(directory)
+        selected.add(directory)
+
+        parent = directory
+        for _ in range(radius):
+            if not parent:
+                break
+            parent = posixpath.dirname(parent)
+            selected.add(parent)
+
+        level = [directory]
+        for _ in range(radius):
+            level = [
+                f"{current}/{key}" if current else key
+                for current in level
+                for key, value in index[current].items()
+                if isinstance(value, dict)
+            ]
+            selected.update(level)
+    return selected
+
+def get_siblings(index: Dict[str, Dict[str, Any]], paths: Iterable[str], radius: int = 0,
+                 sort_files: bool = True) -> Dict[str, Any]:
+    """
+    Build the sibling files structure for a set of changed paths.
+
+    Only directories with files are included; their "files" lists are
+    sorted like the jq output of bin/tree_git_siblings.sh. Paths outside
+    the project tree (e.g. excluded folders) are ignored.
+
+    Args:
+        index (Dict[str, Dict[str, Any]]): Directory index from build_dir_index
+        paths (Iterable[str]): Changed file paths
+        radius (int): Parent/child directory levels to include (default: 0)
+        sort_files (bool): Sort the "files" lists instead of keeping the
+            project tree order (default: True)
+
+    Returns:
+        Dict[str, Any]: Nested structure in project tree order
+    """
+    selected = select_directories(index, paths, radius)
+    needed = set()
+    for directory in selected:
+        while directory not in needed:
+            needed.add(directory)
+            if not directory:
+                break
+            directory = posixpath.dirname(directory)
+
+    def build(path: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for key, value in index[path].items():
+            child = f"{path}/{key}" if path else key
+            if isinstance(value, dict):
+                if child in needed:
+                    subtree = build(child)
+                    if subtree:
+                        result[key] = subtree
+            elif key == "files" and value and path in selected:
+                result[key] = sorted(value) if sort_files else value
+        return result
+
+    return build("") if needed else {}
+
+def main():
+    """
+    Main function to generate the sibling files structure.
+    Called when running as a module: python -m utils.get_siblings
+    """
+    parser = argparse.ArgumentParser(description="Generate JSON structure of sibling files of changed files")
+    parser.add_argument("--changed", default=".tmp/tree_git_changed.json",
+                      help="JSON tree of changed files")
+    parser.add_argument("--project", default=".tmp/tree_project.json",
+                      help="JSON tree of the complete project")
+    parser.add_argument("--output", default=".tmp/tree_git_siblings.json",
+                      help="Path of the JSON file to write")
+    parser.add_argument("--radius", type=int, default=0,
+                      help="Also include parent/child directories up to this many levels away")
+    args = parser.parse_args()
+
+    try:
+        changed = load_json(args.changed)
+        project = load_json(args.project)
+    except Exception:
+        print("Error: Required input files not found.")
+        print("Make sure both exist:")
+        print(f"  - {args.changed} (run utils.get_git_changes first)")
+        print(f"  - {args.project} (run utils.scan_tree first)")
+        sys.exit(1)
+
+    siblings = get_siblings(build_dir_index(project), iter_tree_files(changed), args.radius)
+    write_tree(siblings, args.output)
+    print(f"Sibling files structure saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
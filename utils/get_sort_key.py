@@ -0,0 +1,44 @@
+"""
+Sort key utility matching the ordering of the shell tools.
+
+The bin/ scripts order paths with coreutils `sort`, which collates according
+to the caller's locale (LC_ALL / LC_COLLATE / LANG). This module provides a
+key function that reproduces that ordering from Python, so JSON generated
+in-process is byte-identical to the output of the scripts.
+
+Example usage:
+    from utils.get_sort_key import get_sort_key
+
+    sort_key = get_sort_key()
+    paths = sorted(paths, key=sort_key)
+"""
+
+import locale
+from typing import Callable, Tuple
+
+def get_sort_key() -> Callable[[str], Tuple[str, bytes]]:
+    """
+    Get a key function that orders strings like coreutils `sort`.
+
+    The collation locale is taken from the environment, exactly as `sort`
+    does. Strings that collate equally are ordered by their bytes, which is
+    the last-resort comparison `sort` applies.
+
+    Returns:
+        Callable[[str], Tuple[str, bytes]]: Key function for sorted()
+
+    Example:
+        >>> sorted(["b", "A", "a"], key=get_sort_key())  # LC_ALL=C
+        ['A', 'a', 'b']
+    """
+    try:
+        locale.setlocale(locale.LC_COLLATE, "")
+    except locale.Error:
+        locale.setlocale(locale.LC_COLLATE, "C")
+
+    strxfrm = locale.strxfrm
+
+    def sort_key(value: str) -> Tuple[str, bytes]:
+        return strxfrm(value), value.encode("utf-8", "surrogateescape")
+
+    return sort_key
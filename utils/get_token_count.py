@@ -3,33 +3,222 @@ Token count utility.
 
 This module provides functionality to count tokens in a file,
 where tokens are calculated as characters divided by 4.
+
+Files are read in fixed-size chunks and characters are counted in-process
+exactly like `wc -m`: UTF-8 characters under a UTF-8 locale (invalid bytes
+are not counted), bytes otherwise. Results are cached by path, size and mtime, and
+many files can be counted concurrently.
+
+The chars/4 rule is the default estimator; other estimators (e.g. an
+offline tokenizer) can be registered with register_estimator.
+
+Example usage:
+    from utils.get_token_count import get_token_count, get_token_counts
+
+    tokens = get_token_count(".tmp/git_log_detailed.txt")
+    counts = get_token_counts([".tmp/git_log_detailed.txt", ".tmp/git_log_simple.txt"])
+
+    # Custom estimator: receives the text of the file in chunks
+    register_estimator("words", lambda chunks: sum(len(chunk.split()) for chunk in chunks))
+    words = get_token_count("README.md", estimator="words")
+
+    # Content that is not a file, streamed in binary chunks
+    tokens = get_stream_token_count(store.iter_log("git_release_detailed.txt"))
 """
 
-import subprocess
+import codecs
+import locale
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.trace_span import traced
+
+CHUNK_SIZE = 1 << 20
+
+# An estimator turns the text of a file, given in chunks, into a token count
+Estimator = Callable[[Iterable[str]], int]
+
+def estimate_chars(chunks: Iterable[str]) -> int:
+    """
+    Default estimator: character count divided by 4.
+
+    Args:
+        chunks (Iterable[str]): Text of the file
+
+    Returns:
+        int: Estimated token count
+    """
+    return sum(len(chunk) for chunk in chunks) // 4
+
+ESTIMATORS: Dict[str, Estimator] = {
+    "chars": estimate_chars
+}
+
+_cache: Dict[Tuple[str, str, int, int], int] = {}
+_cache_lock = threading.Lock()
+
+def register_estimator(name: str, estimator: Estimator) -> None:
+    """
+    Register a token estimator usable by name in get_token_count.
+
+    Args:
+        name (str): Estimator name
+        estimator (Estimator): Callable receiving the file text in chunks
+            and returning a token count
+    """
+    ESTIMATORS[name] = estimator
+    with _cache_lock:
+        for key in [key for key in _cache if key[1] == name]:
+            del _cache[key]
+
+def _get_encoding() -> str:
+    """
+    Get the encoding `wc -m` counts characters in for the current locale.
+    """
+    codeset = locale.nl_langinfo(locale.CODESET) if hasattr(locale, "nl_langinfo") else ""
+    return "utf-8" if codeset.replace("-", "").upper() == "UTF8" else "latin-1"
+
+# Smallest code point of 4, 5 and 6-byte sequences (non-overlong forms)
+_EXTENDED_MINIMUM = {4: 0x10000, 5: 0x200000, 6: 0x4000000}
+
+def _count_like_wc(exc: UnicodeDecodeError) -> Tuple[str, int]:
+    """
+    Decoding error handler matching the character count of `wc -m`.
+
+    glibc also accepts the original 4 to 6-byte UTF-8 forms of code points
+    above U+10FFFF, so those count as one character; any other invalid
+    bytes are dropped, as wc does not count them.
+    """
+    data, start = exc.object, exc.start
+    lead = data[start]
+    length = 4 if 0xF0 <= lead < 0xF8 else 5 if 0xF8 <= lead < 0xFC else 6 if 0xFC <= lead < 0xFE else 0
+    if length and start + length <= len(data):
+        code_point = lead & (0x7F >> length)
+        for byte in data[start + 1:start + length]:
+            if not 0x80 <= byte < 0xC0:
+                break
+            code_point = code_point << 6 | (byte & 0x3F)
+        else:
+            if code_point > 0x10FFFF and code_point >= _EXTENDED_MINIMUM[length]:
+                return "\ufffd", start + length
+    return "", exc.end
+
+codecs.register_error("count_like_wc", _count_like_wc)
+
+def _split_incomplete(data: bytes) -> Tuple[bytes, bytes]:
+    """
+    Split a trailing incomplete multi-byte sequence off a chunk.
+    """
+    for index in range(len(data) - 1, max(len(data) - 6, -1), -1):
+        byte = data[index]
+        if byte < 0x80:
+            break
+        if byte >= 0xC0:
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4 if byte < 0xF8 else 5 if byte < 0xFC else 6
+            if len(data) - index < needed:
+                return data[:index], data[index:]
+            break
+    return data, b""
+
+def _iter_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """
+    Decode binary chunks, counting characters like wc.
+    """
+    pending = b""
+    for chunk in chunks:
+        data, pending = _split_incomplete(pending + chunk)
+        yield data.decode(encoding, errors="count_like_wc")
+    yield pending.decode(encoding, errors="count_like_wc")
+
+def count_chars(data: bytes) -> int:
+    """
+    Count the characters of some bytes like `wc -m` in the current locale.
+
+    Args:
+        data (bytes): Content to count
+
+    Returns:
+        int: Character count
+    """
+    return len(data.decode(_get_encoding(), errors="count_like_wc"))
+
+def get_stream_token_count(chunks: Iterable[bytes], estimator: str = "chars") -> int:
+    """
+    Get the token count of content streamed in binary chunks (not cached).
+
+    Args:
+        chunks (Iterable[bytes]): Content, e.g. a log rendered from a store
+        estimator (str): Name of the registered estimator (default: "chars")
+
+    Returns:
+        int: Number of tokens in the content
+    """
+    return ESTIMATORS[estimator](_iter_chunks(chunks, _get_encoding()))
 
-def get_token_count(file_path: str) -> int:
+@traced("utils.get_token_count")
+def get_token_count(file_path: str, estimator: str = "chars") -> int:
     """
     Get the token count of a file (character count divided by 4).
-    
+
     Args:
         file_path (str): Path to the file to count tokens
-    
+        estimator (str): Name of the registered estimator (default: "chars")
+
     Returns:
-        int: Number of tokens in the file (char count / 4)
-    
+        int: Number of tokens in the file (char count / 4), or 0 if the
+            file cannot be read
+
     Example:
         >>> get_token_count("file.txt")
         1000  # if file has 4000 characters
     """
     try:
-        result = subprocess.run(
-            f"wc -m < {file_path}",
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        char_count = int(result.stdout.strip())
-        return char_count // 4
-    except (subprocess.CalledProcessError, ValueError):
+        with open(file_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            key = (os.path.realpath(file_path), estimator, st.st_size, st.st_mtime_ns)
+            with _cache_lock:
+                if key in _cache:
+                    return _cache[key]
+
+            count = ESTIMATORS[estimator](_iter_chunks(iter(lambda: f.read(CHUNK_SIZE), b""), _get_encoding()))
+    except OSError:
         return 0
+
+    with _cache_lock:
+        _cache[key] = count
+    return count
+
+def get_token_counts(file_paths: List[str], estimator: str = "chars",
+                     workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Get the token counts of many files concurrently.
+
+    Args:
+        file_paths (List[str]): Paths of the files to count tokens
+        estimator (str): Name of the registered estimator (default: "chars")
+        workers (Optional[int]): Number of counting threads
+
+    Returns:
+        Dict[str, int]: Path to token count
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        counts = executor.map(lambda path: get_token_count(path, estimator), file_paths)
+        return dict(zip(file_paths, counts))
+
+def main():
+    """
+    Main function to display the token counts of files.
+    Called when running as a module: python -m utils.get_token_count
+    """
+    if len(sys.argv) < 2:
+        print("❌ Error: File path required")
+        print("💡 Usage: python -m utils.get_token_count <file> [file ...]")
+        sys.exit(1)
+
+    for path, count in get_token_counts(sys.argv[1:]).items():
+        print(f"📊 {path}: {count:,} tokens")
+
+if __name__ == "__main__":
+    main()
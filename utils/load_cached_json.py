@@ -0,0 +1,208 @@
+"""
+JSON loading with a binary snapshot cache.
+
+The first load of a JSON file writes a compact binary snapshot next to it
+(e.g. .tmp/tree_project.json.snapshot). Later loads memory-map the snapshot
+and unmarshal it instead of re-parsing the JSON text, which makes repeated
+pipeline steps on the same tree close to free. The JSON file stays the
+interchange format; the snapshot is only a cache.
+
+A snapshot is served only while it provably matches the JSON: its header
+stores the JSON's size, mtime, ctime, inode and BLAKE2b digest. When the
+stat data matches and the JSON was last changed well before the snapshot
+was taken, the snapshot is used directly; otherwise the digest is checked
+and a stale snapshot is rebuilt.
+
+Example usage:
+    from utils.load_cached_json import load_cached_json
+
+    # Whole document
+    data = load_cached_json('.tmp/tree_project.json')
+
+    # Only some subtrees (see utils.load_json.load_json_paths)
+    data = load_cached_json('.tmp/tree_project.json', ['react.src', 'sass.src'])
+"""
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from utils.load_json import loads_json_paths
+from utils.trace_span import traced
+
+SNAPSHOT_MAGIC = b"CDXSNAP1"
+
+# magic, size, mtime_ns, ctime_ns, inode, created_ns, digest
+SNAPSHOT_HEADER = struct.Struct("<8sqqqqq32s")
+
+# JSON files changed this close to snapshot creation are always re-hashed
+RACY_WINDOW_NS = 2_000_000_000
+
+def get_snapshot_path(file_path: str, key_paths: Optional[List[str]] = None) -> str:
+    """
+    Get the snapshot path for a JSON file and an optional set of key paths.
+
+    Args:
+        file_path (str): Path to the JSON file
+        key_paths (Optional[List[str]]): Dot-separated key paths
+
+    Returns:
+        str: Snapshot path next to the JSON file
+    """
+    if not key_paths:
+        return f"{file_path}.snapshot"
+    paths_hash = hashlib.blake2b("\0".join(key_paths).encode(), digest_size=4).hexdigest()
+    return f"{file_path}.{paths_hash}.snapshot"
+
+def _digest(path: str) -> bytes:
+    """
+    Compute the BLAKE2b digest of a file.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _read_snapshot(snapshot_path: str, file_path: str, key_paths: List[str]) -> Optional[Any]:
+    """
+    Read a snapshot if it is fresh for the JSON file, or return None.
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if len(buffer) < SNAPSHOT_HEADER.size:
+                    return None
+                magic, size, mtime_ns, ctime_ns, inode, created_ns, digest = \
+                    SNAPSHOT_HEADER.unpack_from(buffer)
+                if magic != SNAPSHOT_MAGIC:
+                    return None
+
+                st = os.stat(file_path)
+                trusted = (
+                    (size, mtime_ns, ctime_ns, inode) == (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+                    and ctime_ns < created_ns - RACY_WINDOW_NS
+                )
+                if not trusted:
+                    checked_ns = time.time_ns()
+                    if st.st_size != size or _digest(file_path) != digest:
+                        return None
+                    _refresh_header(snapshot_path, st, checked_ns, digest)
+
+                stored_paths, data = marshal.loads(memoryview(buffer)[SNAPSHOT_HEADER.size:])
+                return data if stored_paths == key_paths else None
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None
+
+def _refresh_header(snapshot_path: str, st: os.stat_result, checked_ns: int, digest: bytes) -> None:
+    """
+    Record current stat data after the digest confirmed the content is
+    unchanged, so the next load can skip hashing once the racy window has
+    passed.
+    """
+    try:
+        with open(snapshot_path, 'r+b') as f:
+            f.write(SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino, checked_ns, digest
+            ))
+    except OSError:
+        pass
+
+def _write_snapshot(snapshot_path: str, st: os.stat_result, created_ns: int,
+                    digest: bytes, key_paths: List[str], data: Any) -> None:
+    """
+    Atomically write a snapshot; failures only cost the cache.
+    """
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino, created_ns, digest
+    )
+    temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(marshal.dumps((key_paths, data)))
+        os.replace(temp_path, snapshot_path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not write JSON snapshot {snapshot_path}: {e}", file=sys.stderr)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+@traced("utils.load_cached_json")
+def load_cached_json(file_path: str, key_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Load a JSON file through its binary snapshot cache.
+
+    Args:
+        file_path (str): Path to the JSON file to load
+        key_paths (Optional[List[str]]): Dot-separated key paths to load
+            (default: the whole document)
+
+    Returns:
+        Dict[str, Any]: Parsed JSON data as a dictionary
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+        IOError: If there's an error reading the file
+    """
+    key_paths = list(key_paths or [])
+    snapshot_path = get_snapshot_path(file_path, key_paths)
+
+    data = _read_snapshot(snapshot_path, file_path, key_paths)
+    if data is not None:
+        return data
+
+    created_ns = time.time_ns()
+    try:
+        with open(file_path, 'rb') as f:
+            before = os.fstat(f.fileno())
+            raw = f.read()
+            after = os.fstat(f.fileno())
+    except FileNotFoundError:
+        print(f"❌ Error: File not found: {file_path}")
+        raise
+    except IOError as e:
+        print(f"❌ Error reading {file_path}: {e}")
+        raise
+
+    try:
+        text = raw.decode('utf-8')
+        data = loads_json_paths(text, key_paths) if key_paths else json.loads(text)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"❌ Error: Invalid JSON in {file_path}: {e}")
+        raise
+
+    # Only cache content that provably matches the stat data in the header
+    if (before.st_size, before.st_mtime_ns, before.st_ctime_ns) == \
+            (after.st_size, after.st_mtime_ns, after.st_ctime_ns):
+        digest = hashlib.blake2b(raw, digest_size=32).digest()
+        _write_snapshot(snapshot_path, after, created_ns, digest, key_paths, data)
+    return data
+
+def main():
+    """
+    Main function to demonstrate cached JSON loading.
+    Called when running as a module: python -m utils.load_cached_json
+    """
+    if len(sys.argv) < 2:
+        print("❌ Error: JSON file path required")
+        print("💡 Usage: python -m utils.load_cached_json <json_file> [key.path ...]")
+        sys.exit(1)
+
+    file_path = sys.argv[1]
+    try:
+        started = time.perf_counter()
+        data = load_cached_json(file_path, sys.argv[2:])
+        elapsed = time.perf_counter() - started
+        print(f"✅ Successfully loaded JSON file in {elapsed:.3f}s")
+        print(f"📦 Snapshot: {get_snapshot_path(file_path, sys.argv[2:])}")
+    except Exception:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
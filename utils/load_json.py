@@ -4,17 +4,35 @@ JSON loading utility with error handling.
 This module provides functionality to safely load and parse JSON files,
 with comprehensive error handling and validation.
 
+It also provides streaming loaders for large files such as
+.tmp/tree_project.json: only the requested subtrees are built, and
+everything else is skipped without keeping Python objects around.
+
 Example usage:
-    from utils.load_json import load_json
+    from utils.load_json import load_json, load_json_paths, iter_json_files
 
     # Load and parse a JSON file
     data = load_json('config.json')
+
+    # Load only some subtrees, keeping the original nesting
+    data = load_json_paths('.tmp/tree_project.json', ['react.src', 'sass.src'])
+
+    # Stream (path, files) pairs of a tree structure
+    for path, files in iter_json_files('.tmp/tree_project.json', 'react.src'):
+        print(path, files)
 """
 
 import json
+import re
 import sys
-from typing import Any, Dict
+from contextlib import contextmanager
+from json.decoder import scanstring
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
+from utils.trace_span import traced
 
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+@traced("utils.load_json")
 def load_json(file_path: str) -> Dict[str, Any]:
     """
     Load and parse a JSON file.
@@ -43,6 +61,265 @@ def load_json(file_path: str) -> Dict[str, Any]:
         print(f"❌ Error reading {file_path}: {e}")
         raise
 
+class _Scanner:
+    """
+    Minimal JSON scanner over the text of a document.
+
+    Structure is only followed along the requested key paths. Every other
+    value is skipped by the C decoder with an object hook that discards
+    each object as soon as it is parsed, so skipped subtrees never exist
+    as Python objects all at once.
+    """
+
+    _decoder = json.JSONDecoder()
+    _skipper = json.JSONDecoder(object_pairs_hook=lambda pairs: None)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def error(self, message: str, pos: int) -> None:
+        raise json.JSONDecodeError(message, self.text, pos)
+
+    def skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self.text, pos).end()
+
+    def expect(self, pos: int, char: str) -> int:
+        pos = self.skip_whitespace(pos)
+        if self.text[pos:pos + 1] != char:
+            self.error(f"Expecting '{char}' delimiter", pos)
+        return pos + 1
+
+    def expect_end(self, pos: int) -> None:
+        """
+        Check that only whitespace follows the top-level value ending at pos.
+        """
+        pos = self.skip_whitespace(pos)
+        if pos != len(self.text):
+            self.error("Extra data", pos)
+
+    def is_object(self, pos: int) -> bool:
+        return self.text[pos:pos + 1] == '{'
+
+    def value_end(self, pos: int) -> int:
+        """
+        Find the end of the value starting at pos without keeping it.
+        """
+        return self._skipper.raw_decode(self.text, pos)[1]
+
+    def decode(self, pos: int) -> Tuple[Any, int]:
+        """
+        Decode the value starting at pos.
+
+        Returns:
+            Tuple[Any, int]: Decoded value and the position after it
+        """
+        return self._decoder.raw_decode(self.text, pos)
+
+    def iter_object(self, pos: int) -> Iterator[Tuple[str, int]]:
+        """
+        Iterate over the members of the object starting at pos.
+
+        Yields (key, value position); the caller sends back the position
+        after the value once it has been consumed. The generator's return
+        value is the position after the closing brace.
+        """
+        pos = self.skip_whitespace(self.expect(pos, '{'))
+        if self.text[pos:pos + 1] == '}':
+            return pos + 1
+
+        while True:
+            if self.text[pos:pos + 1] != '"':
+                self.error("Expecting property name enclosed in double quotes", pos)
+            key, pos = scanstring(self.text, pos + 1)
+            pos = self.skip_whitespace(self.expect(pos, ':'))
+            pos = yield key, pos
+            pos = self.skip_whitespace(pos)
+            char = self.text[pos:pos + 1]
+            if char == '}':
+                return pos + 1
+            if char != ',':
+                self.error("Expecting ',' delimiter", pos)
+            pos = self.skip_whitespace(pos + 1)
+
+    def members(self, pos: int, consume: Any) -> int:
+        """
+        Consume every member of the object at pos with consume(key, value_pos),
+        which returns the position after the value.
+
+        Returns:
+            int: Position after the object
+        """
+        iterator = self.iter_object(pos)
+        try:
+            key, value_pos = next(iterator)
+            while True:
+                key, value_pos = iterator.send(consume(key, value_pos))
+        except StopIteration as stop:
+            return stop.value
+
+@contextmanager
+def _open_scanner(file_path: str) -> Iterator[_Scanner]:
+    """
+    Read a JSON file for scanning and report errors the same way as load_json.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        yield _Scanner(text)
+    except FileNotFoundError:
+        print(f"❌ Error: File not found: {file_path}")
+        raise
+    except json.JSONDecodeError as e:
+        print(f"❌ Error: Invalid JSON in {file_path}: {e}")
+        raise
+    except IOError as e:
+        print(f"❌ Error reading {file_path}: {e}")
+        raise
+
+def _build_trie(key_paths: List[str]) -> Dict[str, Any]:
+    """
+    Build a nested dict of requested keys; None marks a full subtree.
+    """
+    trie: Dict[str, Any] = {}
+    for key_path in key_paths:
+        node = trie
+        *parents, last = key_path.split('.')
+        for key in parents:
+            if node.get(key, {}) is None:
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[last] = None
+    return trie
+
+def load_json_paths(file_path: str, key_paths: List[str]) -> Dict[str, Any]:
+    """
+    Load only the requested key paths of a JSON file.
+
+    The result has the same nesting as the full document, restricted to the
+    requested subtrees; missing keys are simply absent. Values outside of
+    those paths are skipped without being decoded.
+
+    Args:
+        file_path (str): Path to the JSON file to load
+        key_paths (List[str]): Dot-separated key paths (e.g. "react.src")
+
+    Returns:
+        Dict[str, Any]: Pruned JSON data as a dictionary
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+        IOError: If there's an error reading the file
+    """
+    with _open_scanner(file_path) as scanner:
+        return loads_json_paths(scanner.text, key_paths)
+
+def loads_json_paths(text: str, key_paths: List[str]) -> Dict[str, Any]:
+    """
+    Decode only the requested key paths of a JSON document.
+
+    Same as load_json_paths, for a document that is already in memory.
+
+    Args:
+        text (str): JSON document
+        key_paths (List[str]): Dot-separated key paths (e.g. "react.src")
+
+    Returns:
+        Dict[str, Any]: Pruned JSON data as a dictionary
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid JSON
+    """
+    scanner = _Scanner(text)
+
+    def extract(pos: int, trie: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        result: Dict[str, Any] = {}
+
+        def consume(key: str, value_pos: int) -> int:
+            if key not in trie:
+                return scanner.value_end(value_pos)
+            if trie[key] is None:
+                result[key], end = scanner.decode(value_pos)
+                return end
+            if not scanner.is_object(value_pos):
+                return scanner.value_end(value_pos)
+            result[key], end = extract(value_pos, trie[key])
+            return end
+
+        return result, scanner.members(pos, consume)
+
+    pos = scanner.skip_whitespace(0)
+    if not scanner.is_object(pos):
+        scanner.expect_end(scanner.value_end(pos))
+        return {}
+    result, end = extract(pos, _build_trie(key_paths))
+    scanner.expect_end(end)
+    return result
+
+def iter_json_files(file_path: str, key_path: Optional[str] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Stream the (directory path, files) pairs of a tree structure JSON file.
+
+    Pairs are yielded in document order as they are found, so a caller can
+    process a huge tree without holding it in memory.
+
+    Args:
+        file_path (str): Path to a tree structure JSON file
+        key_path (Optional[str]): Dot-separated subtree to walk (e.g.
+            "react.src"); the whole document when omitted
+
+    Yields:
+        Tuple[str, List[str]]: Slash-separated directory path (starting with
+            the key path) and the directory's "files" list
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+        IOError: If there's an error reading the file
+    """
+    keys = key_path.split('.') if key_path else []
+
+    with _open_scanner(file_path) as scanner:
+        def find(pos: int, depth: int) -> Generator[Tuple[str, List[str]], None, int]:
+            if depth == len(keys):
+                return (yield from walk(pos, "/".join(keys)))
+
+            found = []
+
+            def consume(key: str, value_pos: int) -> int:
+                if key == keys[depth] and scanner.is_object(value_pos):
+                    found.append(value_pos)
+                return scanner.value_end(value_pos)
+
+            end = scanner.members(pos, consume)
+            if found:
+                yield from find(found[-1], depth + 1)
+            return end
+
+        def walk(pos: int, path: str) -> Generator[Tuple[str, List[str]], None, int]:
+            iterator = scanner.iter_object(pos)
+            try:
+                key, value_pos = next(iterator)
+                while True:
+                    if key == 'files' and not scanner.is_object(value_pos):
+                        files, end = scanner.decode(value_pos)
+                        if isinstance(files, list):
+                            yield path, files
+                    elif scanner.is_object(value_pos):
+                        end = yield from walk(value_pos, f"{path}/{key}" if path else key)
+                    else:
+                        end = scanner.value_end(value_pos)
+                    key, value_pos = iterator.send(end)
+            except StopIteration as stop:
+                return stop.value
+
+        pos = scanner.skip_whitespace(0)
+        if not scanner.is_object(pos):
+            scanner.expect_end(scanner.value_end(pos))
+            return
+        scanner.expect_end((yield from find(pos, 0)))
+
 def main():
     """
     Main function to demonstrate JSON loading.
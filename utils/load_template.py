@@ -4,50 +4,275 @@ Template processing utility with variable substitution.
 This module provides functionality to load template files and substitute
 variables using Python's string formatting.
 
+Templates are compiled once: the file is read and its str.format fields
+are parsed on first use, then kept in memory by path, modification time
+and size, so rendering the same template for thousands of jobs only
+substitutes values. A compiled template can also be rendered straight into
+a file or writer; values wrapped in FileContent are copied from their file
+in chunks, so a multi-MB log embedded in a prompt is never held in memory.
+
 Example usage:
-    from utils.load_template import load_template
+    from utils.load_template import FileContent, load_template, render_template
 
     # Load and process a template
     result = load_template('template.txt',
         name="John",
         title="Developer"
     )
+
+    # Render into a file, streaming a large log into the {log} field
+    render_template('prompt.md', '.tmp/prompt.md',
+        log=FileContent('.tmp/git_log_detailed.txt')
+    )
 """
 
+import os
+import re
 import sys
-from typing import Any, Dict
+import threading
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+
+# Characters copied per write when streaming a FileContent value
+CHUNK_SIZE = 64 * 1024
+
+@dataclass(frozen=True)
+class FileContent:
+    """
+    Template value read from a file while rendering.
+
+    Attributes:
+        path (str): File whose content is substituted
+        encoding (str): Text encoding of the file
+    """
+    path: str
+    encoding: str = "utf-8"
+
+    def read(self) -> str:
+        """Read the whole file."""
+        with open(self.path, "r", encoding=self.encoding) as f:
+            return f.read()
+
+class CompiledTemplate:
+    """
+    Template file parsed into literal text and str.format fields.
+
+    Attributes:
+        path (str): Template file
+        parts (List[Tuple[str, Optional[str], str, Optional[str]]]): Literal
+            text, field name, format spec and conversion of each segment
+            (field name is None after the last field)
+    """
+
+    _formatter = Formatter()
+
+    def __init__(self, text: str, path: str = "<string>"):
+        self.path = path
+        # Invalid templates (e.g. a lone "{") fail here, once, like str.format
+        self.parts: List[Tuple[str, Optional[str], str, Optional[str]]] = list(self._formatter.parse(text))
+        for _, name, spec, _ in self.parts:
+            if name is None:
+                continue
+            self._check_field(name)
+            if "{" in spec:
+                for _, nested, _, _ in self._formatter.parse(spec):
+                    if nested is not None:
+                        self._check_field(nested)
+
+    @staticmethod
+    def _check_field(name: str) -> None:
+        """
+        Reject positional fields ("{}", "{0}"): templates only get keyword
+        variables, so str.format would fail on them at every render.
+        """
+        first = re.split(r"[.\[]", name, maxsplit=1)[0]
+        if first == "" or first.isdigit():
+            raise ValueError(f"Positional template field {{{name}}} is not supported, use a named variable")
+
+    def _field(self, name: str, spec: str, conversion: Optional[str], kwargs: Dict[str, Any]) -> Any:
+        """
+        Resolve a field like str.format, keeping FileContent values for streaming.
+        """
+        value, _ = self._formatter.get_field(name, (), kwargs)
+        if isinstance(value, FileContent):
+            if not spec and conversion is None:
+                return value
+            value = value.read()
+        value = self._formatter.convert_field(value, conversion)
+        if "{" in spec:
+            spec = self._formatter.vformat(spec, (), kwargs)
+        return self._formatter.format_field(value, spec)
+
+    def render(self, **kwargs: Any) -> str:
+        """
+        Substitute the variables into the template.
+
+        Args:
+            **kwargs: Key-value pairs for variable substitution
+
+        Returns:
+            str: Rendered template, identical to str.format
+
+        Raises:
+            KeyError: If a required template variable is missing
+        """
+        pieces = []
+        for literal, name, spec, conversion in self.parts:
+            pieces.append(literal)
+            if name is not None:
+                value = self._field(name, spec, conversion, kwargs)
+                pieces.append(value.read() if isinstance(value, FileContent) else value)
+        return "".join(pieces)
+
+    def render_to(self, writer: TextIO, **kwargs: Any) -> int:
+        """
+        Write the rendered template to a writer, piece by piece.
+
+        Every value is resolved before anything is written, so a missing
+        variable leaves the writer untouched. FileContent values are copied
+        in CHUNK_SIZE pieces.
+
+        Args:
+            writer (TextIO): Object with a write(str) method
+            **kwargs: Key-value pairs for variable substitution
+
+        Returns:
+            int: Number of characters written
+
+        Raises:
+            KeyError: If a required template variable is missing
+        """
+        values = [
+            self._field(name, spec, conversion, kwargs) if name is not None else ""
+            for _, name, spec, conversion in self.parts
+        ]
+
+        written = 0
+        for (literal, _, _, _), value in zip(self.parts, values):
+            writer.write(literal)
+            written += len(literal)
+            if isinstance(value, FileContent):
+                with open(value.path, "r", encoding=value.encoding) as f:
+                    while True:
+                        chunk = f.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        writer.write(chunk)
+                        written += len(chunk)
+            else:
+                writer.write(value)
+                written += len(value)
+        return written
+
+# Compiled templates by real path, with the mtime and size they were read at
+_cache: Dict[str, Tuple[int, int, CompiledTemplate]] = {}
+_cache_lock = threading.Lock()
+
+def compile_template(template_path: str) -> CompiledTemplate:
+    """
+    Compile a template file, reusing the cached result while the file is
+    unchanged (same modification time and size).
+
+    Args:
+        template_path (str): Path to the template file
+
+    Returns:
+        CompiledTemplate: Compiled template
+
+    Raises:
+        FileNotFoundError: If the template file doesn't exist
+        ValueError: If the template has an invalid or positional format field
+    """
+    key = os.path.realpath(template_path)
+    st = os.stat(key)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(key, 'r', encoding='utf-8') as f:
+        template = CompiledTemplate(f.read(), template_path)
+    with _cache_lock:
+        _cache[key] = (st.st_mtime_ns, st.st_size, template)
+    return template
+
+def clear_template_cache() -> None:
+    """Forget all compiled templates."""
+    with _cache_lock:
+        _cache.clear()
+
+def _report_error(template_path: str, error: Exception) -> None:
+    """
+    Print the error of a template operation in the load_template format.
+    """
+    if isinstance(error, FileNotFoundError) and error.filename in (template_path, os.path.realpath(template_path)):
+        print(f"❌ Error: Template file not found: {template_path}")
+    elif isinstance(error, KeyError):
+        print(f"❌ Error: Missing template variable: {error}")
+    elif isinstance(error, IOError):
+        print(f"❌ Error reading template {template_path}: {error}")
+    else:
+        print(f"❌ Error processing template: {error}")
 
 def load_template(template_path: str, **kwargs: Any) -> str:
     """
     Load and process a template file with variable substitution.
-    
+
     Args:
         template_path (str): Path to the template file
         **kwargs: Key-value pairs for variable substitution
-    
+
     Returns:
         str: Processed template with variables substituted
-    
+
     Raises:
         FileNotFoundError: If the template file doesn't exist
         KeyError: If a required template variable is missing
         IOError: If there's an error reading the file
     """
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
-        return template.format(**kwargs)
-    except FileNotFoundError:
-        print(f"❌ Error: Template file not found: {template_path}")
-        raise
-    except KeyError as e:
-        print(f"❌ Error: Missing template variable: {e}")
-        raise
-    except IOError as e:
-        print(f"❌ Error reading template {template_path}: {e}")
+        return compile_template(template_path).render(**kwargs)
+    except Exception as e:
+        _report_error(template_path, e)
         raise
+
+def render_template(template_path: str, output: Union[str, TextIO], **kwargs: Any) -> int:
+    """
+    Render a template file into a file or writer without building the
+    result in memory.
+
+    Args:
+        template_path (str): Path to the template file
+        output (Union[str, TextIO]): Output file path, or object with a
+            write(str) method
+        **kwargs: Key-value pairs for variable substitution; FileContent
+            values are streamed from their file
+
+    Returns:
+        int: Number of characters written
+
+    Raises:
+        FileNotFoundError: If the template file doesn't exist
+        KeyError: If a required template variable is missing
+        IOError: If there's an error reading or writing a file
+    """
+    try:
+        template = compile_template(template_path)
+        if not isinstance(output, str):
+            return template.render_to(output, **kwargs)
+
+        # Resolve the values first so a missing variable leaves no partial file
+        temp_path = f"{output}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                written = template.render_to(f, **kwargs)
+            os.replace(temp_path, output)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return written
     except Exception as e:
-        print(f"❌ Error processing template: {e}")
+        _report_error(template_path, e)
         raise
 
 def main():
@@ -59,16 +284,17 @@ def main():
         print("❌ Error: Template file path required")
         print("💡 Usage: python -m utils.load_template <template_file> [var1=value1 var2=value2 ...]")
         print("📝 Example: python -m utils.load_template template.txt name=John title=Developer")
+        print("📝 Values starting with @ are read from a file: log=@.tmp/git_log_detailed.txt")
         sys.exit(1)
 
     template_path = sys.argv[1]
-    variables = {}
-    
+    variables: Dict[str, Any] = {}
+
     # Parse variable assignments from command line
     for arg in sys.argv[2:]:
         try:
             key, value = arg.split('=', 1)
-            variables[key] = value
+            variables[key] = FileContent(value[1:]) if value.startswith('@') else value
         except ValueError:
             print(f"❌ Error: Invalid variable assignment: {arg}")
             print("💡 Format should be: key=value")
@@ -0,0 +1,199 @@
+"""
+Job runner utility shared by the documentation and changelog packages.
+
+Runs commands as jobs in a bounded worker pool: every job is its own
+process, with captured stdout/stderr and exit code, a per-job timeout and
+retries for failed or timed-out attempts. A job is any dict with a "path"
+(its name in logs and results) and a "command"; pkg.akads runs its directory
+plans with it, and pkg.changelog its chunk summaries.
+
+Example usage:
+    from utils.run_jobs import run_jobs
+
+    results = run_jobs(plans, jobs=8, timeout=900, retries=1)
+    failed = [result for result in results if not result.ok]
+"""
+
+import hashlib
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from utils.trace_span import trace_span
+
+DEFAULT_JOBS = 4
+DEFAULT_TIMEOUT = 1800
+DEFAULT_RETRIES = 1
+RETRY_DELAY = 5.0
+
+@dataclass
+class JobResult:
+    """
+    Outcome of one job.
+
+    Attributes:
+        path (str): Name of the job (e.g. the directory it documents)
+        command (List[str]): Command that was run
+        returncode (Optional[int]): Exit code of the last attempt (None if
+            it timed out or could not be started)
+        stdout (str): Captured stdout of the last attempt
+        stderr (str): Captured stderr of the last attempt
+        attempts (int): Number of attempts made
+        duration (float): Total seconds spent on all attempts
+        timed_out (bool): Whether the last attempt hit the timeout
+        error (str): Why the job failed despite its exit code (set by the
+            caller, e.g. a directory of an akads batch that got no documentation)
+    """
+    path: str
+    command: List[str]
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    attempts: int = 0
+    duration: float = 0.0
+    timed_out: bool = False
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job finished with exit code 0 and no error."""
+        return self.returncode == 0 and not self.error
+
+def _as_text(output: Any) -> str:
+    """
+    Normalize captured output (None or bytes on timeouts) to text.
+    """
+    if output is None:
+        return ""
+    if isinstance(output, bytes):
+        return output.decode("utf-8", "replace")
+    return output
+
+def run_job(spec: Dict[str, Any], timeout: Optional[float] = DEFAULT_TIMEOUT,
+            retries: int = DEFAULT_RETRIES, retry_delay: float = RETRY_DELAY) -> JobResult:
+    """
+    Run the command of one job, retrying failed or timed-out attempts.
+
+    Commands that cannot be started (e.g. aider is not installed) are not
+    retried.
+
+    Args:
+        spec (Dict[str, Any]): Job with "path" and "command"
+        timeout (Optional[float]): Seconds allowed per attempt (None: no limit)
+        retries (int): Extra attempts after a failure
+        retry_delay (float): Seconds before the first retry, doubled on each
+            further retry
+
+    Returns:
+        JobResult: Outcome of the last attempt
+    """
+    result = JobResult(path=spec["path"], command=spec["command"])
+    started = time.monotonic()
+
+    while True:
+        result.attempts += 1
+        result.timed_out = False
+        try:
+            with trace_span("execute.subprocess", path=result.path, program=result.command[0],
+                            attempt=result.attempts):
+                completed = subprocess.run(
+                    result.command,
+                    capture_output=True,
+                    text=True,
+                    errors="replace",
+                    stdin=subprocess.DEVNULL,
+                    timeout=timeout
+                )
+            result.returncode = completed.returncode
+            result.stdout = completed.stdout
+            result.stderr = completed.stderr
+        except subprocess.TimeoutExpired as e:
+            result.returncode = None
+            result.stdout = _as_text(e.stdout)
+            result.stderr = _as_text(e.stderr) + f"\nTimed out after {timeout}s"
+            result.timed_out = True
+        except OSError as e:
+            result.returncode = None
+            result.stdout = ""
+            result.stderr = str(e)
+            break
+
+        if result.ok or result.attempts > retries:
+            break
+        time.sleep(retry_delay * 2 ** (result.attempts - 1))
+
+    result.duration = time.monotonic() - started
+    return result
+
+def write_log(result: JobResult, log_dir: str) -> str:
+    """
+    Write the captured output of a job to <log_dir>/<path>-<hash>.log.
+
+    The path is flattened into a file name; the short hash of the original
+    path keeps paths that flatten the same (react/src/a_b and react/src/a/b)
+    in separate files.
+
+    Args:
+        result (JobResult): Job outcome
+        log_dir (str): Directory of the job logs
+
+    Returns:
+        str: Path of the written log file
+    """
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", result.path).strip("_") or "root"
+    digest = hashlib.sha1(result.path.encode("utf-8")).hexdigest()[:8]
+    log_path = os.path.join(log_dir, f"{name}-{digest}.log")
+    os.makedirs(log_dir, exist_ok=True)
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(f"$ {' '.join(result.command)}\n")
+        f.write(f"exit code: {result.returncode}, attempts: {result.attempts}, "
+                f"duration: {result.duration:.1f}s\n")
+        f.write("\n--- stdout ---\n")
+        f.write(result.stdout)
+        f.write("\n--- stderr ---\n")
+        f.write(result.stderr)
+    return log_path
+
+def run_jobs(specs: List[Dict[str, Any]], jobs: int = DEFAULT_JOBS,
+             timeout: Optional[float] = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+             retry_delay: float = RETRY_DELAY, log_dir: Optional[str] = None) -> List[JobResult]:
+    """
+    Run the commands of all jobs with at most `jobs` running at once.
+
+    Args:
+        specs (List[Dict[str, Any]]): Jobs with "path" and "command"
+        jobs (int): Maximum number of concurrent processes
+        timeout (Optional[float]): Seconds allowed per attempt (None: no limit)
+        retries (int): Extra attempts after a failure
+        retry_delay (float): Seconds before the first retry
+        log_dir (Optional[str]): Directory to write one log per job to
+
+    Returns:
+        List[JobResult]: Results in the order of the jobs
+    """
+    if not specs:
+        return []
+
+    results: List[Optional[JobResult]] = [None] * len(specs)
+    print(f"\n⚙️  Running {len(specs)} jobs ({jobs} at a time)...")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {
+            executor.submit(run_job, spec, timeout, retries, retry_delay): index
+            for index, spec in enumerate(specs)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results[futures[future]] = result
+            if log_dir:
+                write_log(result, log_dir)
+
+            status = "✅" if result.ok else "❌"
+            detail = "timed out" if result.timed_out else f"exit code {result.returncode}"
+            print(f"{status} [{done}/{len(specs)}] {result.path} "
+                  f"({detail}, {result.attempts} attempt(s), {result.duration:.1f}s)")
+
+    return results
@@ -0,0 +1,444 @@
+"""
+Project tree scanner.
+
+This module builds the project structure JSON (.tmp/tree_project.json)
+in-process with os.scandir, replacing the per-directory find/basename/grep
+forks of bin/tree_project.sh. Large subtrees are scanned concurrently by a
+worker pool, and the output is byte-identical to the shell script.
+
+Example usage:
+    from utils.scan_tree import scan_tree, write_tree
+
+    tree = scan_tree("./")
+    write_tree(tree, ".tmp/tree_project.json")
+
+Command-line usage:
+    python -m utils.scan_tree ./ .tmp/tree_project.json
+    python -m utils.scan_tree ./ .tmp/tree_project.json --incremental
+    python -m utils.scan_tree ./ .tmp/tree_project.json --incremental --verify
+    python -m utils.scan_tree ./ .tmp/tree_project.json --benchmark
+"""
+
+import argparse
+import difflib
+import json
+import locale
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.get_base_path import get_base_path
+from utils.get_sort_key import get_sort_key
+
+# List of folders to exclude (same regular expression as bin/tree_project.sh)
+EXCLUDE_FOLDERS = "dist|node_modules|venv|examples|.git|.vscode|.tmp|.github|.aider.tags.cache.v3|__pycache__"
+
+EXCLUDE_PATTERN = re.compile(f"^({EXCLUDE_FOLDERS})$")
+
+# Directories at this depth (and below) are scanned as one worker task
+SPLIT_DEPTH = 2
+
+# Format version of the incremental directory snapshot
+DIRSTATE_VERSION = 1
+
+# Directories modified this close to the previous scan are always rescanned
+RACY_WINDOW_NS = 2_000_000_000
+
+def _join(parent: str, name: str) -> str:
+    """
+    Join a directory and an entry name the way `find` prints them.
+    """
+    return f"/{name}" if parent == "/" else f"{parent}/{name}"
+
+def list_directory(path: str, sort_key: Callable[[str], Any]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    List the visible subdirectories and files of a single directory.
+
+    Mirrors `find "$dir" -maxdepth 1 -type d|f ! -path "*/\\.*" | sort`:
+    symlinks are neither directories nor files, any path containing "/."
+    is hidden, and subdirectories matching EXCLUDE_FOLDERS are skipped.
+
+    Args:
+        path (str): Absolute directory path
+        sort_key (Callable[[str], Any]): Key used to order the full paths
+
+    Returns:
+        Tuple[List[Tuple[str, str]], List[str]]: Sorted (name, path) pairs of
+            subdirectories and sorted file names
+    """
+    dirs = []
+    files = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                child = _join(path, entry.name)
+                if "/." in child:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not EXCLUDE_PATTERN.fullmatch(entry.name):
+                            dirs.append((entry.name, child))
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((entry.name, child))
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"⚠️  Unable to read directory {path}: {e}", file=sys.stderr)
+
+    dirs.sort(key=lambda item: sort_key(item[1]))
+    files.sort(key=lambda item: sort_key(item[1]))
+    return dirs, [name for name, _ in files]
+
+def scan_directory(path: str, sort_key: Callable[[str], Any]) -> Dict[str, Any]:
+    """
+    Recursively scan a directory into the tree_project.json structure.
+
+    Args:
+        path (str): Absolute directory path
+        sort_key (Callable[[str], Any]): Key used to order the full paths
+
+    Returns:
+        Dict[str, Any]: Nested structure with subdirectories first and a
+            "files" list when the directory has files
+    """
+    dirs, files = list_directory(path, sort_key)
+    node: Dict[str, Any] = {}
+    for name, child in dirs:
+        node[name] = scan_directory(child, sort_key)
+    if files:
+        node["files"] = files
+    return node
+
+def _resolve(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace worker futures in a partially built tree with their results.
+    """
+    for key, value in node.items():
+        if isinstance(value, Future):
+            node[key] = value.result()
+        elif isinstance(value, dict):
+            _resolve(value)
+    return node
+
+def scan_tree(start_path: str, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Scan a project directory into the tree_project.json structure.
+
+    The first SPLIT_DEPTH levels are listed in the calling thread, and every
+    subtree below them is handed to a thread pool. Directory listing is
+    dominated by system calls, which release the GIL, so subtrees are read
+    concurrently.
+
+    Args:
+        start_path (str): Directory to scan (relative or absolute)
+        workers (Optional[int]): Worker threads; 1 scans serially
+            (default: min(32, cpu_count + 4))
+
+    Returns:
+        Dict[str, Any]: Project structure, identical to bin/tree_project.sh
+
+    Raises:
+        NotADirectoryError: If start_path is not a valid directory
+    """
+    root = os.path.realpath(start_path)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"{root} is not a valid directory.")
+
+    sort_key = get_sort_key()
+    if workers == 1:
+        return scan_directory(root, sort_key)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def build(path: str, depth: int) -> Dict[str, Any]:
+            dirs, files = list_directory(path, sort_key)
+            node: Dict[str, Any] = {}
+            for name, child in dirs:
+                if depth + 1 >= SPLIT_DEPTH:
+                    node[name] = pool.submit(scan_directory, child, sort_key)
+                else:
+                    node[name] = build(child, depth + 1)
+            if files:
+                node["files"] = files
+            return node
+
+        return _resolve(build(root, 0))
+
+def dump_tree(tree: Dict[str, Any]) -> str:
+    """
+    Serialize a tree exactly like `jq '.'` formats it.
+
+    Args:
+        tree (Dict[str, Any]): Tree structure
+
+    Returns:
+        str: JSON text with two-space indentation and a trailing newline
+    """
+    return json.dumps(tree, indent=2, ensure_ascii=False) + "\n"
+
+def write_tree(tree: Dict[str, Any], output_file: str) -> None:
+    """
+    Write a tree structure to a JSON file, creating parent directories.
+
+    Args:
+        tree (Dict[str, Any]): Tree structure
+        output_file (str): Path of the JSON file to write
+    """
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(dump_tree(tree))
+
+def get_dirstate_path(output_file: str) -> str:
+    """
+    Get the path of the directory snapshot kept next to a tree JSON file.
+
+    Args:
+        output_file (str): Path of the tree JSON file
+
+    Returns:
+        str: Sidecar path (e.g. .tmp/tree_project.dirstate.json)
+    """
+    return f"{os.path.splitext(output_file)[0]}.dirstate.json"
+
+def _file_state(path: str) -> Optional[List[int]]:
+    """
+    Get the size and mtime of a file, or None if it cannot be read.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def _load_previous(root: str, output_file: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Load the previous tree and its directory snapshot if they can be reused.
+
+    Both are discarded when the snapshot was taken for another root, exclude
+    list or collation locale, or when the JSON changed since it was written.
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Dict[str, Any]]: Previous tree (or
+            None for a full scan) and the snapshot
+    """
+    try:
+        with open(get_dirstate_path(output_file), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            tree = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+
+    expected = {
+        "version": DIRSTATE_VERSION,
+        "root": root,
+        "exclude": EXCLUDE_FOLDERS,
+        "collation": locale.setlocale(locale.LC_COLLATE),
+        "output": _file_state(output_file),
+    }
+    if any(snapshot.get(key) != value for key, value in expected.items()):
+        return None, {}
+    if not isinstance(tree, dict) or not isinstance(snapshot.get("dirs"), dict):
+        return None, {}
+    return tree, snapshot
+
+def refresh_tree(start_path: str, output_file: str) -> Dict[str, Any]:
+    """
+    Refresh a tree JSON file, rescanning only directories that changed.
+
+    A directory's entry list can only change if its mtime, ctime or inode
+    changed, so unchanged directories reuse their previous "files" list and
+    subdirectory names and only cost one stat call. Directories modified
+    within RACY_WINDOW_NS of the previous scan are always rescanned, since
+    their timestamps cannot prove they were listed after the change.
+
+    The refreshed tree and its snapshot (see get_dirstate_path) are written
+    back; without a usable snapshot this is a full scan.
+
+    Args:
+        start_path (str): Directory to scan (relative or absolute)
+        output_file (str): Path of the tree JSON file to refresh
+
+    Returns:
+        Dict[str, Any]: Project structure, identical to a full scan
+
+    Raises:
+        NotADirectoryError: If start_path is not a valid directory
+    """
+    root = os.path.realpath(start_path)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"{root} is not a valid directory.")
+
+    sort_key = get_sort_key()
+    previous, snapshot = _load_previous(root, output_file)
+    old_dirs = snapshot.get("dirs", {})
+    racy_ns = snapshot.get("scanned_ns", 0) - RACY_WINDOW_NS
+    new_dirs: Dict[str, List[int]] = {}
+    stats = {"checked": 0, "rescanned": 0}
+    scanned_ns = time.time_ns()
+
+    def refresh(path: str, rel: str, old_node: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        stats["checked"] += 1
+        try:
+            st = os.stat(path, follow_symlinks=False)
+            state = [st.st_mtime_ns, st.st_ctime_ns, st.st_ino]
+        except OSError:
+            state = []
+        new_dirs[rel] = state
+
+        node: Dict[str, Any] = {}
+        unchanged = (
+            old_node is not None
+            and state
+            and old_dirs.get(rel) == state
+            and max(state[0], state[1]) < racy_ns
+        )
+        if unchanged:
+            for key, value in old_node.items():
+                if key == "files" and isinstance(value, list):
+                    node[key] = value
+                else:
+                    node[key] = refresh(_join(path, key), f"{rel}/{key}" if rel else key, value)
+            return node
+
+        stats["rescanned"] += 1
+        dirs, files = list_directory(path, sort_key)
+        for name, child in dirs:
+            old_child = old_node.get(name) if old_node is not None else None
+            node[name] = refresh(child, f"{rel}/{name}" if rel else name,
+                                 old_child if isinstance(old_child, dict) else None)
+        if files:
+            node["files"] = files
+        return node
+
+    tree = refresh(root, "", previous)
+    write_tree(tree, output_file)
+
+    snapshot = {
+        "version": DIRSTATE_VERSION,
+        "root": root,
+        "exclude": EXCLUDE_FOLDERS,
+        "collation": locale.setlocale(locale.LC_COLLATE),
+        "output": _file_state(output_file),
+        "scanned_ns": scanned_ns,
+        "dirs": new_dirs,
+    }
+    with open(get_dirstate_path(output_file), 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+
+    print(f"📊 Directories checked: {stats['checked']:,}, rescanned: {stats['rescanned']:,}")
+    return tree
+
+def verify_tree(tree: Dict[str, Any], start_path: str, workers: Optional[int] = None) -> bool:
+    """
+    Compare a tree against a full rescan and print any differences.
+
+    Args:
+        tree (Dict[str, Any]): Tree to verify (e.g. from refresh_tree)
+        start_path (str): Directory to scan
+        workers (Optional[int]): Worker threads for the full scan
+
+    Returns:
+        bool: True if the tree matches a full rescan byte for byte
+    """
+    expected = dump_tree(scan_tree(start_path, workers))
+    actual = dump_tree(tree)
+    if actual == expected:
+        print("✅ Incremental tree matches a full rescan")
+        return True
+
+    print("❌ Incremental tree differs from a full rescan:")
+    diff = difflib.unified_diff(
+        expected.splitlines(), actual.splitlines(),
+        fromfile="full", tofile="incremental", lineterm=""
+    )
+    for line in diff:
+        print(line)
+    return False
+
+def benchmark(start_path: str, workers: Optional[int] = None) -> bool:
+    """
+    Time bin/tree_project.sh against scan_tree and compare their output.
+
+    Args:
+        start_path (str): Directory to scan
+        workers (Optional[int]): Worker threads for scan_tree
+
+    Returns:
+        bool: True if both outputs are byte-identical
+    """
+    script = f"{get_base_path()}/bin/tree_project.sh"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shell_output = os.path.join(tmp, "tree_shell.json")
+        python_output = os.path.join(tmp, "tree_python.json")
+
+        print(f"⏱️  Running {script}...")
+        started = time.perf_counter()
+        subprocess.run([script, start_path, shell_output], check=True, stdout=subprocess.DEVNULL)
+        shell_time = time.perf_counter() - started
+
+        print("⏱️  Running scan_tree...")
+        started = time.perf_counter()
+        write_tree(scan_tree(start_path, workers), python_output)
+        python_time = time.perf_counter() - started
+
+        with open(shell_output, 'rb') as f:
+            shell_bytes = f.read()
+        with open(python_output, 'rb') as f:
+            python_bytes = f.read()
+
+    identical = shell_bytes == python_bytes
+    print(f"\n📊 tree_project.sh: {shell_time:.3f}s")
+    print(f"📊 scan_tree:       {python_time:.3f}s")
+    if python_time > 0:
+        print(f"📊 Speedup:         {shell_time / python_time:.1f}x")
+    if identical:
+        print("✅ Outputs are byte-identical")
+    else:
+        print("❌ Outputs differ")
+    return identical
+
+def main():
+    """
+    Main function to generate the project tree.
+    Called when running as a module: python -m utils.scan_tree
+    """
+    parser = argparse.ArgumentParser(description="Generate the project tree structure JSON")
+    parser.add_argument("start_path", help="Directory to scan")
+    parser.add_argument("output_file", nargs="?", default=".tmp/tree_project.json",
+                      help="Path of the JSON file to write")
+    parser.add_argument("--workers", type=int, default=None,
+                      help="Number of worker threads (1 scans serially)")
+    parser.add_argument("--incremental", action="store_true",
+                      help="Rescan only directories changed since the last incremental run")
+    parser.add_argument("--verify", action="store_true",
+                      help="Diff the incremental result against a full rescan")
+    parser.add_argument("--benchmark", action="store_true",
+                      help="Compare speed and output with bin/tree_project.sh")
+    args = parser.parse_args()
+
+    try:
+        if args.benchmark:
+            sys.exit(0 if benchmark(args.start_path, args.workers) else 1)
+
+        if args.incremental:
+            tree = refresh_tree(args.start_path, args.output_file)
+        else:
+            tree = scan_tree(args.start_path, args.workers)
+            write_tree(tree, args.output_file)
+        print(f"Project tree structure saved to {args.output_file}")
+
+        if args.verify and not verify_tree(tree, args.start_path, args.workers):
+            sys.exit(1)
+    except NotADirectoryError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
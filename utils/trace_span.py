@@ -0,0 +1,288 @@
+"""
+Timing spans utility shared by the pipeline entry points.
+
+This module records how long each stage of a run takes (loading JSON,
+counting tokens, generating logs, aider and model calls...) as nested spans.
+Tracing is off by default: it is enabled with $CODEX_TRACE or the --trace
+option of the entry points, and then writes a Chrome trace file (open it in
+chrome://tracing or https://ui.perfetto.dev) and prints a per-stage summary
+when the process exits.
+
+While tracing is off, trace_span returns a shared no-op context manager and
+traced functions are called directly, so the instrumentation costs one
+global lookup per call.
+
+Example usage:
+    from utils.trace_span import setup_tracing, trace_span, traced
+
+    setup_tracing(".tmp/trace.json")  # or CODEX_TRACE=.tmp/trace.json
+
+    with trace_span("changelog.model", command="aider"):
+        subprocess.run(command)
+
+    @traced("utils.load_json")
+    def load_json(file_path): ...
+
+Command-line usage:
+    # Summary of a trace file
+    python -m utils.trace_span .tmp/trace.json
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+# Environment variable with the trace file path; setting it enables tracing
+TRACE_ENV = "CODEX_TRACE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+class _NullSpan:
+    """
+    Span used while tracing is off.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def set(self, **args: Any) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """
+    Collects the spans of a process.
+
+    Attributes:
+        path (str): Trace file written by write()
+        events (List[Dict[str, Any]]): Chrome trace "complete" events
+            (times in microseconds since the tracer was created)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.threads: Dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    def add(self, name: str, start: int, end: int, args: Dict[str, Any]) -> None:
+        """
+        Record a finished span.
+
+        Args:
+            name (str): Stage name
+            start (int): perf_counter_ns() at the start
+            end (int): perf_counter_ns() at the end
+            args (Dict[str, Any]): Details shown with the span
+        """
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self.pid,
+            "tid": thread.native_id,
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+            self.threads.setdefault(thread.native_id, thread.name)
+
+    def write(self) -> str:
+        """
+        Write the Chrome trace file.
+
+        Returns:
+            str: Trace file path
+        """
+        with self.lock:
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self.threads.items()
+            ]
+            events = metadata + sorted(self.events, key=lambda event: event["ts"])
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        return self.path
+
+class Span:
+    """
+    Context manager timing one stage.
+    """
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **args: Any) -> None:
+        """Add details to the span (e.g. a result known at the end)."""
+        self.args.update(args)
+
+_tracer: Optional[Tracer] = None
+
+def trace_span(name: str, **args: Any) -> Union[Span, _NullSpan]:
+    """
+    Time a block as a stage of the trace.
+
+    Args:
+        name (str): Stage name (e.g. "changelog.generate_logs")
+        **args: Details shown with the span
+
+    Returns:
+        Union[Span, _NullSpan]: Context manager (a no-op while tracing is off)
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return Span(tracer, name, args)
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Decorator timing every call of a function as a stage.
+
+    Args:
+        name (str): Stage name
+
+    Returns:
+        Callable[[F], F]: Decorator
+    """
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return function(*args, **kwargs)
+            with Span(tracer, name, {}):
+                return function(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+def is_tracing() -> bool:
+    """Whether spans are being recorded."""
+    return _tracer is not None
+
+def setup_tracing(path: Optional[str] = None) -> Optional[Tracer]:
+    """
+    Enable tracing if a trace file is given or $CODEX_TRACE is set.
+
+    The trace file is written and the summary printed when the process
+    exits (or on finish_tracing). Calling it again while tracing is a no-op.
+
+    Args:
+        path (Optional[str]): Trace file (default: $CODEX_TRACE)
+
+    Returns:
+        Optional[Tracer]: Active tracer, or None if tracing is off
+    """
+    global _tracer
+    path = path or os.environ.get(TRACE_ENV)
+    if _tracer is None and path:
+        _tracer = Tracer(path)
+        atexit.register(finish_tracing)
+    return _tracer
+
+def finish_tracing() -> Optional[str]:
+    """
+    Stop tracing, write the trace file and print the summary.
+
+    Returns:
+        Optional[str]: Trace file path, or None if tracing was off
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return None
+    path = tracer.write()
+    print_summary(tracer.events)
+    print(f"🧭 Trace written to {path}")
+    return path
+
+def summarize(events: List[Dict[str, Any]]) -> Tuple[float, List[Tuple[str, int, float, float]]]:
+    """
+    Aggregate spans by stage name.
+
+    Args:
+        events (List[Dict[str, Any]]): Chrome trace events
+
+    Returns:
+        Tuple[float, List[Tuple[str, int, float, float]]]: Wall time in
+            seconds, and the name, count, total and longest seconds of each
+            stage, longest total first
+    """
+    spans = [event for event in events if event.get("ph") == "X"]
+    if not spans:
+        return 0.0, []
+    wall = (max(e["ts"] + e["dur"] for e in spans) - min(e["ts"] for e in spans)) / 1e6
+    stages: Dict[str, List[float]] = {}
+    for event in spans:
+        stages.setdefault(event["name"], []).append(event["dur"] / 1e6)
+    rows = [(name, len(durations), sum(durations), max(durations)) for name, durations in stages.items()]
+    return wall, sorted(rows, key=lambda row: row[2], reverse=True)
+
+def print_summary(events: List[Dict[str, Any]]) -> None:
+    """
+    Print the time spent in each stage (inclusive of nested stages).
+
+    Args:
+        events (List[Dict[str, Any]]): Chrome trace events
+    """
+    wall, rows = summarize(events)
+    if not rows:
+        print("\n⏱️  Trace summary: no spans recorded")
+        return
+    width = max(len("stage"), *(len(row[0]) for row in rows))
+    print(f"\n⏱️  Trace summary (wall {wall:.3f}s):")
+    print(f"   {'stage':<{width}}  {'count':>6}  {'total':>9}  {'max':>9}  {'% wall':>6}")
+    for name, count, total, longest in rows:
+        share = total / wall * 100 if wall else 0.0
+        print(f"   {name:<{width}}  {count:>6}  {total:>8.3f}s  {longest:>8.3f}s  {share:>5.1f}%")
+
+def main():
+    """
+    Main function to summarize a trace file.
+    Called when running as a module: python -m utils.trace_span
+    """
+    if len(sys.argv) != 2:
+        print("❌ Error: Trace file path required")
+        print("💡 Usage: python -m utils.trace_span <trace_file>")
+        print(f"📝 Record one with: {TRACE_ENV}=.tmp/trace.json python -m pkg.changelog")
+        sys.exit(1)
+
+    try:
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Error reading trace {sys.argv[1]}: {e}")
+        sys.exit(1)
+    print_summary(data.get("traceEvents", []) if isinstance(data, dict) else data)
+
+if __name__ == "__main__":
+    main()